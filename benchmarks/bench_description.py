@@ -0,0 +1,184 @@
+"""
+Micro-benchmark: DescriptionAnalyzer vs. the original extract_experience regexes and bad-word loop.
+
+Checks the analyzer against the regression corpus in benchmarks/fixtures/experience_corpus.json
+(expected (lower, upper, text, is_minimum) tuples recorded from the original implementation)
+and against the original code on generated descriptions.
+
+Run from the project root:
+    python -m benchmarks.bench_description
+    python -m benchmarks.bench_description --record   # rewrite the corpus from the original code
+"""
+import json
+import os
+import random
+import re
+import sys
+import timeit
+
+from config.search import bad_words
+from utils.description import DescriptionAnalyzer
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "experience_corpus.json")
+
+# Hand-picked cases covering every branch of the original function
+CORPUS_TEXTS = [
+    "", "Senior Engineer", "5 years of experience", "5 YEARS of Experience", "3-5 years", "3 to 5 years",
+    "5+ years", "(3) years", "3 - 5yrs", "2yrs", "1 yr", "years of experience preferred", "No experience needed",
+    "Experience not required", "Entry level role, 3 years a plus", "fresh graduate welcome", "Freshers",
+    "Requires 10+ years, no exp in Go needed", "min. (4) years", "to years", "-- years", "4+yrs",
+    "Backend Engineer (2+ years)", "We have 100 engineers and 20 years of history", "yearly bonus",
+    "Mid-level, yrly review", "noexperience", "no  \n experience", "3 years of experience not required",
+    "Year 2024 hiring", "12 month contract, 1 year extension", "5 yearſ", "١٢ years",
+    "Apply now. Unpaid internship", "Contractor - 6 months", "entry-level", "FRESHER",
+]
+
+# Fragments combined into generated descriptions
+FRAGMENTS = [
+    "we are hiring", "senior", "junior", "entry level", "no experience", "fresher", "years", "year", "yrs", "yr",
+    "3", "5+", "(2)", "10", "-", "to", "of exp", "experience not required", "unpaid", "contractor", "remote",
+    "python", "react", "\n", "  ", "+", "(", ")", "Year", "YEARS", "7yrs", "2-4", "fresh graduate", "no exp",
+    "contract", "Unpaid", "yearly", "1 to 3", "experience", "not required",
+]
+
+
+def legacy_extract_experience(text: str, current_experience: int = 100):
+    """The original utils.helpers.extract_experience, kept verbatim as the reference implementation."""
+    if not text:
+        return None
+    text_lower = text.lower()
+
+    no_exp_patterns = [
+        r'no\s+experience',
+        r'no\s+exp',
+        r'experience\s+not\s+required',
+        r'entry\s+level',
+        r'fresh\s+graduate',
+        r'fresher'
+    ]
+    for pattern in no_exp_patterns:
+        if re.search(pattern, text_lower):
+            return (0, 100, "No experience required", False)
+
+    simple_pattern = re.compile(r'(\d+)\s*(?:year|years|yr|yrs)(?:\s+of\s+exp)?', re.IGNORECASE)
+    simple_match = simple_pattern.search(text_lower)
+    if simple_match:
+        years = int(simple_match.group(1))
+        return (years, -1, f"{years}+ years", True)
+
+    range_pattern = re.compile(r'(\d+)\s*[-to]+\s*(\d+)\s*(?:year|years|yr|yrs)(?:\s+of\s+exp)?', re.IGNORECASE)
+    range_match = range_pattern.search(text_lower)
+    if range_match:
+        lower = int(range_match.group(1))
+        upper = int(range_match.group(2))
+        return (lower, upper, f"{lower}-{upper} years", False)
+
+    complex_pattern = re.compile(r'(?:\(\s*(\d+)\s*\)|(\d+))?\s*[-to]*\s*(\d+)?\+?\s*(?:year|years|yr|yrs)(?:\s+of\s+exp)?', re.IGNORECASE)
+    complex_match = complex_pattern.search(text_lower)
+    if complex_match:
+        lower_limit = int(complex_match.group(1) or complex_match.group(2) or 0)
+        if complex_match.group(3):
+            upper_limit = int(complex_match.group(3))
+            exp_text = f"{lower_limit}-{upper_limit} years"
+            return (lower_limit, upper_limit, exp_text, False)
+        else:
+            exp_text = f"{lower_limit}+ years"
+            return (lower_limit, -1, exp_text, True)
+
+    return None
+
+
+def legacy_bad_word(description: str, words: list):
+    """The original bad-word loop from process_jobs."""
+    desc_low = description.lower()
+    for word in words:
+        if word.lower() in desc_low:
+            return word
+    return None
+
+
+def _as_tuple(value):
+    return tuple(value) if value is not None else None
+
+
+def record_corpus():
+    """Write the expected outputs of the original implementation for CORPUS_TEXTS."""
+    cases = [{'text': text, 'expected': legacy_extract_experience(text)} for text in CORPUS_TEXTS]
+    with open(CORPUS, "w", encoding="utf-8") as f:
+        json.dump(cases, f, ensure_ascii=False, indent=1)
+    print(f"Recorded {len(cases)} cases to {CORPUS}")
+
+
+def check_corpus(analyzer: DescriptionAnalyzer) -> int:
+    """Return the number of corpus cases where the analyzer differs from the recorded tuples."""
+    with open(CORPUS, encoding="utf-8") as f:
+        cases = json.load(f)
+    mismatches = 0
+    for case in cases:
+        result = analyzer.experience(case['text'])
+        if result != _as_tuple(case['expected']):
+            mismatches += 1
+            print(f"Corpus mismatch for {case['text']!r}: expected={case['expected']} analyzer={result}")
+    return mismatches
+
+
+def make_descriptions(size: int, seed: int = 42) -> list:
+    """Build a reproducible list of descriptions, some repeated like reposted listings."""
+    rng = random.Random(seed)
+    # Mostly description-sized texts plus a few title-sized ones
+    texts = [" ".join(rng.choices(FRAGMENTS, k=rng.choice([rng.randint(1, 10), rng.randint(200, 800)])))
+             for _ in range(size)]
+    return texts + rng.sample(texts, size // 4)
+
+
+def check_equivalence(analyzer: DescriptionAnalyzer, texts: list, words: list) -> int:
+    """Return the number of texts where the analyzer disagrees with the original code."""
+    mismatches = 0
+    for text in texts:
+        result = analyzer.analyze(text)
+        legacy = (legacy_extract_experience(text), legacy_bad_word(text, words))
+        found = (result.experience, result.bad_words[0] if result.bad_words else None)
+        if found != legacy:
+            mismatches += 1
+            print(f"Mismatch for {text!r}: legacy={legacy} analyzer={found}")
+    return mismatches
+
+
+def run(size: int = 5000, repeat: int = 5) -> dict:
+    texts = make_descriptions(size)
+    analyzer = DescriptionAnalyzer(bad_words)
+
+    corpus_mismatches = check_corpus(DescriptionAnalyzer(bad_words))
+    mismatches = check_equivalence(analyzer, texts, bad_words)
+
+    def legacy():
+        for text in texts:
+            # process_jobs ran the original function on the lowercased description and then the bad-word loop
+            legacy_extract_experience(text.lower())
+            legacy_bad_word(text, bad_words)
+
+    legacy_seconds = min(timeit.repeat(legacy, number=1, repeat=repeat))
+    # Fresh analyzer per repeat: only the reposted descriptions hit the cache
+    analyzer_seconds = min(timeit.repeat(
+        lambda: [a.analyze(t) for a in [DescriptionAnalyzer(bad_words)] for t in texts],
+        number=1, repeat=repeat,
+    ))
+
+    return {
+        'descriptions': len(texts),
+        'corpus_mismatches': corpus_mismatches,
+        'mismatches': mismatches,
+        'legacy_us_per_job': legacy_seconds / len(texts) * 1e6,
+        'analyzer_us_per_job': analyzer_seconds / len(texts) * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    if "--record" in sys.argv:
+        record_corpus()
+        sys.exit(0)
+    results = run()
+    print("=" * 60)
+    for key, value in results.items():
+        print(f"{key:>26}: {value:.2f}" if isinstance(value, float) else f"{key:>26}: {value}")
+    print("=" * 60)
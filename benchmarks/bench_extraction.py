@@ -0,0 +1,99 @@
+"""
+Benchmark: per-element find_element/.text extraction vs. the single-script extract_company_cards,
+against the local HTML fixture in benchmarks/fixtures/jobs_feed.html. Needs Chrome/Chromium.
+
+Run from the project root:
+    python -m benchmarks.bench_extraction [companies]
+"""
+import asyncio
+import os
+import sys
+import time
+
+from selenium_driverless import webdriver
+from selenium_driverless.types.by import By
+
+from core.extraction import extract_company_cards
+from utils.helpers import get_proper_string
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "jobs_feed.html")
+
+# Clone the fixture's cards until the feed holds the requested number of companies
+SCALE_FEED_SCRIPT = """
+const feed = document.getElementById('feed');
+const templates = Array.from(feed.children);
+let i = 0;
+while (feed.children.length < arguments[0]) {
+    const clone = templates[i % templates.length].cloneNode(true);
+    clone.querySelector('h2').textContent += ' ' + feed.children.length;
+    feed.appendChild(clone);
+    i++;
+}
+"""
+
+
+async def legacy_extract(driver: webdriver.Chrome) -> list[dict]:
+    """The original one-roundtrip-per-field extraction (without the fixed sleeps), normalized like extract_company_cards."""
+    cards = []
+    companies = await driver.find_elements(By.XPATH, '//div[@data-test="StartupResult"]')
+    for company in companies:
+        name_dom = await company.find_element(By.XPATH, './/h2[@class="inline text-md font-semibold"]')
+        card = {'company_name': get_proper_string(await name_dom.text), 'jobs': []}
+        listings = await company.find_elements(By.XPATH, ".//div[@class='styles_component__Ey28k']")
+        for job in listings:
+            fields = {}
+            for key, xpath in (
+                ('position', './/span[@class="styles_title__xpQDw"]'),
+                ('remote_policy', './/span[@class="styles_locations__HHbZs"]'),
+                ('compensation', './/span[@class="styles_compensation__3JnvU"]'),
+            ):
+                try:
+                    element = await job.find_element(By.XPATH, xpath)
+                    value = await element.text
+                    fields[key] = get_proper_string(value)
+                except Exception:
+                    fields[key] = None
+            card['jobs'].append(fields)
+        cards.append(card)
+    return cards
+
+
+def _comparable(cards: list[dict]) -> list:
+    return [
+        (c['company_name'], [(j['position'], j['remote_policy'], j['compensation']) for j in c['jobs']])
+        for c in cards
+    ]
+
+
+async def run(companies: int = 50) -> dict:
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    async with webdriver.Chrome(options=options) as driver:
+        await driver.get("file://" + FIXTURE, wait_load=True)
+        await driver.execute_script(SCALE_FEED_SCRIPT, companies)
+
+        start = time.perf_counter()
+        legacy = await legacy_extract(driver)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bulk = await extract_company_cards(driver)
+        bulk_seconds = time.perf_counter() - start
+
+    return {
+        'companies': companies,
+        'jobs': sum(len(c['jobs']) for c in bulk),
+        'identical': _comparable(legacy) == _comparable(bulk),
+        'legacy_seconds': legacy_seconds,
+        'bulk_seconds': bulk_seconds,
+        'speedup': legacy_seconds / bulk_seconds if bulk_seconds else float('inf'),
+    }
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    results = asyncio.run(run(size))
+    print("=" * 60)
+    for key, value in results.items():
+        print(f"{key:>16}: {value:.4f}" if isinstance(value, float) else f"{key:>16}: {value}")
+    print("=" * 60)
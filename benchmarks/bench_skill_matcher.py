@@ -0,0 +1,114 @@
+"""
+Micro-benchmark: SkillMatcher vs. the original nested phrase/word loops from process_jobs.
+
+Run from the project root:
+    python -m benchmarks.bench_skill_matcher
+"""
+import random
+import timeit
+
+from config.search import good_skills, bad_skills, strict_bad_skills
+from utils.skills import SkillMatcher
+
+# Extra vocabulary so the synthetic skill texts look like real listings
+FILLER_SKILLS = [
+    "aws", "docker", "kubernetes", "graphql", "postgresql", "mongodb", "redis", "tailwind",
+    "next.js", "vue", "go", "rust", "terraform", "figma", "sql", "git", "linux", "express",
+    "machine learning", "data engineering", "product management", "ui/ux", "jest", "ci/cd",
+]
+
+
+def legacy_match(skills_low: str):
+    """The original per-job skill checks, kept verbatim as the reference implementation."""
+    skill_words = skills_low.split()
+
+    def word_matches_skill(word, skill_list):
+        word_lower = word.lower().strip()
+        for skill in skill_list:
+            skill_lower = skill.lower().strip()
+            if word_lower == skill_lower:
+                return skill
+            if ' ' in skill_lower and word_lower in skill_lower:
+                return skill
+            if ' ' not in skill_lower and skill_lower in word_lower and len(skill_lower) >= 3:
+                return skill
+        return None
+
+    good_word = next((skill for skill in good_skills if skill.lower() in skills_low), False)
+    if not good_word:
+        for word in skill_words:
+            matched_skill = word_matches_skill(word, good_skills)
+            if matched_skill:
+                good_word = matched_skill
+                break
+
+    bad_word = False
+    if not good_word:
+        bad_word = next((skill for skill in bad_skills if skill.lower() in skills_low), False)
+        if not bad_word:
+            for word in skill_words:
+                matched_skill = word_matches_skill(word, bad_skills)
+                if matched_skill:
+                    bad_word = matched_skill
+                    break
+
+    strict_bad_word = next((skill for skill in strict_bad_skills if skill.lower() in skills_low), False)
+    if not strict_bad_word:
+        for word in skill_words:
+            matched_skill = word_matches_skill(word, strict_bad_skills)
+            if matched_skill:
+                strict_bad_word = matched_skill
+                break
+
+    return good_word or None, bad_word or None, strict_bad_word or None
+
+
+def make_corpus(size: int, seed: int = 42) -> list:
+    """Build a reproducible list of lowercased skill texts."""
+    rng = random.Random(seed)
+    vocabulary = good_skills + bad_skills + strict_bad_skills + FILLER_SKILLS * 3
+    return [" ".join(rng.sample(vocabulary, rng.randint(2, 10))).lower() for _ in range(size)]
+
+
+def check_equivalence(matcher: SkillMatcher, corpus: list) -> int:
+    """Return the number of texts where the matcher disagrees with the legacy loops."""
+    mismatches = 0
+    for text in corpus:
+        good, bad, strict = legacy_match(text)
+        result = matcher.match(text)
+        # Legacy code only evaluates bad skills when no good skill was found
+        if (result.good, result.bad if not good else None, result.strict) != (good, bad, strict):
+            mismatches += 1
+            print(f"Mismatch for {text!r}: legacy={(good, bad, strict)} matcher={result}")
+    return mismatches
+
+
+def run(size: int = 2000, repeat: int = 5) -> dict:
+    corpus = make_corpus(size)
+    matcher = SkillMatcher(good_skills, bad_skills, strict_bad_skills)
+
+    mismatches = check_equivalence(matcher, corpus)
+
+    legacy = min(timeit.repeat(lambda: [legacy_match(t) for t in corpus], number=1, repeat=repeat))
+    # Fresh matcher per repeat so the memo tables do not hide the scan cost
+    cold = min(timeit.repeat(
+        lambda: [m.match(t) for m in [SkillMatcher(good_skills, bad_skills, strict_bad_skills)] for t in corpus],
+        number=1, repeat=repeat,
+    ))
+    warm = min(timeit.repeat(lambda: [matcher.match(t) for t in corpus], number=1, repeat=repeat))
+
+    return {
+        'jobs': size,
+        'mismatches': mismatches,
+        'legacy_us_per_job': legacy / size * 1e6,
+        'matcher_cold_us_per_job': cold / size * 1e6,
+        'matcher_warm_us_per_job': warm / size * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    results = run()
+    print("=" * 60)
+    for key, value in results.items():
+        print(f"{key:>26}: {value:.2f}" if isinstance(value, float) else f"{key:>26}: {value}")
+    print("=" * 60)
@@ -0,0 +1,235 @@
+"""
+Benchmark suite for the browser-free hot paths: text filters, DB writes, CSV reports and query_db queries.
+
+Results are written as JSON and compared against a stored baseline; any case that got slower
+than the baseline by more than the tolerance is reported as a regression (exit code 1).
+Cases are named after the code they time. When an implementation is replaced its case gets a new
+name, and saving a baseline keeps the entries of cases no longer run (e.g. view_db and
+create_csv_report, which timed the code before query_db and export_report), so a comparison never
+sets old code against new code under one name.
+
+Run from the project root:
+    python -m benchmarks.run                              # 1k / 100k / 1M rows
+    python -m benchmarks.run --sizes 1000 --output out.json
+    python -m benchmarks.run --save-baseline              # record benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime
+
+from benchmarks.synthetic import make_jobs, split_by_status
+from config.search import good_skills, bad_skills, strict_bad_skills, bad_words
+from utils.description import DescriptionAnalyzer
+from utils.helpers import get_proper_string
+from utils.skills import SkillMatcher
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+# Number of texts used by the in-memory text benchmarks
+TEXT_CASES = 20_000
+
+# Run id the synthetic jobs are stored under, for the report benchmark
+BENCH_RUN_ID = "benchmark"
+
+
+def _best(func, repeat: int = 3) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+async def _best_async(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _result(seconds: float, items: int) -> dict:
+    return {'seconds': seconds, 'items': items, 'us_per_item': seconds / items * 1e6 if items else 0.0}
+
+
+def bench_text(seed: int) -> dict:
+    """extract_experience / description analysis, skill matching and get_proper_string on distinct texts."""
+    jobs = make_jobs(TEXT_CASES, seed)
+    # A per-job suffix keeps every text distinct so the analyzer and matcher caches do not hide the work
+    descriptions = [f"{job['description']} ref {i}" for i, job in enumerate(jobs)]
+    skills = [f"{job['skills']} x{i}".lower() for i, job in enumerate(jobs)]
+    raw = [f"  {job['remote_policy']}\n\n   {job['compensation']}  {i} " for i, job in enumerate(jobs)]
+
+    return {
+        'extract_experience': _result(
+            _best(lambda: [a.experience(t) for a in [DescriptionAnalyzer()] for t in descriptions]), len(descriptions)),
+        'description_analyzer': _result(
+            _best(lambda: [a.analyze(t) for a in [DescriptionAnalyzer(bad_words)] for t in descriptions]), len(descriptions)),
+        'skill_matcher': _result(
+            _best(lambda: [m.match(t) for m in [SkillMatcher(good_skills, bad_skills, strict_bad_skills)] for t in skills]),
+            len(skills)),
+        'get_proper_string': _result(_best(lambda: [get_proper_string(t) for t in raw]), len(raw)),
+    }
+
+
+@contextlib.contextmanager
+def _scratch_dir():
+    """Run inside a temporary directory so wellfound.db and CSV reports never touch the project files."""
+    previous = os.getcwd()
+    path = tempfile.mkdtemp(prefix="wellfound-bench-")
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+async def _fresh_db():
+    from services import db, seen_jobs
+    await db.close_connection()
+    seen_jobs.clear()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db.DB_NAME + suffix):
+            os.remove(db.DB_NAME + suffix)
+    await db.initialize_database_connection()
+
+
+async def bench_db(size: int, seed: int) -> dict:
+    """store_single_job vs store_jobs, the CSV report (plain and gzip) and the query_db queries at one size."""
+    from services import db
+    from services.report import export_report
+    from scripts.query_db import Filters, view_database, list_jobs, aggregate
+
+    jobs = make_jobs(size, seed)
+    for job in jobs:
+        job['run_id'] = BENCH_RUN_ID
+    applied, rejected = split_by_status(jobs)
+    results = {}
+    quiet = io.StringIO()
+
+    with contextlib.redirect_stdout(quiet):
+        await _fresh_db()
+        start = time.perf_counter()
+        for job in jobs:
+            await db.store_single_job(job, job['status'])
+        await db.flush_writes()
+        results['store_single_job'] = _result(time.perf_counter() - start, size)
+
+        await _fresh_db()
+        start = time.perf_counter()
+        await db.store_jobs(applied, rejected)
+        results['store_jobs'] = _result(time.perf_counter() - start, size)
+        await db.close_connection()
+
+        # Queries and exports can be repeated and take only milliseconds at 1k rows, so like the text cases
+        # they keep the best of a few runs
+        results['query_db_view'] = _result(await _best_async(view_database), size)
+
+        # A filtered page deep into the table, and the per-day and per-reason aggregates
+        async def query():
+            await list_jobs(Filters(status='applied'), after=size // 2)
+            await aggregate('per-day', Filters())
+            await aggregate('per-reason', Filters())
+        results['query_db'] = _result(await _best_async(query), size)
+
+        for name, compression in (('export_report_csv', None), ('export_report_gzip', 'gzip')):
+            async def export():
+                report = await export_report(run_id=BENCH_RUN_ID, compression=compression)
+                os.remove(report.path)
+            results[name] = _result(await _best_async(export), size)
+        await db.close_connection()
+
+    return results
+
+
+def run(sizes: list[int], seed: int = 42) -> dict:
+    results = {f"text.{name}": value for name, value in bench_text(seed).items()}
+    with _scratch_dir():
+        for size in sizes:
+            print(f"Running DB and report benchmarks with {size} rows...", file=sys.stderr)
+            for name, value in asyncio.run(bench_db(size, seed)).items():
+                results[f"{name}.{size}"] = value
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a line per case that is slower than the baseline by more than tolerance (0.2 = 20%)."""
+    regressions = []
+    for name, value in current['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference or not reference['seconds']:
+            continue
+        ratio = value['seconds'] / reference['seconds']
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {value['seconds']:.4f}s vs baseline {reference['seconds']:.4f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated row counts for the DB and report benchmarks")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    current = run(sizes, args.seed)
+
+    print("=" * 60)
+    for name, value in current['results'].items():
+        print(f"{name:>36}: {value['seconds']:.4f}s ({value['us_per_item']:.2f} us/item)")
+    print("=" * 60)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=1)
+
+    if args.save_baseline:
+        # Entries of cases this run did not produce (other sizes, retired implementations) are kept
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                saved = json.load(f).get('results', {})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**current, 'results': {**saved, **current['results']}}, f, indent=1)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (run with --save-baseline)")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.tolerance)
+    if regressions:
+        print("Regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Seeded generator of synthetic job dictionaries shaped like the job_obj built in process_jobs.
+"""
+import random
+from datetime import datetime, timedelta
+
+from config.search import good_skills, bad_skills, strict_bad_skills
+
+COMPANY_WORDS = ["Acme", "Nimbus", "Quartz", "Orbit", "Lumen", "Pixel", "Cedar", "Harbor", "Vector", "Atlas"]
+COMPANY_SUFFIXES = ["Robotics", "Analytics", "Labs", "Health", "Pay", "AI", "Systems", "Cloud"]
+POSITIONS = [
+    "Frontend Engineer", "Full Stack Developer", "Senior Backend Engineer (5+ years)", "React Developer",
+    "Software Engineer Intern", "Junior Python Developer", "Android Developer", "Product Engineer (2-4 yrs)",
+]
+LOCATIONS = ["Remote\n• India", "Remote • Worldwide", "In office • Bengaluru", "Hybrid   •  Berlin"]
+COMPENSATIONS = ["₹8L – ₹14L • 0.05% – 0.1%", "$60k – $90k", "€45k – €60k", None]
+FILLER_SKILLS = ["aws", "docker", "graphql", "postgresql", "redis", "tailwind", "figma", "git", "linux"]
+DESCRIPTION_LINES = [
+    "We are building the future of our industry and want curious engineers.",
+    "You will own features end to end, from design to deployment.",
+    "Requires {years} years of experience with modern web frameworks.",
+    "Entry level candidates are welcome.",
+    "This is an unpaid internship.",
+    "Engagement is as a contractor for six months.",
+    "  Nice to have:   open source contributions\n\n and a portfolio.  ",
+]
+
+# Distinct skill and description texts to draw from
+POOL_SIZE = 512
+
+REJECTION_NOTES = [
+    "Found bad skill java. Skipping.",
+    "Not enough experience (required: 5+ years, found in description)",
+    "Skipped job due to bad word unpaid found in description",
+    "Position not suitable",
+]
+
+
+def make_jobs(count: int, seed: int = 42) -> list[dict]:
+    """Build count job dictionaries; about a fifth are applied, the rest rejected with a note."""
+    rng = random.Random(seed)
+    vocabulary = good_skills + bad_skills + strict_bad_skills + FILLER_SKILLS
+    # Long texts come from shared pools so a million jobs still fit in memory
+    skills_pool = [" ".join(rng.sample(vocabulary, rng.randint(2, 8))) for _ in range(POOL_SIZE)]
+    description_pool = [
+        "\n".join(line.format(years=rng.randint(0, 7)) for line in rng.sample(DESCRIPTION_LINES, rng.randint(2, 4)))
+        for _ in range(POOL_SIZE)
+    ]
+    start = datetime(2025, 1, 1)
+    jobs = []
+    for index in range(count):
+        applied = rng.random() < 0.2
+        processed = start + timedelta(seconds=index * 7)
+        jobs.append({
+            'company_name': f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {index % 5000}",
+            'position': rng.choice(POSITIONS),
+            'remote_policy': rng.choice(LOCATIONS),
+            'compensation': rng.choice(COMPENSATIONS),
+            'skills': rng.choice(skills_pool),
+            'description': rng.choice(description_pool),
+            'url': f"https://example.invalid/jobs/{index}",
+            'type': rng.choice(["Full-time", "Contract", "Internship"]),
+            'location': rng.choice(LOCATIONS),
+            'exp_required': rng.choice([None, "2+ years", "0-1 years"]),
+            'application_date': processed.strftime("%d-%m-%y:%H:%M:%S") if applied else None,
+            'time': processed.strftime("%d-%m-%y:%H:%M:%S"),
+            'notes': None if applied else rng.choice(REJECTION_NOTES),
+            'status': 'applied' if applied else 'rejected',
+        })
+    return jobs
+
+
+def split_by_status(jobs: list[dict]) -> tuple[list, list]:
+    """Return (applied, rejected) lists like the ones main.py collects."""
+    applied = [job for job in jobs if job['status'] == 'applied']
+    rejected = [job for job in jobs if job['status'] == 'rejected']
+    return applied, rejected
@@ -0,0 +1,133 @@
+"""
+Keep one logged-in Chrome running so runs can attach to it instead of paying for a cold start.
+
+The browser listens for DevTools connections on a fixed port; main.py attaches to it when
+browser_daemon_address in config/settings.py (or WELLFOUND_BROWSER_DAEMON) is set to that address,
+and reuses its tab, which the daemon leaves on the jobs feed. The endpoint is also written to browser-daemon.json for other tools.
+The daemon checks the endpoint periodically and launches a fresh browser when it stops answering.
+
+Only one run should attach at a time, since attached runs share the daemon's tab.
+
+Usage:
+    python browser_daemon.py                # port taken from browser_daemon_address (9222 when unset)
+    python browser_daemon.py --port 9333 --interval 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from core.blocking import install_blocking, remove_blocking
+from core.browser import create_browser_options, probe_browser
+from core.session import open_jobs_feed
+from config.settings import browser_daemon_address, user_data_dir
+
+STATE_FILE = "browser-daemon.json"
+
+# Failed health checks in a row before the browser is replaced
+MAX_FAILED_CHECKS = 2
+
+# Longest pause between attempts to launch a browser that keeps failing
+MAX_BACKOFF = 60
+
+
+async def launch(port: int):
+    """Start Chrome on the given DevTools port with the persistent profile and open the jobs feed."""
+    from selenium_driverless import webdriver
+
+    options = create_browser_options(user_data_dir)
+    # A fixed port instead of the random one chosen by the driver, so runs know where to attach
+    options.add_argument(f"--remote-debugging-port={port}")
+    driver = await webdriver.Chrome(options=options)
+    try:
+        await driver.maximize_window()
+        # Attached runs install their own blocking; the daemon only blocks while it logs in
+        await install_blocking(driver)
+        if not await open_jobs_feed(driver):
+            raise RuntimeError("could not open the jobs feed")
+        await remove_blocking(driver)
+    except BaseException:
+        await shutdown(driver)
+        raise
+    return driver
+
+
+async def shutdown(driver):
+    try:
+        # quit() deletes the user-data-dir by default, which would log the saved session out
+        await driver.quit(timeout=10, clean_dirs=False)
+    except Exception as e:
+        print(f"Note: Error closing browser (non-critical): {type(e).__name__}")
+
+
+def write_state(address: str, info: dict, pid):
+    state = {
+        'address': address,
+        'websocket': info.get('webSocketDebuggerUrl'),
+        'browser': info.get('Browser'),
+        'pid': pid,
+        'started': time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+
+
+async def healthy(address: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, probe_browser, address) is not None
+
+
+async def run_daemon(port: int, interval: float):
+    address = f"127.0.0.1:{port}"
+    if await healthy(address):
+        raise SystemExit(f"Something already answers on {address}; stop it or pick another --port")
+
+    try:
+        failures = 0
+        launches = 0
+        while True:
+            try:
+                driver = await launch(port)
+            except Exception as e:
+                failures += 1
+                delay = min(MAX_BACKOFF, 2 ** failures)
+                print(f"Browser launch failed ({type(e).__name__}: {e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+                continue
+
+            failures = 0
+            launches += 1
+            loop = asyncio.get_running_loop()
+            info = await loop.run_in_executor(None, probe_browser, address) or {}
+            write_state(address, info, driver.browser_pid)
+            print(f"Browser {'started' if launches == 1 else 'respawned'} at {address} (pid {driver.browser_pid})")
+
+            try:
+                failed_checks = 0
+                while failed_checks < MAX_FAILED_CHECKS:
+                    await asyncio.sleep(interval)
+                    failed_checks = 0 if await healthy(address) else failed_checks + 1
+                print(f"Browser at {address} stopped answering, respawning")
+            finally:
+                await shutdown(driver)
+    finally:
+        if os.path.exists(STATE_FILE):
+            os.remove(STATE_FILE)
+
+
+def main():
+    default_port = int(browser_daemon_address.rsplit(":", 1)[1]) if browser_daemon_address else 9222
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=default_port, help="DevTools port the browser listens on")
+    parser.add_argument("--interval", type=float, default=15, help="Seconds between health checks")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_daemon(args.port, args.interval))
+    except KeyboardInterrupt:
+        print("Browser daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -55,3 +55,10 @@ bad_words =[
     'unpaid',
     'contractor'
 ]
+
+# Jobs whose title contains any of these words are rejected before opening the job
+bad_title_words = []
+
+# Minimum yearly salary per currency symbol, checked against the top of the listed range
+# e.g. {"$": 60000, "₹": 800000}. Leave empty to disable
+min_compensation = {}
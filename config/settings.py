@@ -1,13 +1,106 @@
+import os
+
 headless = False
 
+# Site to automate; set WELLFOUND_BASE_URL to point at a stand-in (see scripts/standin_server.py)
+base_url = os.getenv("WELLFOUND_BASE_URL", "https://wellfound.com").rstrip("/")
+
+# Chrome profile directory kept between runs so the login session survives restarts (None = fresh profile every run)
+user_data_dir = "browser-profile"
+
 # Chrome executable path (leave as None to auto-detect, or specify full path like r"C:\Program Files\Google\Chrome\Application\chrome.exe")
 chrome_path = None
 
+# Address (host:port) of the Chrome kept alive by browser_daemon.py, e.g. "127.0.0.1:9222". Runs attach to it
+# when it answers and launch their own browser otherwise. Off by default, since whatever Chrome listens
+# there would be driven by the bot (None = always launch)
+browser_daemon_address = os.getenv("WELLFOUND_BROWSER_DAEMON") or None
+
 store_in_db = True
 
 send_email = False
 
+# Compression of the CSV report: "gzip" (.csv.gz), "zip" (.zip) or None (plain .csv)
+report_compression = "gzip"
+
+# Where email reports are delivered; point these at a stub HTTP endpoint or a local SMTP sink to test delivery
+resend_api_url = os.getenv("RESEND_API_URL", "https://api.resend.com/emails")
+smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+smtp_port = int(os.getenv("SMTP_PORT", "587"))
+# Upgrade SMTP connections with STARTTLS (local sinks usually speak plain SMTP: SMTP_STARTTLS=0)
+smtp_starttls = os.getenv("SMTP_STARTTLS", "1") != "0"
+
+# Seconds a single delivery attempt (connect, upload, response) may take
+email_timeout = 60
+
+# Delivery attempts per report within a run; a report still unsent stays in the outbox for the next run
+email_attempts = 3
+
 hide_companies = False
 
 # Number of jobs to apply to
-limit = 5
\ No newline at end of file
+limit = 5
+
+# Skip jobs already stored in the database (by company and position) without opening them
+skip_seen_jobs = True
+
+# Number of background tabs used to evaluate job pages concurrently (1 = open each job's modal in turn)
+tab_pool_size = 1
+
+# Seconds a background tab may spend loading and evaluating one job before it is abandoned and replaced
+# (waiting for a free tab is limited by tab_wait_timeout, submitting the application is not)
+tab_timeout = 60
+
+# Seconds a job may wait for a free background tab before it is opened in its modal instead
+tab_wait_timeout = 300
+
+# Skip downloading assets the automation never looks at (logos, fonts, videos, analytics scripts)
+block_resources = True
+
+# CDP resource types failed in every tab (Image, Font, Media, Stylesheet, Script, ...)
+blocked_resource_types = ["Image", "Font", "Media"]
+
+# URLs always blocked, whatever their type ("*" matches any run of characters)
+blocked_url_patterns = [
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+    "*facebook.net/*",
+    "*hotjar.com/*",
+    "*segment.com/*",
+    "*segment.io/*",
+    "*sentry.io/*",
+    "*/analytics.js*",
+]
+
+# URLs never blocked, e.g. CAPTCHA challenges that have to render for a human to solve them
+allowed_url_patterns = [
+    "*captcha-delivery.com/*",
+    "*recaptcha*",
+    "*hcaptcha.com/*",
+]
+
+# Read job data from the JSON responses the jobs feed fetches instead of from the rendered page.
+# Jobs rejected on that data are never opened; the page is still read when a response is missing
+capture_job_data = True
+
+# Responses searched for job listings ("*" matches any run of characters)
+capture_url_patterns = ["*/graphql*", "*/api/*"]
+
+# Seconds to wait for a CAPTCHA that appears mid-run to be solved in the browser before the run stops
+captcha_wait = 300
+
+# Action rates learned by the pacer are kept here between runs (None = start from the defaults every run)
+pacer_state_file = "pacer-state.json"
+
+# Responses slower than this many seconds make the pacer slow down
+pacer_slow_response = 5.0
+
+# Seconds every browser action is held after a CAPTCHA or a 429/503 response from the site
+pacer_cooldown = 30
+
+# Directory for the per-run timing summary (JSON) and Prometheus textfile written at the end of each run
+metrics_dir = "metrics"
+
+# Directory for the profiles written by `python main.py --profile`
+profile_dir = "profiles"
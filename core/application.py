@@ -1,10 +1,13 @@
 from selenium_driverless import webdriver
 from selenium_driverless.types.webelement import WebElement
 from selenium_driverless.types.by import By
+from utils.waits import wait_for_dom_stable, wait_until_gone
+from utils.pacer import pacer
 
 async def hide_company(driver: webdriver.Chrome, hide_button: WebElement, company: WebElement, reason: str):
     try:
-        await hide_button.click()
+        async with pacer.action("click"):
+            await hide_button.click()
         try: 
             hide_input: WebElement = await company.find_element(By.XPATH,'//input[@name="hideReason"]', timeout=10)
             hide_confirm: WebElement = await company.find_element(By.XPATH,'//span[@class="fill-current stroke-current w-3 leading-none"]', timeout=10)
@@ -13,15 +16,16 @@ async def hide_company(driver: webdriver.Chrome, hide_button: WebElement, compan
             return False
 
         await hide_input.clear()
-        await driver.sleep(0.5)
+        await wait_for_dom_stable(driver, quiet=0.1, timeout=0.5, name="hide_form")
 
         try:
             await hide_input.send_keys(reason)
-            await driver.sleep(0.5)
+            await wait_for_dom_stable(driver, quiet=0.1, timeout=0.5, name="hide_form")
         except: print('Unable to fill in hide reason')
 
-        await hide_confirm.click()
-        await driver.sleep(1)
+        async with pacer.action("click"):
+            await hide_confirm.click()
+        await wait_until_gone(driver, hide_input, timeout=1, name="hide_confirm")
         
         return True
     except: 
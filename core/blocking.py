@@ -0,0 +1,115 @@
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Dict
+from selenium_driverless.types.target import Target
+from config.settings import block_resources, blocked_resource_types, blocked_url_patterns, allowed_url_patterns
+
+
+class BlockStats:
+    """Requests failed by the blocker, per resource type, and the response bytes they would have downloaded."""
+
+    def __init__(self):
+        self.requests: Counter = Counter()
+        self.bytes = 0
+        self.allowed = 0
+
+    def record(self, resource_type: str, size: int):
+        self.requests[resource_type] += 1
+        self.bytes += size
+
+    def summary(self) -> dict:
+        return {'requests': sum(self.requests.values()), 'bytes': self.bytes,
+                'allowed': self.allowed, 'by_type': dict(self.requests)}
+
+    def report(self):
+        """Print blocked requests and bytes."""
+        if not self.requests:
+            return
+        by_type = ", ".join(f"{kind} {count}" for kind, count in self.requests.most_common())
+        print(f"Blocked {sum(self.requests.values())} requests ({by_type}), "
+              f"{self.bytes / 1024:.0f} KB of responses not downloaded")
+
+
+block_stats = BlockStats()
+
+
+def _content_length(headers: list) -> int:
+    for header in headers or ():
+        if header['name'].lower() == 'content-length':
+            try:
+                return int(header['value'])
+            except ValueError:
+                return 0
+    return 0
+
+
+class _Blocker:
+    """
+    Fails matching requests of one tab through the CDP Fetch domain.
+
+    Resource types are paused at the response stage: the headers tell how large the body is,
+    and failing the request there still skips downloading, decoding and painting it.
+    URL patterns (trackers) are paused before the request is sent.
+    """
+
+    def __init__(self, target: Target):
+        self.target = target
+
+    def patterns(self) -> list:
+        patterns = [{'urlPattern': pattern, 'requestStage': 'Request'} for pattern in blocked_url_patterns]
+        patterns += [{'urlPattern': '*', 'resourceType': kind, 'requestStage': 'Response'}
+                     for kind in blocked_resource_types]
+        return patterns
+
+    async def _paused(self, event: dict):
+        request_id = event['requestId']
+        url = event['request']['url']
+        status = event.get('responseStatusCode')
+        # Redirects are followed so the final response can be judged
+        if any(fnmatchcase(url, pattern) for pattern in allowed_url_patterns) or (status and 300 <= status < 400):
+            block_stats.allowed += 1
+            await self._send("Fetch.continueRequest", {'requestId': request_id})
+            return
+        block_stats.record(event.get('resourceType', 'Other'), _content_length(event.get('responseHeaders')))
+        await self._send("Fetch.failRequest", {'requestId': request_id, 'errorReason': 'BlockedByClient'})
+
+    async def _send(self, cmd: str, args: dict):
+        try:
+            await self.target.execute_cdp_cmd(cmd, args)
+        except Exception:
+            # The request was cancelled or the tab closed in the meantime
+            pass
+
+    async def install(self):
+        await self.target.add_cdp_listener("Fetch.requestPaused", self._paused)
+        await self.target.execute_cdp_cmd("Fetch.enable", {'patterns': self.patterns()})
+
+    async def remove(self):
+        await self.target.execute_cdp_cmd("Fetch.disable", {})
+        await self.target.remove_cdp_listener("Fetch.requestPaused", self._paused)
+
+
+_blockers: Dict[int, _Blocker] = {}
+
+
+async def install_blocking(target: Target):
+    """Start blocking the configured resource types and URL patterns in a tab (or the driver's current tab)."""
+    if not block_resources or id(target) in _blockers:
+        return
+    blocker = _Blocker(target)
+    if not blocker.patterns():
+        return
+    try:
+        await blocker.install()
+    except Exception as e:
+        print(f"Unable to install resource blocking: {e}")
+        return
+    _blockers[id(target)] = blocker
+
+
+async def remove_blocking(target: Target, closing: bool = False):
+    """Stop blocking in a tab, so a browser left running keeps loading everything.
+    With closing=True the tab is about to be closed and is only forgotten."""
+    blocker = _blockers.pop(id(target), None)
+    if blocker is not None and not closing:
+        await blocker.remove()
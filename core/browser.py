@@ -1,11 +1,30 @@
+import asyncio
+import json
 import os
+import urllib.request
+from typing import Optional
 from selenium_driverless import webdriver
-from config.settings import headless, chrome_path
+from core.blocking import install_blocking, remove_blocking
+from utils.waits import wait_for_dom_stable
+from utils.timing import timed
+from config.settings import headless, chrome_path, user_data_dir, browser_daemon_address
 
-def create_browser_options() -> webdriver.ChromeOptions:
-    """Create and configure Chrome browser options."""
+# Drivers attached to the daemon's browser; closing them must leave the browser and its tab alive
+_attached = set()
+
+def create_browser_options(profile_dir: str = user_data_dir) -> webdriver.ChromeOptions:
+    """Create and configure Chrome browser options.
+
+    Args:
+        profile_dir: Persistent user-data-dir holding cookies and localStorage between runs, or None
+    """
     options = webdriver.ChromeOptions()
 
+    if profile_dir:
+        options.user_data_dir = os.path.abspath(profile_dir)
+        # Never let the driver delete the profile on exit, whichever way the browser is closed
+        options.auto_clean_dirs = False
+
     # Set Chrome executable path if specified in settings
     if chrome_path and os.path.exists(chrome_path):
         options.binary_location = chrome_path
@@ -20,15 +39,58 @@ def create_browser_options() -> webdriver.ChromeOptions:
             print(f"Warning: Extension file '{dark_reader}' not found. Continuing without Dark Reader extension.")
     else:
         options.add_argument("--headless")
-        options.add_argument("--incognito")
+        # Incognito would discard the persisted session
+        if not profile_dir:
+            options.add_argument("--incognito")
 
     return options
 
-async def initialize_browser() -> webdriver.Chrome:
-    """Initialize and return a Chrome browser instance."""
-    options = create_browser_options()
+def probe_browser(address: str, timeout: float = 2) -> Optional[dict]:
+    """Return the /json/version info of the DevTools endpoint at host:port, or None if it does not answer."""
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=timeout) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+async def attach_browser(address: str) -> webdriver.Chrome:
+    """Connect to an already running Chrome at host:port; the driver starts on its first open tab."""
+    options = webdriver.ChromeOptions()
+    options.debugger_address = address
+    driver = await webdriver.Chrome(options=options)
+    _attached.add(id(driver))
+    await install_blocking(driver)
+    return driver
+
+
+async def release_browser(driver: webdriver.Chrome):
+    """Close a browser started by initialize_browser. An attached browser and its tab are left running."""
+    if id(driver) in _attached:
+        _attached.discard(id(driver))
+        await remove_blocking(driver)
+        return
+    await driver.close()
+
+
+@timed()
+async def initialize_browser(profile_dir: str = user_data_dir, attach: bool = True) -> webdriver.Chrome:
+    """Initialize and return a Chrome browser instance.
+
+    Args:
+        profile_dir: Profile used when a new browser is launched
+        attach: Reuse the browser kept alive by browser_daemon.py when it is reachable
+    """
+    if attach and browser_daemon_address:
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, probe_browser, browser_daemon_address):
+            print(f"Attaching to the browser daemon at {browser_daemon_address}")
+            return await attach_browser(browser_daemon_address)
+
+    options = create_browser_options(profile_dir)
     driver = await webdriver.Chrome(options=options)
+    await install_blocking(driver)
     await driver.maximize_window()
-    await driver.sleep(1)
+    await wait_for_dom_stable(driver, quiet=0.1, timeout=1, name="browser_start")
     return driver
 
@@ -0,0 +1,255 @@
+import asyncio
+import base64
+import html
+import json
+import re
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import NamedTuple, Optional, Tuple, Dict, Iterator
+from selenium_driverless import webdriver
+from utils.helpers import get_proper_string
+from config.settings import capture_url_patterns
+
+# Job id in listing links like /jobs/3012345-frontend-engineer
+_JOB_ID_PATTERN = re.compile(r'/jobs/(\d+)')
+_TAG_PATTERN = re.compile(r'<br\s*/?>|</(?:p|div|li|h\d)>', re.IGNORECASE)
+_MARKUP_PATTERN = re.compile(r'<[^>]+>')
+
+# Field names used for the same value by the feed, the job detail and GraphQL payloads
+_POSITION_KEYS = ('title', 'position', 'jobTitle')
+_LOCATION_KEYS = ('location', 'locationNames', 'remotePolicy', 'remote')
+_DESCRIPTION_KEYS = ('description', 'descriptionHtml')
+_TYPE_KEYS = ('jobType', 'type')
+_JOB_LIST_KEYS = ('jobs', 'jobListings', 'highlightedJobListings')
+
+# Records kept at most; the least recently captured ones go first. Records are also dropped once used
+MAX_RECORDS = 500
+
+
+class JobRecord(NamedTuple):
+    """A job listing as sent by the site's own API. Fields the payload did not contain are None."""
+    id: str
+    position: Optional[str] = None
+    company_name: Optional[str] = None
+    location: Optional[str] = None
+    compensation: Optional[str] = None
+    job_type: Optional[str] = None
+    skills: Optional[Tuple[str, ...]] = None
+    description: Optional[str] = None
+    # Short facts shown above the description ("Remote", "3+ years exp", ...)
+    details: Optional[Tuple[str, ...]] = None
+
+    @property
+    def complete(self) -> bool:
+        """True once the record holds everything the detail filters read from the modal."""
+        return self.skills is not None and self.description is not None
+
+    def merge(self, other: "JobRecord") -> "JobRecord":
+        """Fields present in other (a later response) replace the ones of this record."""
+        return self._replace(**{field: value for field, value in other._asdict().items() if value is not None})
+
+
+def job_id_from_href(href: Optional[str]) -> Optional[str]:
+    match = _JOB_ID_PATTERN.search(href or "")
+    return match.group(1) if match else None
+
+
+def _first(data: dict, keys: tuple):
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, "", []):
+            return value
+    return None
+
+
+def _text(value) -> Optional[str]:
+    """Plain text of a string, HTML fragment or list of strings."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        value = " • ".join(str(item) for item in value)
+    elif not isinstance(value, str):
+        value = str(value)
+    if "<" in value:
+        value = html.unescape(_MARKUP_PATTERN.sub("", _TAG_PATTERN.sub("\n", value)))
+    return get_proper_string(value) or None
+
+
+def _names(value) -> Optional[Tuple[str, ...]]:
+    """Skill lists come as strings or as objects with a name."""
+    if not isinstance(value, list):
+        return None
+    names = (item.get('name') or item.get('displayName') if isinstance(item, dict) else item for item in value)
+    return tuple(get_proper_string(str(name)) for name in names if name)
+
+
+def _is_job(data: dict) -> bool:
+    return 'id' in data and _first(data, _POSITION_KEYS) is not None and any(
+        key in data for key in ('compensation', 'skills') + _DESCRIPTION_KEYS + _LOCATION_KEYS)
+
+
+def _job_record(data: dict, company_name: Optional[str]) -> JobRecord:
+    details = data.get('details')
+    return JobRecord(
+        id=str(data['id']),
+        position=_text(_first(data, _POSITION_KEYS)),
+        company_name=company_name,
+        location=_text(_first(data, _LOCATION_KEYS)),
+        compensation=_text(data.get('compensation')),
+        job_type=_text(_first(data, _TYPE_KEYS)),
+        skills=_names(data.get('skills')),
+        description=_text(_first(data, _DESCRIPTION_KEYS)),
+        details=tuple(_text(item) for item in details) if isinstance(details, list) else None,
+    )
+
+
+def parse_jobs(payload, company_name: Optional[str] = None) -> Iterator[JobRecord]:
+    """
+    Find job listings anywhere in a JSON payload (REST or GraphQL), by shape rather than by path.
+    Jobs nested in a company object get that company's name.
+    """
+    if isinstance(payload, list):
+        for item in payload:
+            yield from parse_jobs(item, company_name)
+        return
+    if not isinstance(payload, dict):
+        return
+    if _is_job(payload):
+        yield _job_record(payload, company_name)
+        return
+    jobs = _first(payload, _JOB_LIST_KEYS)
+    if isinstance(jobs, list) and isinstance(payload.get('name'), str):
+        company_name = _text(payload['name'])
+    for value in payload.values():
+        if isinstance(value, (dict, list)):
+            yield from parse_jobs(value, company_name)
+
+
+class JobCapture:
+    """
+    Collects job records from the JSON responses the page itself fetches (feed pages, job details),
+    through the CDP Network domain, so filters do not have to read the rendered markup.
+    """
+
+    def __init__(self, max_records: int = MAX_RECORDS):
+        self.records: OrderedDict[str, JobRecord] = OrderedDict()
+        self.max_records = max_records
+        # Distinct jobs captured over the run (records leave self.records once used)
+        self.captured = 0
+        self.responses = 0
+        self.errors = 0
+        # Jobs whose detail filters ran on captured data rather than on the modal
+        self.evaluated = 0
+        # Set once any response carried a job's full details, i.e. the site sends them as JSON at all
+        self.has_details = False
+        self._pending: Dict[str, str] = {}
+        self._updated = asyncio.Event()
+        self._driver: Optional[webdriver.Chrome] = None
+
+    def _matches(self, url: str) -> bool:
+        return any(fnmatchcase(url, pattern) for pattern in capture_url_patterns)
+
+    def _response(self, event: dict):
+        response = event['response']
+        if response.get('status') == 200 and 'json' in (response.get('mimeType') or '') and self._matches(response['url']):
+            self._pending[event['requestId']] = response['url']
+
+    async def _finished(self, event: dict):
+        if self._pending.pop(event['requestId'], None) is None:
+            return
+        try:
+            result = await self._driver.execute_cdp_cmd("Network.getResponseBody", {'requestId': event['requestId']})
+            body = result['body']
+            if result.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8')
+            self.add(json.loads(body))
+        except Exception:
+            # Evicted from the browser's buffer, not JSON after all, or the page navigated away
+            self.errors += 1
+
+    def _failed(self, event: dict):
+        self._pending.pop(event['requestId'], None)
+
+    def add(self, payload) -> int:
+        """Store the jobs of a decoded response and return how many were found."""
+        found = 0
+        for record in parse_jobs(payload):
+            known = self.records.pop(record.id, None)
+            record = self.records[record.id] = known.merge(record) if known else record
+            if known is None:
+                self.captured += 1
+                if len(self.records) > self.max_records:
+                    self.records.popitem(last=False)
+            self.has_details = self.has_details or record.complete
+            found += 1
+        self.responses += 1
+        if found:
+            self._updated.set()
+        return found
+
+    async def install(self, driver: webdriver.Chrome):
+        if self._driver is driver:
+            return
+        self._driver = driver
+        await driver.execute_cdp_cmd("Network.enable", {})
+        await driver.add_cdp_listener("Network.responseReceived", self._response)
+        await driver.add_cdp_listener("Network.loadingFinished", self._finished)
+        await driver.add_cdp_listener("Network.loadingFailed", self._failed)
+
+    def get(self, href: Optional[str]) -> Optional[JobRecord]:
+        """Record of the job a listing link points to, if one was captured."""
+        job_id = job_id_from_href(href)
+        return self.records.get(job_id) if job_id else None
+
+    def discard(self, href: Optional[str]):
+        """Forget a job's record once its filters have run on it, so only unused records are kept."""
+        job_id = job_id_from_href(href)
+        if job_id:
+            self.records.pop(job_id, None)
+
+    async def wait_complete(self, href: Optional[str], timeout: float) -> Optional[JobRecord]:
+        """Wait up to timeout seconds for the job's detail response; returns the record once complete."""
+        job_id = job_id_from_href(href)
+        if job_id is None:
+            return None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            record = self.records.get(job_id)
+            if record is not None and record.complete:
+                return record
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            self._updated.clear()
+            try:
+                await asyncio.wait_for(self._updated.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    def enrich(self, cards: list[dict]):
+        """Fill the card fields read from markup with the captured values, which do not depend on class names."""
+        for card in cards:
+            for job in card['jobs']:
+                record = self.get(job['href'])
+                if record is None:
+                    continue
+                job['position'] = record.position or job['position']
+                job['remote_policy'] = record.location or job['remote_policy']
+                job['compensation'] = record.compensation or job['compensation']
+                if record.company_name and not card['company_name']:
+                    card['company_name'] = record.company_name
+
+    def summary(self) -> dict:
+        return {'responses': self.responses, 'jobs': self.captured, 'evaluated': self.evaluated,
+                'errors': self.errors}
+
+    def report(self):
+        """Print how much job data came from captured responses."""
+        if not self.responses:
+            return
+        print(f"Captured {self.captured} jobs from {self.responses} responses "
+              f"({self.evaluated} evaluated without reading the modal, {self.errors} unreadable responses)")
+
+
+job_capture = JobCapture()
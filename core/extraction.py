@@ -0,0 +1,93 @@
+import json
+from selenium_driverless import webdriver
+from selenium_driverless.types.webelement import WebElement
+from selenium.common.exceptions import WebDriverException
+from utils.helpers import get_proper_string
+
+# Attribute holding the extraction sequence number of a card, so each card is read only once
+SEQ_ATTRIBUTE = "data-autoapply-seq"
+
+# Reads every company card (or only cards not read before) and its job listings in one roundtrip.
+# Cards are numbered in DOM order the first time they are read.
+# Returned as a JSON string so nested objects are not cut off by CDP serialization depth.
+EXTRACT_CARDS_SCRIPT = """
+const [onlyNew, seqAttribute] = arguments;
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.textContent : null;
+};
+const selector = onlyNew
+    ? `div[data-test="StartupResult"]:not([${seqAttribute}])`
+    : 'div[data-test="StartupResult"]';
+// The counter lives in the DOM so it survives across script worlds
+const root = document.documentElement;
+let seq = Number(root.getAttribute(seqAttribute) || 0);
+const cards = Array.from(document.querySelectorAll(selector)).map((card, index) => {
+    if (!card.hasAttribute(seqAttribute)) {
+        card.setAttribute(seqAttribute, ++seq);
+    }
+    return {
+        index: index,
+        seq: Number(card.getAttribute(seqAttribute)),
+        company_name: text(card, 'h2[class="inline text-md font-semibold"]'),
+        has_hide_button: Array.from(card.querySelectorAll('button'))
+            .some(button => button.textContent.replace(/\\s+/g, ' ').trim() === 'Hide'),
+        jobs: Array.from(card.querySelectorAll('div[class="styles_component__Ey28k"]')).map((job, jobIndex) => {
+            const link = job.querySelector('a[href*="/jobs/"]');
+            return {
+                index: jobIndex,
+                position: text(job, 'span[class="styles_title__xpQDw"]'),
+                remote_policy: text(job, 'span[class="styles_locations__HHbZs"]'),
+                compensation: text(job, 'span[class="styles_compensation__3JnvU"]'),
+                href: link ? link.href : null,
+            };
+        }),
+    };
+});
+root.setAttribute(seqAttribute, seq);
+return JSON.stringify(cards);
+"""
+
+# Text of every skill tag (direct div children) inside the modal's skills wrapper
+EXTRACT_SKILLS_SCRIPT = """
+return Array.from(arguments[0].children)
+    .filter(child => child.tagName === 'DIV')
+    .map(child => child.textContent);
+"""
+
+
+def _clean(value):
+    return get_proper_string(value) if value else None
+
+
+async def extract_company_cards(driver: webdriver.Chrome, only_new: bool = False) -> list[dict]:
+    """
+    Extract the company cards currently on the page with a single script call.
+
+    Args:
+        only_new: Skip cards returned by an earlier call
+
+    Returns:
+        list[dict]: One entry per StartupResult card, in DOM order, with seq (stable per card),
+        company_name, has_hide_button and jobs (position, remote_policy, compensation, href)
+    """
+    try:
+        raw = await driver.execute_script(EXTRACT_CARDS_SCRIPT, only_new, SEQ_ATTRIBUTE, timeout=10)
+    except WebDriverException as e:
+        print(f"Unable to extract company cards: {e}")
+        return []
+
+    cards = json.loads(raw) if raw else []
+    for card in cards:
+        # textContent keeps the markup's indentation and line breaks, so every text field is normalized
+        card['company_name'] = _clean(card['company_name'])
+        for job in card['jobs']:
+            job['position'] = _clean(job['position'])
+            job['remote_policy'] = _clean(job['remote_policy'])
+            job['compensation'] = _clean(job['compensation'])
+    return cards
+
+
+async def extract_skills(driver: webdriver.Chrome, skills: WebElement) -> list[str]:
+    """Read the text of every skill tag inside the skills wrapper with a single script call."""
+    return await driver.execute_script(EXTRACT_SKILLS_SCRIPT, skills) or []
@@ -0,0 +1,132 @@
+import re
+from typing import Optional, Callable, Dict, List, Tuple
+from utils.helpers import extract_experience
+from config.search import current_experience, bad_title_words, min_compensation
+
+# Amounts like "$120k", "₹10L", "€65,000" (equity percentages are ignored)
+_AMOUNT_PATTERN = re.compile(r'([$₹€£])\s*(\d[\d,]*(?:\.\d+)?)\s*([kKlLmM])?')
+_MULTIPLIERS = {'k': 1_000, 'l': 100_000, 'm': 1_000_000}
+
+
+def experience_rejection(exp: Optional[tuple], source: str) -> Optional[str]:
+    """Return a rejection reason if the (lower, upper, text, is_minimum) requirement exceeds current_experience."""
+    if not exp:
+        return None
+    lower, upper, exp_text, is_minimum = exp
+    if is_minimum:
+        # Minimum requirement (e.g., "2 years" = at least 2 years)
+        failed = current_experience < lower
+    else:
+        # Range requirement (e.g., "2-5 years"), current_experience must be within range
+        failed = not (lower <= current_experience <= upper)
+    if failed:
+        return f"Not enough experience (required: {exp_text}, found in {source})"
+    return None
+
+
+def max_compensation(compensation: str) -> Dict[str, float]:
+    """Return the highest salary amount per currency symbol found in a compensation string."""
+    amounts: Dict[str, float] = {}
+    for currency, number, suffix in _AMOUNT_PATTERN.findall(compensation or ""):
+        value = float(number.replace(',', '')) * _MULTIPLIERS.get(suffix.lower(), 1)
+        amounts[currency] = max(value, amounts.get(currency, 0))
+    return amounts
+
+
+def _check_position(card: dict) -> Optional[str]:
+    if not card.get('position'):
+        return "Position not found"
+    return None
+
+
+def _check_remote_policy(card: dict) -> Optional[str]:
+    remote_policy = card.get('remote_policy')
+    if not remote_policy:
+        return "Remote policy not found"
+    if "in office" in remote_policy.lower():
+        return f"{card['position']} is not remote"
+    return None
+
+
+def _check_compensation(card: dict) -> Optional[str]:
+    if not card.get('compensation'):
+        return "Compensation not found"
+    return None
+
+
+def _check_title_keywords(card: dict) -> Optional[str]:
+    title_low = card['position'].lower()
+    for word in bad_title_words:
+        if word.lower() in title_low:
+            return f"Skipped job due to title keyword {word}"
+    return None
+
+
+def _check_title_experience(card: dict) -> Optional[str]:
+    exp = extract_experience(card['position'], current_experience)
+    if exp:
+        card['exp_required'] = exp[2]
+    return experience_rejection(exp, "title")
+
+
+def _check_compensation_floor(card: dict) -> Optional[str]:
+    if not min_compensation:
+        return None
+    for currency, top in max_compensation(card['compensation']).items():
+        floor = min_compensation.get(currency)
+        if floor and top < floor:
+            return f"Compensation below floor ({card['compensation']})"
+    return None
+
+
+class FilterPipeline:
+    """
+    Staged job filter. Card stages only need data visible on the job card, so they run
+    before the modal is opened; modal stages are tallied through reject().
+    """
+
+    CARD_STAGES: List[Tuple[str, Callable[[dict], Optional[str]]]] = [
+        ('position', _check_position),
+        ('remote_policy', _check_remote_policy),
+        ('compensation', _check_compensation),
+        ('title_keywords', _check_title_keywords),
+        ('title_experience', _check_title_experience),
+        ('compensation_floor', _check_compensation_floor),
+    ]
+
+    def __init__(self):
+        self.eliminated: Dict[str, int] = {name: 0 for name, _ in self.CARD_STAGES}
+        # Jobs that passed every card stage, and those of them actually opened (modal or job page);
+        # the rest were decided on captured data, skipped at the limit or failed to open
+        self.passed = 0
+        self.opened = 0
+
+    def check_card(self, card: dict) -> Optional[str]:
+        """
+        Run every card stage in order.
+
+        Args:
+            card: Job data read from the card (position, remote_policy, compensation)
+
+        Returns:
+            The rejection reason of the first failing stage, or None if the job survives
+        """
+        for name, check in self.CARD_STAGES:
+            reason = check(card)
+            if reason:
+                self.eliminated[name] += 1
+                return reason
+        self.passed += 1
+        return None
+
+    def reject(self, stage: str):
+        """Count a job eliminated by a stage that runs after the modal is opened."""
+        self.eliminated[stage] = self.eliminated.get(stage, 0) + 1
+
+    def report(self):
+        """Print how many jobs each stage eliminated."""
+        print("Filter stages:")
+        for name, eliminated in self.eliminated.items():
+            print(f"  {name}: {eliminated} eliminated")
+        print(f"  Jobs passing card filters: {self.passed}")
+        print(f"  Jobs opened: {self.opened}")
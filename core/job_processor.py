@@ -1,401 +1,513 @@
+import asyncio
+from typing import Optional
 from selenium_driverless import webdriver
 from selenium_driverless.types.webelement import WebElement
 from selenium_driverless.types.by import By
 from selenium.common.exceptions import WebDriverException
 from utils.helpers import get_proper_string, format_timestamp, extract_experience, scroll_to
-from services.db import store_single_job
+from utils.skills import SkillMatcher
+from utils.description import DescriptionAnalyzer
+from core.filters import FilterPipeline, experience_rejection
+from core.extraction import extract_skills
+from core.capture import JobRecord, job_capture
+from core.tab_pool import TabUnavailable, get_tab_pool
+from utils.waits import wait_for_dom_stable, wait_until_gone
+from utils.timing import span, timed
+from utils.pacer import pacer
+from utils.captcha import captcha_cleared
+from services.results import ResultSink
 from config.search import current_experience, good_skills, bad_skills, strict_bad_skills, bad_words
-from config.settings import store_in_db
+from config.settings import store_in_db, tab_pool_size, tab_timeout, tab_wait_timeout
 
-async def process_jobs(driver: webdriver.Chrome, job_listings: list[WebElement], company_name: str, applied: list, rejected: list, count: int, limit: int):
+# Built once so per-job skill checks are a single scan
+skill_matcher = SkillMatcher(good_skills, bad_skills, strict_bad_skills)
+
+# Experience and bad words of a description in one memoized scan
+description_analyzer = DescriptionAnalyzer(bad_words)
+
+# Tracks how many jobs each filter stage eliminated during the run
+filter_pipeline = FilterPipeline()
+
+# Only one tab at a time may fill in and submit an application
+apply_gate = asyncio.Lock()
+
+async def reject_job(job_obj: dict, reason: str, results: ResultSink, stage: str = None):
+    """Record a rejected job, optionally counting it against a modal filter stage."""
+    job_obj['notes'] = reason
+    await results.record(job_obj, 'rejected')
+    if stage:
+        filter_pipeline.reject(stage)
+
+def check_skills(job_obj: dict, skills_text: str) -> tuple:
+    """Run the skills stage. Returns (rejection_reason, stage), both None if the job passes."""
+    job_obj['skills'] = skills_text
+
+    # Good skill found -> bad skills are ignored; strict bad skills always apply
+    matched = skill_matcher.match(skills_text)
+
+    if not matched.good and matched.bad:
+        return f'Found bad skill {matched.bad}. Skipping.', 'bad_skills'
+
+    if matched.strict:
+        return f'Found strict bad skill {matched.strict}. Skipping.', 'strict_bad_skills'
+
+    return None, None
+
+def check_description(job_obj: dict, description: str, details_text: Optional[str]) -> tuple:
+    """
+    Run the experience and bad word stages on the title, the details list and the description.
+    Returns (rejection_reason, stage), both None if the job passes.
+    """
+    job_obj['description'] = description
+
+    # Check experience from job title
+    title_exp = extract_experience(job_obj['position'], current_experience)
+
+    # Check experience from ul element in the job details
+    ul_exp = extract_experience(details_text, current_experience) if details_text else None
+
+    # Check experience from description
+    analysis = description_analyzer.analyze(description)
+    desc_exp = analysis.experience
+
+    # Collect all experience requirements found
+    exp_requirements = []
+    if title_exp:
+        exp_requirements.append(("title", title_exp))
+    if ul_exp:
+        exp_requirements.append(("ul", ul_exp))
+    if desc_exp:
+        exp_requirements.append(("description", desc_exp))
+
+    # Use the first found requirement for display, but check all
+    job_obj['exp_required'] = exp_requirements[0][1][2] if exp_requirements else None
+
+    # Check all sources - reject if any requires more experience
+    for source_name, exp in exp_requirements:
+        reason = experience_rejection(exp, source_name)
+        if reason:
+            return reason, 'experience'
+
+    if analysis.bad_words:
+        return f"Skipped job due to bad word {analysis.bad_words[0]} found in description", 'bad_words'
+
+    return None, None
+
+def evaluate_record(record: JobRecord, job_obj: dict, href: Optional[str]) -> tuple:
+    """
+    Run the detail stages on a job captured from the site's API instead of on the modal.
+    Returns (rejection_reason, stage), both None if the job passes.
+    """
+    job_capture.evaluated += 1
+    # Whatever the outcome the record is not read again (the job keeps it while it is opened to apply)
+    job_capture.discard(href)
+    reason, stage = check_skills(job_obj, get_proper_string(" ".join(record.skills)))
+    if reason:
+        return reason, stage
+    details_text = "\n".join(record.details) if record.details else None
+    reason, stage = check_description(job_obj, record.description, details_text)
+    if reason:
+        return reason, stage
+    job_obj['url'] = href
+    job_obj['type'] = record.job_type
+    return None, None
+
+async def find_apply_button(page: webdriver.Chrome, root: WebElement) -> tuple:
+    """
+    Returns:
+        tuple: (apply_button, rejection_reason, stage). Only apply_button is set if it can be clicked;
+        all three are None when there is no button.
+    """
+    try:
+        # Try to find the apply button within the root first, then fallback to the page
+        async with span("find_element.apply_button"):
+            try:
+                apply_button: WebElement = await root.find_element(By.XPATH, './/button[@data-test="JobDescriptionSlideIn--SubmitButton"]')
+            except:
+                apply_button: WebElement = await page.find_element(By.XPATH, '//button[@data-test="JobDescriptionSlideIn--SubmitButton"]')
+    except:
+        print("Apply button not found")
+        return None, None, None
+
+    if await apply_button.get_attribute('disabled'):
+        return None, "Either already applied or not accepting from location", 'apply_disabled'
+
+    return apply_button, None, None
+
+@timed()
+async def evaluate_job(page: webdriver.Chrome, root: WebElement, job_obj: dict, record: JobRecord = None):
+    """
+    Read the opened job (modal or job page) and run the detail filter stages.
+
+    Args:
+        page: Driver or tab target the job is shown in
+        root: Element containing the job details (the modal, or the tab itself)
+        job_obj: Job object to fill in with skills, description, experience, url and type
+        record: Captured record the detail stages already passed on; only the apply button is read
+
+    Returns:
+        tuple: (apply_button, rejection_reason, stage). apply_button is set when the job
+        passed every check; all three are None when the job could not be read.
+    """
+    apply_button, reason, stage = await find_apply_button(page, root)
+    if apply_button is None or record is not None:
+        return apply_button, reason, stage
+
+    try:
+        # Get the wrapper div containing all skills
+        async with span("find_element.skills"):
+            skills: WebElement = await root.find_element(
+                By.XPATH,
+                './/span[text()="Skills"]/following-sibling::div[contains(@class, "flex")]'
+            )
+    except:
+        print("Skills not found")
+        return None, None, None
+
+    await scroll_to(page, skills)
+
+    # Extract the text of all individual skill tags inside the wrapper
+    skillsTextList = await extract_skills(page, skills)
+    reason, stage = check_skills(job_obj, get_proper_string(" ".join(skillsTextList)))
+    if reason:
+        return None, reason, stage
+
+    # check for required experience & bad words
+    try:
+        async with span("find_element.description"):
+            description_dom: WebElement = await root.find_element(By.XPATH, '//div[@id="job-description"]')
+    except: 
+        print("Description not found")
+        return None, None, None
+
+    await scroll_to(page, description_dom)
+
+    description = get_proper_string(await description_dom.text)
+
+    # Experience listed in the ul element of the job details
+    ul_text = None
+    try:
+        async with span("find_element.details_list"):
+            ul_element = await root.find_element(By.XPATH, './/ul[contains(@class, "flex flex-wrap")]', timeout=5)
+        if ul_element:
+            ul_text = await ul_element.text
+    except:
+        pass  # ul element not found, continue
+
+    reason, stage = check_description(job_obj, description, ul_text)
+    if reason:
+        return None, reason, stage
+    
+    # Get job URL from current page
+    try:
+        job_obj['url'] = await page.current_url
+    except:
+        job_obj['url'] = None
+
+    # Try to get job type (Full-time, Part-time, etc.)
+    try:
+        async with span("find_element.job_type"):
+            type_elements = await root.find_elements(By.XPATH, './/span[contains(text(), "Full-time") or contains(text(), "Part-time") or contains(text(), "Contract") or contains(text(), "Internship")]')
+        if type_elements:
+            job_obj['type'] = await type_elements[0].text
+        else:
+            job_obj['type'] = None
+    except:
+        job_obj['type'] = None
+
+    return apply_button, None, None
+
+@timed()
+async def submit_application(root: WebElement, apply_button: WebElement, job_obj: dict, results: ResultSink):
+    """Fill in the note to the company, click apply and record the applied job."""
+    position, company_name = job_obj['position'], job_obj['company_name']
+    try: 
+        async with span("find_element.note"):
+            text_area: WebElement = await root.find_element(By.XPATH, '//textarea[contains(@id, "form-input")]')
+        await text_area.clear()
+        await text_area.send_keys(f"Hello! I'd like to apply for the {position} role at {company_name}.")
+    except: print("Text area not found")
+
+    # Set application date when actually applying
+    job_obj['application_date'] = format_timestamp()
+
+    async with pacer.action("click"):
+        await apply_button.click()
+    
+    # Store job immediately in database
+    success = await results.record(job_obj, 'applied')
+    if store_in_db:
+        if success:
+            print(f"✓ Stored applied job: {position} at {company_name}")
+        else:
+            print(f"✗ Failed to store applied job: {position} at {company_name}")
+
+async def record_failure(job_obj: dict, error: Exception, results: ResultSink):
+    """Record a job whose processing failed with a WebDriverException."""
+    print(error)
+    reason = f"Error while processing job: {type(error).__name__}"
+    job_obj['notes'] = reason
+    company_name = job_obj['company_name']
+    
+    # Store rejected job immediately in database
+    success = await results.record(job_obj, 'rejected')
+    if store_in_db:
+        if success:
+            print(f"✓ Stored rejected job: {job_obj.get('position', 'Unknown')} at {company_name} - {reason}")
+        else:
+            print(f"✗ Failed to store rejected job: {job_obj.get('position', 'Unknown')} at {company_name}")
+
+@timed()
+async def process_in_modal(driver: webdriver.Chrome, job: WebElement, job_obj: dict, results: ResultSink,
+                           record: JobRecord = None, href: str = None) -> bool:
+    """
+    Open a job's modal from its card, evaluate it and apply if it passes.
+
+    Args:
+        record: Captured record the job already passed the detail stages on
+        href: Link of the listing, to find the record captured when the modal loads its details
+
+    Returns:
+        bool: True if the job was applied to
+    """
+    async with pacer.action("click"):
+        await job.click()
+    # wait for job modal to open
+    close_button = None
+    modal = None
+    
+    try: 
+        async with span("find_element.modal"):
+            modal: WebElement = await driver.find_element(By.XPATH, './/div[contains(@class, "ReactModal__Content")]', timeout=15)
+        await wait_for_dom_stable(driver, timeout=1, root=modal, name="modal_open", budget=3)
+    except: 
+        print("Modal not found")
+        return False
+    filter_pipeline.opened += 1
+
+    try: 
+        async with span("find_element.close_button"):
+            close_button: WebElement = await driver.find_element(By.XPATH, '//button[@data-test="closeButton"]/*[1]')
+    except: 
+        print("Modal close button not found")
+        return False
+    
+    try:
+        if record is None and job_capture.has_details:
+            # The modal's own detail request usually completes before the modal settles
+            record = await job_capture.wait_complete(href, timeout=0.25)
+            if record is not None:
+                reason, stage = evaluate_record(record, job_obj, href)
+                if reason:
+                    await reject_job(job_obj, reason, results, stage)
+                    return False
+
+        apply_button, reason, stage = await evaluate_job(driver, modal, job_obj, record)
+        if reason:
+            # Store rejection
+            await reject_job(job_obj, reason, results, stage)
+            return False
+        if apply_button is None:
+            return False
+
+        await submit_application(modal, apply_button, job_obj, results)
+        return True
+    except WebDriverException as e:
+        await record_failure(job_obj, e, results)
+        return False
+    finally:
+        # Safely close the modal if it's still open
+        try:
+            if close_button is not None:
+                try:
+                    # Try to check if button is visible (might fail if element is stale)
+                    if await close_button.is_visible():
+                        async with pacer.action("click"):
+                            await close_button.click()
+                        await wait_until_gone(driver, modal, timeout=1, name="modal_close")
+                except Exception:
+                    # Element might be stale, try to find it again
+                    try:
+                        async with span("find_element.close_button"):
+                            close_button_new = await driver.find_element(By.XPATH, '//button[@data-test="closeButton"]/*[1]', timeout=2)
+                        if await close_button_new.is_visible():
+                            async with pacer.action("click"):
+                                await close_button_new.click()
+                            await wait_until_gone(driver, '//div[contains(@class, "ReactModal__Content")]', timeout=1, name="modal_close")
+                    except Exception:
+                        # Modal might already be closed or page changed, ignore
+                        pass
+        except Exception as e:
+            # Ignore errors when trying to close modal
+            pass
+
+async def process_in_tabs(driver: webdriver.Chrome, jobs: list[tuple[dict, dict]], results: ResultSink, count: int, limit: int) -> tuple:
+    """
+    Load job pages in the background tab pool and evaluate them concurrently.
+    Applications are serialized through apply_gate, and a failing or stuck tab only affects its own job.
+
+    Args:
+        jobs: (job_data, job_obj) pairs whose job_data has an href
+
+    Returns:
+        tuple: (updated count of applied jobs, pairs that could not get a tab and are left for the modal)
+    """
+    pool = await get_tab_pool(driver, tab_pool_size)
+    applied_count = count
+    untouched: list[tuple[dict, dict]] = []
+
+    def limit_reached() -> bool:
+        return limit > 0 and applied_count >= limit
+
+    async def evaluate(tab, job_data: dict, job_obj: dict) -> tuple:
+        # The timeout starts once the tab and a navigation slot of the pacer are free,
+        # so waiting in line for either does not count against a job
+        loop = asyncio.get_running_loop()
+        async with pacer.action("navigation"):
+            deadline = loop.time() + tab_timeout
+            await asyncio.wait_for(tab.get(job_data['href'], wait_load=True), tab_timeout)
+        await asyncio.wait_for(wait_for_dom_stable(tab, timeout=3, name="job_page"), deadline - loop.time())
+        filter_pipeline.opened += 1
+        try:
+            return await asyncio.wait_for(evaluate_job(tab, tab, job_obj, job_data.get('record')),
+                                          deadline - loop.time())
+        except WebDriverException as e:
+            await record_failure(job_obj, e, results)
+            return None, None, None
+
+    async def submit(tab, apply_button: WebElement, job_obj: dict):
+        nonlocal applied_count
+        await submit_application(tab, apply_button, job_obj, results)
+        applied_count += 1
+
+    async def handle(job_data: dict, job_obj: dict):
+        # Jobs still waiting for a tab when the limit is reached are never loaded
+        if limit_reached():
+            return
+        async with pool.tab(tab_wait_timeout) as tab:
+            if limit_reached():
+                return
+            apply_button, reason, stage = await evaluate(tab, job_data, job_obj)
+            if reason:
+                await reject_job(job_obj, reason, results, stage)
+                return
+            if apply_button is None:
+                return
+
+            async with apply_gate:
+                if limit_reached():
+                    return
+                # Once Apply is clicked the job must be recorded and counted, so the submission runs
+                # to the end even if this task is cancelled, and it holds the gate until it does
+                submission = asyncio.ensure_future(submit(tab, apply_button, job_obj))
+                try:
+                    await asyncio.shield(submission)
+                except asyncio.CancelledError:
+                    await submission
+                    raise
+
+    async def isolated(job_data: dict, job_obj: dict):
+        try:
+            await handle(job_data, job_obj)
+        except TabUnavailable as e:
+            # Raised only while waiting to borrow a tab, so the job was never loaded
+            print(f"No tab for {job_obj['position']} at {job_obj['company_name']} ({e}), opening it in the modal")
+            untouched.append((job_data, job_obj))
+        except asyncio.TimeoutError:
+            print(f"Timed out loading {job_obj['position']} at {job_obj['company_name']}, skipping")
+        except Exception as e:
+            print(f"Tab failed for {job_obj['position']} at {job_obj['company_name']}: {e}")
+
+    await asyncio.gather(*(isolated(job_data, job_obj) for job_data, job_obj in jobs))
+    return applied_count, untouched
+
+async def process_jobs(driver: webdriver.Chrome, company: WebElement, jobs: list[dict], company_name: str, results: ResultSink, count: int, limit: int):
     """
     Process job listings and apply to matching jobs.
+
+    Args:
+        company: The company card element, used to locate the job listings to click
+        jobs: Job data extracted from the card (see core.extraction.extract_company_cards)
     
     Returns:
         int: Updated count of applied jobs
     """
     try:
-        reason = ""
-        for job in job_listings:
+        # Stage 1: reject everything decidable from the extracted card data
+        survivors: list[tuple[dict, dict]] = []
+        for job_data in jobs:
             # If limit is 0, run unlimited; otherwise check limit
             if limit > 0 and count >= limit:
                 break
-                
-            position = "Position not found"
-            remote_policy = "Remote policy not found"
-            compensation = "Compensation not found"
-            time = format_timestamp()
 
             # job object to store
             job_obj = {
                 'company_name': company_name,
-                'position': position,
-                'remote_policy': remote_policy,
-                'compensation': compensation,
-                'time': time,
+                'position': job_data['position'] or "Position not found",
+                'remote_policy': job_data['remote_policy'] or "Remote policy not found",
+                'compensation': job_data['compensation'] or "Compensation not found",
+                'time': format_timestamp(),
                 'url': None,
                 'type': None,
-                'location': None,
+                'location': job_data['remote_policy'],  # Store location as well
                 'exp_required': None,
                 'application_date': None
             }
+            card = {
+                'position': job_data['position'],
+                'remote_policy': job_data['remote_policy'],
+                'compensation': job_data['compensation'],
+            }
 
-            # Check position
-            try: 
-                position_dom: WebElement = await job.find_element(By.XPATH, './/span[@class="styles_title__xpQDw"]')
-                position: str = await position_dom.text
-                job_obj['position'] = position
-
-                await driver.sleep(0.5)
-            except: 
-                reason = f"{position}"
-                job_obj['notes'] = reason
-                # Store early rejection
-                if store_in_db:
-                    await store_single_job(job_obj, 'rejected')
-                rejected.append(job_obj)
-                continue
-        
-            # Check job location
-            try: 
-                location_dom: WebElement = await job.find_element(By.XPATH, './/span[@class="styles_locations__HHbZs"]')
-                remote_policy = get_proper_string(await location_dom.text)
-                job_obj['remote_policy'] = remote_policy
-                job_obj['location'] = remote_policy  # Store location as well
-
-                if "in office" in remote_policy.lower():
-                    reason = f'{position} is not remote'
-                    job_obj['notes'] = reason
-                    # Store early rejection
-                    if store_in_db:
-                        await store_single_job(job_obj, 'rejected')
-                    rejected.append(job_obj)
-                    continue
-
-                await driver.sleep(0.5)
-            except:                     
-                reason = f"{remote_policy}"
-                job_obj['notes'] = reason
-                # Store early rejection
-                if store_in_db:
-                    await store_single_job(job_obj, 'rejected')
-                rejected.append(job_obj)
-                continue
-
-            # Check compensation
-            try: 
-                compensation_dom: WebElement = await job.find_element(By.XPATH, './/span[@class="styles_compensation__3JnvU"]')
-                compensation: str = get_proper_string(await compensation_dom.text)
-                job_obj['compensation'] = compensation
-            except:                     
-                reason = f"{compensation}"
-                job_obj['notes'] = reason
+            reason = filter_pipeline.check_card(card)
+            if card.get('exp_required'):
+                job_obj['exp_required'] = card['exp_required']
+            if reason:
                 # Store early rejection
-                if store_in_db:
-                    await store_single_job(job_obj, 'rejected')
-                rejected.append(job_obj)
-                continue
-        
-            await job.click()
-            # wait for job modal to open
-            close_button = None
-            modal = None
-            
-            try: 
-                modal: WebElement = await driver.find_element(By.XPATH, './/div[contains(@class, "ReactModal__Content")]', timeout=15)
-                await driver.sleep(1)
-            except: 
-                print("Modal not found")
+                await reject_job(job_obj, reason, results)
                 continue
 
-            try: 
-                close_button: WebElement = await driver.find_element(By.XPATH, '//button[@data-test="closeButton"]/*[1]')
-                await driver.sleep(1)
-            except: 
-                print("Modal close button not found")
-                continue
-            
-            try:
-                try: 
-                    # Try to find the apply button within the modal first, then fallback to driver
-                    try:
-                        apply_button: WebElement = await modal.find_element(By.XPATH, './/button[@data-test="JobDescriptionSlideIn--SubmitButton"]')
-                    except:
-                        apply_button: WebElement = await driver.find_element(By.XPATH, '//button[@data-test="JobDescriptionSlideIn--SubmitButton"]')
-                    await driver.sleep(1)
-                except: 
-                    print("Apply button not found")
+            # Detail stages on the data the feed response already carried, without opening the job
+            record = job_capture.get(job_data['href'])
+            if record is not None and record.complete:
+                reason, stage = evaluate_record(record, job_obj, job_data['href'])
+                if reason:
+                    await reject_job(job_obj, reason, results, stage)
                     continue
+                job_data['record'] = record
 
-                if await apply_button.get_attribute('disabled'):
-                    reason = f"Either already applied or not accepting from location"
-                    job_obj['notes'] = reason
-                    # Store rejection
-                    if store_in_db:
-                        await store_single_job(job_obj, 'rejected')
-                    rejected.append(job_obj)
-                    continue
+            survivors.append((job_data, job_obj))
 
-                try:
-                    # Get the wrapper div containing all skills
-                    skills: WebElement = await modal.find_element(
-                        By.XPATH,
-                        './/span[text()="Skills"]/following-sibling::div[contains(@class, "flex")]'
-                    )
-                except:
-                    print("Skills not found")
-                    skills = None
-                    continue
-
-                if skills:
-                    await scroll_to(driver, skills)
-
-                    # Get all individual skill tags inside the wrapper
-                    skill_items = await skills.find_elements(By.XPATH, './div')
-
-                    # Extract text
-                    skillsTextList = [await s.text for s in skill_items]
-                    skillsText = get_proper_string(" ".join(skillsTextList))
-
-                    job_obj['skills'] = skillsText
-                    skills_low = skillsText.lower()
-                    
-                    # Split skills into individual words for comparison
-                    skill_words = skills_low.split()
-                    
-                    # Helper function to check if any word from job skills matches any skill in a list
-                    def word_matches_skill(word, skill_list):
-                        """Check if a word matches any skill (handles both single and multi-word skills)"""
-                        word_lower = word.lower().strip()
-                        for skill in skill_list:
-                            skill_lower = skill.lower().strip()
-                            # Exact match
-                            if word_lower == skill_lower:
-                                return skill
-                            # If skill is multi-word, check if word is part of it
-                            if ' ' in skill_lower and word_lower in skill_lower:
-                                return skill
-                            # If skill is single word and word contains it (for partial matches like "pentesting" contains "testing")
-                            if ' ' not in skill_lower and skill_lower in word_lower and len(skill_lower) >= 3:
-                                return skill
-                        return None
-                    
-                    # Check each word in job skills against good/bad skills
-                    # First check full phrases, then individual words
-                    good_word = next((skill for skill in good_skills if skill.lower() in skills_low), False)
-                    if not good_word:
-                        for word in skill_words:
-                            matched_skill = word_matches_skill(word, good_skills)
-                            if matched_skill:
-                                good_word = matched_skill
-                                break
-                    
-                    if not good_word:
-                        # Check full phrases first
-                        bad_word = next((skill for skill in bad_skills if skill.lower() in skills_low), False)
-                        if not bad_word:
-                            # Then check each word
-                            for word in skill_words:
-                                matched_skill = word_matches_skill(word, bad_skills)
-                                if matched_skill:
-                                    bad_word = matched_skill
-                                    break
-                        
-                        if bad_word:
-                            reason = f'Found bad skill {bad_word}. Skipping.'
-                            job_obj['notes'] = reason
-                            if store_in_db:
-                                await store_single_job(job_obj, 'rejected')
-                            rejected.append(job_obj)
-                            continue
-
-                    # Check strict bad skills - first as phrases, then individual words
-                    strict_bad_word = next((skill for skill in strict_bad_skills if skill.lower() in skills_low), False)
-                    if not strict_bad_word:
-                        for word in skill_words:
-                            matched_skill = word_matches_skill(word, strict_bad_skills)
-                            if matched_skill:
-                                strict_bad_word = matched_skill
-                                break
-                    
-                    if strict_bad_word:
-                        reason = f'Found strict bad skill {strict_bad_word}. Skipping.'
-                        job_obj['notes'] = reason
-                        if store_in_db:
-                            await store_single_job(job_obj, 'rejected')
-                        rejected.append(job_obj)
-                        continue
-
-                # check for required experience & bad words
-                try: description_dom: WebElement = await modal.find_element(By.XPATH, '//div[@id="job-description"]')
-                except: 
-                    print("Description not found")
-                    continue
-
-                await scroll_to(driver, description_dom)
+        # Stage 2: evaluate the survivors, in background tabs when the pool is enabled
+        if tab_pool_size > 1:
+            in_tabs = [(job_data, job_obj) for job_data, job_obj in survivors if job_data['href']]
+            survivors = [(job_data, job_obj) for job_data, job_obj in survivors if not job_data['href']]
+            if in_tabs:
+                count, untouched = await process_in_tabs(driver, in_tabs, results, count, limit)
+                survivors = sorted(survivors + untouched, key=lambda pair: pair[0]['index'])
 
-                description = get_proper_string(await description_dom.text)
-                job_obj['description'] = description
+        # Element handles are only needed for the jobs we click
+        job_listings: list[WebElement] = []
+        if survivors:
+            async with span("find_element.job_listings"):
+                job_listings = await company.find_elements(By.XPATH, ".//div[@class='styles_component__Ey28k']")
 
-                desc_low = description.lower()
-
-                # Check experience from job title
-                title_exp = extract_experience(position, current_experience)
-                
-                # Check experience from ul element in modal
-                ul_exp = None
-                try:
-                    ul_element = await modal.find_element(By.XPATH, './/ul[contains(@class, "flex flex-wrap")]', timeout=5)
-                    if ul_element:
-                        ul_text = await ul_element.text
-                        ul_exp = extract_experience(ul_text, current_experience)
-                except:
-                    pass  # ul element not found, continue
-
-                # Check experience from description
-                desc_exp = extract_experience(desc_low, current_experience)
-
-                # Collect all experience requirements found
-                exp_requirements = []
-                if title_exp:
-                    exp_requirements.append(("title", title_exp))
-                if ul_exp:
-                    exp_requirements.append(("ul", ul_exp))
-                if desc_exp:
-                    exp_requirements.append(("description", desc_exp))
-
-                # Check if any requirement exceeds current experience
-                exp_check_failed = False
-                if exp_requirements:
-                    # Use the first found requirement for display, but check all
-                    source, (lower_limit, upper_limit, exp_text, is_minimum) = exp_requirements[0]
-                    job_obj['exp_required'] = exp_text
-                    
-                    # Check all sources - reject if any requires more experience
-                    for source_name, (lower, upper, exp_text_val, is_min) in exp_requirements:
-                        # For minimum requirements (e.g., "2 years" = at least 2 years)
-                        # Check if current_experience >= lower
-                        # For ranges (e.g., "2-5 years"), check if current_experience is within range
-                        if is_min:
-                            # Minimum requirement: check if current_experience >= lower
-                            if current_experience < lower:
-                                reason = f"Not enough experience (required: {exp_text_val}, found in {source_name})"
-                                job_obj['notes'] = reason
-                                # Store rejection
-                                if store_in_db:
-                                    await store_single_job(job_obj, 'rejected')
-                                rejected.append(job_obj)
-                                exp_check_failed = True
-                                break
-                        else:
-                            # Range requirement: check if current_experience is within range
-                            if not (lower <= current_experience <= upper):
-                                reason = f"Not enough experience (required: {exp_text_val}, found in {source_name})"
-                                job_obj['notes'] = reason
-                                # Store rejection
-                                if store_in_db:
-                                    await store_single_job(job_obj, 'rejected')
-                                rejected.append(job_obj)
-                                exp_check_failed = True
-                                break
-                else:
-                    job_obj['exp_required'] = None
-                
-                if exp_check_failed:
-                    continue
-                
-                skip = False
-                for word in bad_words:
-                    if word.lower() in desc_low:
-                        reason = f"Skipped job due to bad word {word} found in description"
-                        job_obj['notes'] = reason
-                        # Store rejection
-                        if store_in_db:
-                            await store_single_job(job_obj, 'rejected')
-                        rejected.append(job_obj)
-                        skip = True
-                        break
-                if skip: continue
-                
-                # Get job URL from current page
-                try:
-                    job_url = await driver.current_url
-                    job_obj['url'] = job_url
-                except:
-                    job_obj['url'] = None
+        # Open the modal only for jobs that passed every card stage
+        for job_data, job_obj in survivors:
+            if limit > 0 and count >= limit:
+                break
+            if not await captcha_cleared():
+                break
+            if job_data['index'] >= len(job_listings):
+                print("Job listing element not found")
+                continue
 
-                # Try to get job type (Full-time, Part-time, etc.)
-                try:
-                    # Look for job type in the modal
-                    type_elements = await modal.find_elements(By.XPATH, './/span[contains(text(), "Full-time") or contains(text(), "Part-time") or contains(text(), "Contract") or contains(text(), "Internship")]')
-                    if type_elements:
-                        job_obj['type'] = await type_elements[0].text
-                    else:
-                        job_obj['type'] = None
-                except:
-                    job_obj['type'] = None
-
-                try: 
-                    text_area: WebElement = await modal.find_element(By.XPATH, '//textarea[contains(@id, "form-input")]')
-                    await text_area.clear()
-                    await text_area.send_keys(f"Hello! I'd like to apply for the {position} role at {company_name}.")
-                except: print("Text area not found")
-
-                # Set application date when actually applying
-                job_obj['application_date'] = format_timestamp()
-
-                await apply_button.click()
-                
-                # Store job immediately in database
-                if store_in_db:
-                    success = await store_single_job(job_obj, 'applied')
-                    if success:
-                        print(f"✓ Stored applied job: {position} at {company_name}")
-                    else:
-                        print(f"✗ Failed to store applied job: {position} at {company_name}")
-                
-                applied.append(job_obj)
+            if await process_in_modal(driver, job_listings[job_data['index']], job_obj, results,
+                                      job_data.get('record'), job_data['href']):
                 count += 1
-            except WebDriverException as e:
-                print(e)
-                job_obj['notes'] = reason
-                
-                # Store rejected job immediately in database
-                if store_in_db:
-                    success = await store_single_job(job_obj, 'rejected')
-                    if success:
-                        print(f"✓ Stored rejected job: {job_obj.get('position', 'Unknown')} at {company_name} - {reason}")
-                    else:
-                        print(f"✗ Failed to store rejected job: {job_obj.get('position', 'Unknown')} at {company_name}")
-                
-                rejected.append(job_obj)
-                continue
-            finally:
-                # Safely close the modal if it's still open
-                try:
-                    if close_button is not None:
-                        try:
-                            # Try to check if button is visible (might fail if element is stale)
-                            if await close_button.is_visible():
-                                await close_button.click()
-                                await driver.sleep(1)
-                        except Exception:
-                            # Element might be stale, try to find it again
-                            try:
-                                close_button_new = await driver.find_element(By.XPATH, '//button[@data-test="closeButton"]/*[1]', timeout=2)
-                                if await close_button_new.is_visible():
-                                    await close_button_new.click()
-                                    await driver.sleep(1)
-                            except Exception:
-                                # Modal might already be closed or page changed, ignore
-                                pass
-                except Exception as e:
-                    # Ignore errors when trying to close modal
-                    pass
         
         return count
                 
     except WebDriverException as e:
         print("error in process_jobs")
         raise e
-
@@ -2,8 +2,29 @@ from selenium_driverless import webdriver
 from selenium_driverless.types.by import By
 from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from config.secrets import email, password
+from config.settings import base_url
 from utils.captcha import detect_captcha
+from utils.waits import wait_for_dom_stable, wait_for_network_idle, wait_until_visible
+from utils.timing import timed
+from utils.pacer import pacer
 
+@timed()
+async def session_is_valid(driver: webdriver.Chrome) -> bool:
+    """
+    Check whether the browser profile still holds a logged-in session with one navigation to the jobs feed.
+    Logged-out visitors are redirected away or get the feed without its sort menu.
+    """
+    try:
+        async with pacer.action("navigation"):
+            await driver.get(f'{base_url}/jobs', wait_load=True)
+        if await driver.current_url != f'{base_url}/jobs':
+            return False
+        return await wait_until_visible(driver, '//button/span[text()="Recommended"]', timeout=5, name="session_check") is not None
+    except WebDriverException as e:
+        print(f"Unable to validate saved session: {e}")
+        return False
+
+@timed()
 async def login(driver: webdriver.Chrome, retries=3):
     try:
         try: email_field = await driver.find_element(By.XPATH, '//input[@placeholder="Email"]', timeout=15)
@@ -14,7 +35,7 @@ async def login(driver: webdriver.Chrome, retries=3):
         await email_field.clear()
         await email_field.send_keys(email)
 
-        await driver.sleep(1)
+        await wait_for_dom_stable(driver, quiet=0.1, timeout=1, name="login_typing")
 
         try: password_field = await driver.find_element(By.XPATH, '//input[@placeholder="Password"]', timeout=5)
         except NoSuchElementException as e: 
@@ -24,15 +45,16 @@ async def login(driver: webdriver.Chrome, retries=3):
         await password_field.clear()
         await password_field.send_keys(password)
 
-        await driver.sleep(1)
+        await wait_for_dom_stable(driver, quiet=0.1, timeout=1, name="login_typing")
         
         try: submit_button = await driver.find_element(By.XPATH, '//input[@value="Log in"]', timeout=5)
         except NoSuchElementException as e:
             print("Submit button not found")
             raise e 
         
-        await submit_button.click()
-        await driver.sleep(5)
+        async with pacer.action("click"):
+            await submit_button.click()
+        await wait_for_network_idle(driver, timeout=5, name="login_submit")
 
         captcha = await detect_captcha(driver)
         print(f"CAPTCHA detected in login: {captcha}")
@@ -40,20 +62,22 @@ async def login(driver: webdriver.Chrome, retries=3):
             print("CAPTCHA detected, waiting for next instance of the browser...")
             return
 
-        try: await driver.get('https://wellfound.com/jobs', wait_load=True)
+        try:
+            async with pacer.action("navigation"):
+                await driver.get(f'{base_url}/jobs', wait_load=True)
         except WebDriverException as e:
             print(f"Error during redirect to jobs page: {e}")
             raise e
 
         # wait till redirect to jobs page
-        if await driver.current_url != 'https://wellfound.com/jobs':
+        if await driver.current_url != f'{base_url}/jobs':
             if retries > 0:
                 print("Login failed, retrying...")
                 return await login(driver, retries=retries - 1)
             else:
                 raise WebDriverException("Failed to login after multiple attempts")
 
-        await driver.sleep(1)
+        await wait_for_dom_stable(driver, timeout=1, name="jobs_page")
 
     except WebDriverException as e:
         print(f"Error during login: {e}")
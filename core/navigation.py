@@ -1,9 +1,14 @@
+import asyncio
 from selenium_driverless import webdriver
 from selenium_driverless.types.webelement import WebElement
 from selenium_driverless.types.by import By
 from selenium.common.exceptions import NoSuchElementException, WebDriverException
-from utils.helpers import wait_for_disappearance
+from core.extraction import SEQ_ATTRIBUTE
+from utils.waits import wait_until_visible, wait_until_gone, wait_for_dom_stable
+from utils.pacer import pacer
+from utils.timing import timed
 
+@timed()
 async def set_filters(driver: webdriver.Chrome):
     try:
         try: sort_by = await driver.find_element(By.XPATH, '//button/span[text()="Recommended"]', timeout=15)
@@ -11,31 +16,37 @@ async def set_filters(driver: webdriver.Chrome):
             print("Sort button not found")
             raise e
 
-        await sort_by.click()
-        await driver.sleep(1)
+        async with pacer.action("click"):
+            await sort_by.click()
+        await wait_until_visible(driver, '//span[text()="See most recent jobs first"]', timeout=1, name="sort_menu")
 
         try: most_recent = await driver.find_element(By.XPATH, '//span[text()="See most recent jobs first"]')
         except NoSuchElementException:
             print("Most Recent option not found")
             raise e
 
-        await most_recent.click()
+        async with pacer.action("click"):
+            await most_recent.click()
 
         try: loader: WebElement = await driver.find_element(By.XPATH, '//div[@class="styles_component__YafBz"]', timeout=10)
         except NoSuchElementException:
             print("Loader div not found")
 
-        await wait_for_disappearance(driver, loader)
-        await driver.sleep(1)
+        await wait_until_gone(driver, loader, timeout=30, name="filter_loader", budget=3)
+        await wait_for_dom_stable(driver, timeout=1, name="filtered_feed")
 
     except WebDriverException as e:
         print(f"Error during setting filters: {e}")
         raise e
 
-async def load_companies(driver: webdriver.Chrome):
-    try: companies: list[WebElement] = await driver.find_elements(By.XPATH, '//div[@data-test="StartupResult"]')
+@timed()
+async def load_companies(driver: webdriver.Chrome, after_seq: int = 0) -> dict[int, WebElement]:
+    """Handles of the cards numbered by extract_company_cards above after_seq, keyed by their number."""
+    xpath = f'//div[@data-test="StartupResult"][@{SEQ_ATTRIBUTE} > {int(after_seq)}]'
+    try: companies: list[WebElement] = await driver.find_elements(By.XPATH, xpath)
     except NoSuchElementException as e:
         print("No companies found")
-        return []
-    return companies
+        return {}
+    seqs = await asyncio.gather(*(company.get_dom_attribute(SEQ_ATTRIBUTE) for company in companies))
+    return {int(seq): company for seq, company in zip(seqs, companies) if seq}
 
@@ -4,95 +4,202 @@ from selenium_driverless.types.by import By
 from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from selenium_driverless.types.webelement import NoSuchElementException as DriverlessNoSuchElementException
 from core.navigation import load_companies
-from core.job_processor import process_jobs
+from core.extraction import extract_company_cards
+from core.capture import job_capture
+from core.job_processor import process_jobs, filter_pipeline
 from core.application import hide_company
 from utils.helpers import scroll_to
-from config.settings import hide_companies
+from utils.waits import wait_for_dom_stable, wait_for_network_idle
+from utils.pacer import pacer
+from utils.captcha import captcha_cleared
+from services.seen_jobs import is_seen
+from services.leases import WorkLeases
+from services.checkpoints import Checkpoint, save_checkpoint
+from services.results import ResultSink
+from config.settings import hide_companies, skip_seen_jobs
 
-async def start_applying(driver: webdriver.Chrome, applied: list, rejected: list, count: int, limit: int):
+# Scrolls in a row that may load nothing new before the feed is considered exhausted
+MAX_EMPTY_SCROLLS = 2
+
+async def load_more(driver: webdriver.Chrome):
+    """Scroll to the bottom of the feed and wait for the next page of cards to render."""
+    try:
+        async with pacer.action("scroll"):
+            await driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        await wait_for_network_idle(driver, timeout=3, name="infinite_scroll")
+        await wait_for_dom_stable(driver, timeout=1, name="infinite_scroll_render", budget=0)
+    except WebDriverException as e:
+        print(f"Error during more load_companies")
+        raise e
+
+async def start_applying(driver: webdriver.Chrome, results: ResultSink, count: int, limit: int,
+                         leases: WorkLeases = None, checkpoint: Checkpoint = None):
     """
     Main orchestration function that coordinates the job application process.
+
+    Args:
+        results: Receives every processed job
+        leases: When running as one of several workers, companies are only processed once claimed
+        checkpoint: Progress of the run, saved after every company; a resumed run skips the cards it covers
     
     Returns:
-        tuple: (updated_count, updated_applied, updated_rejected)
+        int: Updated count of applied jobs
     """
     try:
         print("Starting to apply...")
-        
+
+        # Cards are numbered as they are extracted; the watermark is the highest number handled so far
+        watermark = 0
+        processed = set()
+        empty_scrolls = 0
+
+        # Hidden companies are gone from the feed on reload, so positions only line up when nothing was hidden
+        fast_forward = checkpoint is not None and checkpoint.feed_cursor > 0 and not hide_companies
+        skipped = 0
+        blocked = False
+
         # If limit is 0, run unlimited until no more jobs
         while limit == 0 or count < limit:
-            companies = await load_companies(driver)
-            if len(companies) == 0:
-                print(f"No companies found")
-                return count, applied, rejected
-            
-            for company in companies:
+            if not await captcha_cleared():
+                blocked = True
+                break
 
-                if company is False:
-                    await driver.sleep(2)
-                    if company is False:
-                        continue
+            # one roundtrip for the data of the cards appended since the last pass
+            cards = await extract_company_cards(driver, only_new=True)
+            job_capture.enrich(cards)
+            if len(cards) == 0:
+                if watermark == 0:
+                    print(f"No companies found")
+                    break
+                empty_scrolls += 1
+                if empty_scrolls > MAX_EMPTY_SCROLLS:
+                    print(f"No more companies loaded")
+                    break
+                await load_more(driver)
+                continue
+            empty_scrolls = 0
+
+            # handles are only kept for clicks, paired with the card data by sequence number
+            companies = await load_companies(driver, after_seq=watermark)
+            watermark = max(card['seq'] for card in cards)
+            unmatched = [card['seq'] for card in cards if card['seq'] not in companies]
+            if unmatched:
+                print(f"No handle for {len(unmatched)} of {len(cards)} cards, skipping them")
+
+            for card in cards:
+                company = companies.get(card['seq'])
+                if company is None:
+                    continue
 
                 if limit > 0 and count >= limit:
                     print("Limit reached")
                     break
+
+                # cards up to the last company handled before the restart are passed without scrolling to them
+                if fast_forward:
+                    handled = card['seq'] <= checkpoint.feed_cursor
+                    company_key = ' '.join((card['company_name'] or '').split()).lower()
+                    if handled:
+                        processed.add(company_key)
+                        skipped += 1
+                    if card['seq'] >= checkpoint.feed_cursor or company_key == checkpoint.last_company:
+                        fast_forward = False
+                        print(f"Fast-forwarded past {skipped} companies handled before the restart")
+                    if handled:
+                        continue
+
+                # nothing is read or clicked while a CAPTCHA covers the page
+                if not await captcha_cleared():
+                    blocked = True
+                    break
                 
                 reason = "applied"
 
                 # scroll to company
                 await scroll_to(driver, company)
-                await driver.sleep(2)
+                await wait_for_dom_stable(driver, timeout=2, name="company_scroll")
 
                 # hide button for the company -> bottom right
-                try: 
-                    hide_button: WebElement = await company.find_element(By.XPATH, './/button[normalize-space(text())="Hide"]')
-                except (NoSuchElementException, DriverlessNoSuchElementException):
+                if not card['has_hide_button']:
                     print(f"Hide button not found, moving to next company") 
                     continue
                 
-                try: 
-                    company_name_dom: WebElement = await company.find_element(By.XPATH, './/h2[@class="inline text-md font-semibold"]')
-                    company_name: str = await company_name_dom.text
-
-                    await driver.sleep(0.5)
-                except NoSuchElementException as e:
+                company_name = card['company_name']
+                if not company_name:
                     print(f"Company name not found")
                     continue
 
+                # a card re-rendered by the feed is not processed twice
+                company_key = ' '.join(company_name.split()).lower()
+                if company_key in processed:
+                    continue
+                processed.add(company_key)
+
                 # get jobs listed by the company
-                try: job_listings: list[WebElement] = await company.find_elements(By.XPATH, ".//div[@class='styles_component__Ey28k']")   
-                except NoSuchElementException as e:
-                    print(f"Job listing element not found")
-                    raise e
-    
-                if (len(job_listings) == 0):
+                jobs: list[dict] = card['jobs']
+                if (len(jobs) == 0):
                     reason = f"Zero job listings found"
                     continue
 
-                count = await process_jobs(driver, job_listings, company_name, applied, rejected, count, limit)
+                # drop jobs processed in this or a previous run before touching them
+                if skip_seen_jobs:
+                    unseen = [job for job in jobs if not (job['position'] and is_seen(company_name, job['position']))]
+                    if len(unseen) < len(jobs):
+                        print(f"Skipping {len(jobs) - len(unseen)} already processed jobs at {company_name}")
+                    jobs = unseen
+                    if len(jobs) == 0:
+                        continue
+
+                # another worker owns this company
+                if leases and not await leases.claim(company_key):
+                    continue
+
+                count = await process_jobs(driver, company, jobs, company_name, results, count, limit)
+
+                if leases:
+                    await leases.complete(company_key)
+
+                if checkpoint:
+                    checkpoint = checkpoint._replace(feed_cursor=card['seq'], last_company=company_key,
+                                                     applied=results.applied, rejected=results.rejected,
+                                                     companies=checkpoint.companies + 1)
+                    await save_checkpoint(checkpoint)
 
                 # hide company
                 if (hide_companies):
+                    try: 
+                        hide_button: WebElement = await company.find_element(By.XPATH, './/button[normalize-space(text())="Hide"]')
+                    except (NoSuchElementException, DriverlessNoSuchElementException):
+                        print(f"Hide button not found")
+                        continue
                     await hide_company(driver, hide_button, company, reason)
 
-            try:
-                companies.clear()
-                await driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                await driver.sleep(3)
-                return await start_applying(driver, applied, rejected, count, limit)
-            except WebDriverException as e: 
-                print(f"Error during more load_companies")
-                raise e
+            if blocked:
+                break
+
+            companies.clear()
+            if limit == 0 or count < limit:
+                await load_more(driver)
             
+        # a run stopped by a CAPTCHA stays resumable
+        if checkpoint and not blocked:
+            await save_checkpoint(checkpoint._replace(status='finished', applied=results.applied, rejected=results.rejected))
+
         print("Finished applying")
         print("---------------------------------------")
-        print(f"Applied: {len(applied)}")
-        print(f"Rejected: {len(rejected)}")
+        print(f"Applied: {results.applied}")
+        print(f"Rejected: {results.rejected}")
+        if results.store_failures:
+            print(f"Not stored in the database: {results.store_failures}")
+        if results.recent:
+            print("Last processed:")
+            for job in results.recent:
+                print(f"  {job}")
+        filter_pipeline.report()
         print("---------------------------------------")
 
-        return count, applied, rejected
+        return count
         
     except WebDriverException as e:
         print(f"Error during start_applying")
         raise e
-
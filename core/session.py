@@ -0,0 +1,55 @@
+from selenium_driverless import webdriver
+from core.login import login, session_is_valid
+from core.navigation import set_filters
+from core.capture import job_capture
+from utils.captcha import detect_captcha, captcha_watch
+from utils.waits import wait_for_dom_stable, wait_for_network_idle
+from utils.pacer import pacer
+from config.settings import base_url, user_data_dir, capture_job_data
+
+async def open_jobs_feed(driver: webdriver.Chrome) -> bool:
+    """
+    Log in (unless the persisted session is still valid) and open the jobs feed with the filters applied.
+
+    Returns:
+        bool: False if a CAPTCHA blocked the session, True otherwise
+    """
+    # Listen before the feed loads so its first page is captured too
+    if capture_job_data:
+        await job_capture.install(driver)
+    await pacer.install(driver)
+    await captcha_watch.install(driver)
+
+    # Warm start: the profile kept the cookies of the previous run
+    if user_data_dir and await session_is_valid(driver):
+        print("Restored saved session, skipping login")
+        await set_filters(driver)
+        return True
+
+    # Navigate to login page
+    async with pacer.action("navigation"):
+        await driver.get(f'{base_url}/login', wait_load=True)
+    await wait_for_dom_stable(driver, timeout=2, name="login_page")
+
+    # Check for CAPTCHA
+    captcha = await detect_captcha(driver)
+    print(f"CAPTCHA detected in main: {captcha}")
+    if captcha:
+        print("CAPTCHA detected, waiting for next instance of the browser...")
+        return False
+
+    # Login
+    await login(driver)
+    await wait_for_network_idle(driver, timeout=2, name="after_login")
+    if captcha_watch.active:
+        return False
+
+    # Navigate to jobs page if not already there
+    if await driver.current_url != f'{base_url}/jobs':
+        async with pacer.action("navigation"):
+            await driver.get(f'{base_url}/jobs', wait_load=True)
+    await wait_for_dom_stable(driver, timeout=1, name="jobs_page")
+
+    # Set filters
+    await set_filters(driver)
+    return True
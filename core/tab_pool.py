@@ -0,0 +1,111 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+from selenium_driverless import webdriver
+from selenium_driverless.types.target import Target
+from core.blocking import install_blocking, remove_blocking
+from utils.pacer import pacer
+
+
+class TabUnavailable(Exception):
+    """No tab of the pool could be borrowed: every tab failed beyond replacement, or none became free in time."""
+
+
+class TabPool:
+    """
+    A fixed set of background tabs for loading job pages concurrently.
+    A tab whose job failed is closed and replaced, so one stuck page cannot affect the others.
+    If a replacement cannot be opened the pool shrinks; once it is empty every borrower gets TabUnavailable.
+    """
+
+    def __init__(self, driver: webdriver.Chrome, size: int):
+        self.driver = driver
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._tabs: list[Target] = []
+
+    async def _open_tab(self) -> Target:
+        tab = await self.driver.new_window('tab', activate=False)
+        await install_blocking(tab)
+        await pacer.install(tab)
+        self._tabs.append(tab)
+        return tab
+
+    async def _discard(self, tab: Target):
+        if tab in self._tabs:
+            self._tabs.remove(tab)
+        await remove_blocking(tab, closing=True)
+        pacer.forget(tab)
+        try:
+            await tab.close()
+        except Exception:
+            pass
+
+    async def start(self):
+        """Open all tabs of the pool."""
+        for _ in range(self.size):
+            self._idle.put_nowait(await self._open_tab())
+
+    @property
+    def live(self) -> int:
+        """Number of tabs still open, idle or borrowed."""
+        return len(self._tabs)
+
+    @asynccontextmanager
+    async def tab(self, timeout: float = None):
+        """
+        Borrow an idle tab. If the work inside raises, the tab is replaced with a fresh one.
+
+        Raises:
+            TabUnavailable: The pool has no tabs left, or none became free within timeout seconds
+        """
+        if not self._tabs:
+            raise TabUnavailable("no tabs left in the pool")
+        try:
+            tab: Optional[Target] = await asyncio.wait_for(self._idle.get(), timeout)
+        except asyncio.TimeoutError:
+            raise TabUnavailable(f"no tab became free within {timeout} seconds") from None
+        if tab is None:
+            # The last tab was lost while waiting; the marker stays queued for the other waiters
+            self._idle.put_nowait(None)
+            raise TabUnavailable("no tabs left in the pool")
+        try:
+            yield tab
+        except BaseException:
+            await self._discard(tab)
+            try:
+                tab = await self._open_tab()
+            except Exception as e:
+                print(f"Unable to replace failed tab: {e}")
+                tab = None
+                if not self._tabs:
+                    self._idle.put_nowait(None)
+            raise
+        finally:
+            if tab is not None:
+                self._idle.put_nowait(tab)
+
+    async def close(self):
+        """Close every tab of the pool."""
+        for tab in list(self._tabs):
+            await self._discard(tab)
+
+
+_pool: Optional[TabPool] = None
+
+
+async def get_tab_pool(driver: webdriver.Chrome, size: int) -> TabPool:
+    """Return the run's tab pool, opening it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = TabPool(driver, size)
+        await _pool.start()
+    return _pool
+
+
+async def close_tab_pool():
+    """Close the run's tab pool if one was opened."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -4,22 +4,35 @@ Wellfound Job Application Automation Script
 Note: For real-time log output, you can also run this script with:
     python -u main.py
 The -u flag forces unbuffered output.
+
+Run with --profile to write a pstats file and a flame-graph (collapsed stack) profile of the run.
+Run with --resume to continue the last run that was interrupted, from its checkpoint.
 """
+import argparse
 import asyncio
 import sys
 import io
 import os
+import uuid
+from functools import partial
 
 from selenium.common.exceptions import WebDriverException
 
-from core.browser import initialize_browser
-from core.login import login
-from core.navigation import set_filters
+from core.browser import initialize_browser, release_browser
+from core.session import open_jobs_feed
 from core.orchestrator import start_applying
-from utils.captcha import detect_captcha
-from services.db import initialize_database_connection, close_connection
+from core.tab_pool import close_tab_pool
+from core.blocking import block_stats
+from core.capture import job_capture
+from utils.pacer import pacer
+from utils.waits import wait_stats
+from utils.timing import timings, write_run_metrics
+from utils.profiling import run_profiled
+from services.db import initialize_database_connection, close_connection, load_seen_jobs
+from services.checkpoints import begin_run
+from services.results import ResultSink
 from services.email import send_email_report
-from config.settings import store_in_db, send_email, limit
+from config.settings import store_in_db, send_email, limit, skip_seen_jobs, metrics_dir, profile_dir, pacer_state_file
 
 # Configure stdout for real-time logging (unbuffered)
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', line_buffering=True)
@@ -28,51 +41,45 @@ sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', line_bufferin
 # Also set Python to run in unbuffered mode
 os.environ['PYTHONUNBUFFERED'] = '1'
 
-# Global variables for tracking
-count = 0
-applied = []
-rejected = []
-
-async def main():
+async def main(resume: str = None):
     # Initialize database connection if storing in DB
+    checkpoint = None
     if store_in_db:
-        await initialize_database_connection()
+        if await initialize_database_connection():
+            # progress is checkpointed with the job rows, so a crashed run can be resumed where it stopped
+            checkpoint = await begin_run(resume)
+        if skip_seen_jobs:
+            await load_seen_jobs()
+    elif resume:
+        print("--resume needs store_in_db, starting from the top of the feed")
+
+    # Processed jobs go straight to the database; only counters are kept for the run
+    if checkpoint:
+        results = ResultSink(checkpoint.run_id, checkpoint.applied, checkpoint.rejected)
+    else:
+        results = ResultSink(uuid.uuid4().hex)
+
+    # Start from the action rates the site tolerated in earlier runs
+    pacer.load(pacer_state_file)
 
     driver = None
     try:
         # Initialize browser
         driver = await initialize_browser()
         
-        # Navigate to login page
-        await driver.get('https://wellfound.com/login', wait_load=True)
-        await driver.sleep(2)
-
-        # Check for CAPTCHA
-        captcha = await detect_captcha(driver)
-        print(f"CAPTCHA detected in main: {captcha}")
-        if captcha:
-            print("CAPTCHA detected, waiting for next instance of the browser...")
+        # Login, open the jobs feed and set filters
+        if not await open_jobs_feed(driver):
             return
 
-        # Login
-        await login(driver)
-        await driver.sleep(2)
-
-        # Navigate to jobs page if not already there
-        if await driver.current_url != 'https://wellfound.com/jobs':
-            await driver.get('https://wellfound.com/jobs', wait_load=True)
-        await driver.sleep(1)
-
-        # Set filters
-        await set_filters(driver)
-
         # Start applying to jobs
-        global count, applied, rejected
-        count, applied, rejected = await start_applying(driver, applied, rejected, count, limit)
+        await start_applying(driver, results, results.applied, limit, checkpoint=checkpoint)
 
-        # Send email report if enabled
+        # Send email report if enabled (built from the run's rows in the database)
         if send_email:
-            await send_email_report(applied, rejected)
+            if store_in_db:
+                await send_email_report(results.run_id)
+            else:
+                print("Email report needs store_in_db, skipping")
             
     except (WebDriverException, FileNotFoundError) as e:
         print(f"Error during main: {e}")
@@ -81,9 +88,19 @@ async def main():
             print("1. Install Google Chrome or Chromium, OR")
             print("2. Specify the Chrome executable path in config/settings.py")
     finally:
+        wait_stats.report()
+        timings.report()
+        block_stats.report()
+        job_capture.report()
+        pacer.report()
+        pacer.save(pacer_state_file)
+        write_run_metrics(metrics_dir, {**results.summary(),
+                                        'blocked': block_stats.summary(), 'captured': job_capture.summary(),
+                                        'pacer': pacer.summary()})
         if driver is not None:
             try:
-                await driver.close()
+                await close_tab_pool()
+                await release_browser(driver)
             except (AttributeError, Exception) as e:
                 # Handle selenium_driverless library bug when closing
                 # The script has already completed successfully, so we can safely ignore this
@@ -93,4 +110,14 @@ async def main():
             await close_connection()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Wellfound job application automation")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Profile the run and write pstats and collapsed-stack files to {profile_dir}/")
+    parser.add_argument("--resume", nargs="?", const="latest", metavar="RUN_ID",
+                        help="Continue the last unfinished run (or the given one) from its checkpoint")
+    args = parser.parse_args()
+
+    if args.profile:
+        run_profiled(partial(main, args.resume), profile_dir)
+    else:
+        asyncio.run(main(args.resume))
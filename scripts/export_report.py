@@ -0,0 +1,37 @@
+"""
+Export stored jobs to a compressed CSV report, streamed from wellfound.db.
+
+Usage:
+    python -m scripts.export_report --run <run_id>
+    python -m scripts.export_report --since 2026-01-01 --until 2026-04-01 --compression zip
+    python -m scripts.export_report --compression none --output all_jobs.csv
+"""
+import argparse
+import asyncio
+
+from services.db import close_connection
+from services.report import export_report
+
+
+async def export(args):
+    try:
+        report = await export_report(run_id=args.run, since=args.since, until=args.until,
+                                     compression=None if args.compression == "none" else args.compression,
+                                     path=args.output)
+        print(f"{report.rows} jobs ({report.applied} applied, {report.rejected} rejected)")
+    finally:
+        await close_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--run", help="Only jobs of this run id")
+    parser.add_argument("--since", help="Only jobs processed at or after this date (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--until", help="Only jobs processed before this date (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--compression", choices=["gzip", "zip", "none"], default="gzip")
+    parser.add_argument("--output", help="File to write (default: job_report_<timestamp> in the current directory)")
+    asyncio.run(export(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Query the jobs stored in wellfound.db.
+
+Job lists are newest first and paginated by keyset: a page ends with the id to pass as --after
+to get the next one, so the thousandth page costs as little as the first.
+
+Run from the project root:
+    python -m scripts.query_db                                          # totals and the latest 50 jobs
+    python -m scripts.query_db --status rejected --reason "bad skill" --since 2026-01-01
+    python -m scripts.query_db --company "Acme Labs" --after 18342
+    python -m scripts.query_db --skill python --format csv > python_jobs.csv
+    python -m scripts.query_db --view per-reason                        # rejections per reason
+    python -m scripts.query_db --view per-day --since 2026-03-01 --format json
+"""
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import sys
+from typing import NamedTuple, Optional
+
+from services.db import DB_NAME, get_sqlite_connection, init_database, close_connection
+
+# Columns shown for each job (descriptions and skills are left out; filter on skills with --skill)
+LIST_COLUMNS = ['id', 'status', 'company_name', 'position', 'remote_policy', 'compensation', 'type', 'location',
+                'exp_required', 'application_date', 'time', 'notes']
+
+PAGE_SIZE = 50
+
+
+class Filters(NamedTuple):
+    status: Optional[str] = None
+    # Exact company name, any case (served by the company index)
+    company: Optional[str] = None
+    # Processed in [since, until), as YYYY-MM-DD[ HH:MM:SS]
+    since: Optional[str] = None
+    until: Optional[str] = None
+    # Substrings of the rejection reason and of the skills
+    reason: Optional[str] = None
+    skill: Optional[str] = None
+    run_id: Optional[str] = None
+
+
+def _where(filters: Filters, *extra: str) -> tuple[list[str], list]:
+    conditions, params = list(extra), []
+    if filters.status:
+        conditions.append("status = ?")
+        params.append(filters.status)
+    if filters.company:
+        conditions.append("company_name = ? COLLATE NOCASE")
+        params.append(filters.company)
+    if filters.since:
+        conditions.append("processed_at >= ?")
+        params.append(filters.since)
+    if filters.until:
+        conditions.append("processed_at < ?")
+        params.append(filters.until)
+    if filters.reason:
+        conditions.append("notes LIKE ?")
+        params.append(f"%{filters.reason}%")
+    if filters.skill:
+        conditions.append("skills LIKE ?")
+        params.append(f"%{filters.skill}%")
+    if filters.run_id:
+        conditions.append("run_id = ?")
+        params.append(filters.run_id)
+    return conditions, params
+
+
+def _sql(select: str, conditions: list[str], tail: str = "") -> str:
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT {select} FROM job_applications{where} {tail}"
+
+
+# Aggregate views: (select, extra conditions, GROUP BY / ORDER BY tail)
+VIEWS = {
+    'status': ("status, COUNT(*) AS jobs", [], "GROUP BY status ORDER BY status"),
+    'per-reason': ("notes AS reason, COUNT(*) AS jobs", ["status = 'rejected'"], "GROUP BY notes ORDER BY jobs DESC"),
+    'per-day': ("substr(processed_at, 1, 10) AS day, SUM(status = 'applied') AS applied, "
+                "SUM(status = 'rejected') AS rejected", ["processed_at IS NOT NULL"],
+                "GROUP BY day ORDER BY day"),
+    'per-company': ("company_name, SUM(status = 'applied') AS applied, SUM(status = 'rejected') AS rejected, "
+                    "COUNT(*) AS jobs", [], "GROUP BY company_name COLLATE NOCASE ORDER BY jobs DESC"),
+}
+
+
+async def _connection():
+    # The connection helpers report on stdout, which carries the JSON/CSV output here
+    with contextlib.redirect_stdout(sys.stderr):
+        conn = await get_sqlite_connection()
+        await init_database(conn)
+    return conn
+
+
+async def _fetch(query: str, params: list) -> tuple[list[str], list[tuple]]:
+    conn = await _connection()
+    async with conn.execute(query, params) as cursor:
+        columns = [description[0] for description in cursor.description]
+        return columns, await cursor.fetchall()
+
+
+async def list_jobs(filters: Filters, after: Optional[int] = None,
+                    limit: int = PAGE_SIZE) -> tuple[list[str], list[tuple], Optional[int]]:
+    """
+    One page of jobs, newest first.
+
+    Args:
+        after: Last id of the previous page (keyset pagination)
+
+    Returns:
+        (columns, rows, id to pass as after for the next page or None on the last page)
+    """
+    conditions, params = _where(filters)
+    if after is not None:
+        conditions.append("id < ?")
+        params.append(after)
+    columns, rows = await _fetch(_sql(", ".join(LIST_COLUMNS), conditions, "ORDER BY id DESC LIMIT ?"),
+                                 params + [limit])
+    return columns, rows, rows[-1][0] if len(rows) == limit else None
+
+
+async def aggregate(view: str, filters: Filters, limit: Optional[int] = None) -> tuple[list[str], list[tuple]]:
+    """Rows of a GROUP BY view (see VIEWS) over the filtered jobs."""
+    select, extra, tail = VIEWS[view]
+    conditions, params = _where(filters, *extra)
+    if limit:
+        tail += " LIMIT ?"
+        params.append(limit)
+    return await _fetch(_sql(select, conditions, tail), params)
+
+
+def _print_table(columns: list[str], rows: list[tuple]):
+    if not rows:
+        print("No jobs found.")
+        return
+    cells = [[("" if value is None else str(value)).replace("\n", " ") for value in row] for row in rows]
+    widths = [min(40, max(len(column), *(len(row[i]) for row in cells))) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in cells:
+        print("  ".join(value[:width].ljust(width) for value, width in zip(row, widths)))
+
+
+def _print_jobs(columns: list[str], rows: list[tuple]):
+    """The record layout of the original view_db, one block per job."""
+    if not rows:
+        print("No jobs found.")
+        return
+    for row in rows:
+        job = dict(zip(columns, row))
+        print(f"[{job['id']}] {job['status'].upper()}")
+        print(f"  Company: {job['company_name']}")
+        print(f"  Position: {job['position']}")
+        for label, key in (("Remote Policy", 'remote_policy'), ("Location", 'location'), ("Type", 'type'),
+                           ("Compensation", 'compensation'), ("Experience Required", 'exp_required'),
+                           ("Application Date", 'application_date'), ("Processed", 'time'), ("Notes", 'notes')):
+            if job[key]:
+                print(f"  {label}: {job[key]}")
+        print("-" * 80)
+
+
+def output(columns: list[str], rows: list[tuple], fmt: str, next_after: Optional[int] = None, jobs: bool = False):
+    if fmt == "json":
+        result = {'rows': [dict(zip(columns, row)) for row in rows]}
+        if jobs:
+            result['next_after'] = next_after
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=1)
+        print()
+    elif fmt == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(columns)
+        writer.writerows(rows)
+        if next_after is not None:
+            print(f"More rows: --after {next_after}", file=sys.stderr)
+    else:
+        (_print_jobs if jobs else _print_table)(columns, rows)
+        if next_after is not None:
+            print(f"More jobs: add --after {next_after}")
+
+
+async def view_database(filters: Filters = Filters(), after: Optional[int] = None, limit: int = PAGE_SIZE,
+                        fmt: str = "text"):
+    """Totals per status (text output only), then one page of jobs."""
+    if fmt == "text":
+        _, totals = await aggregate('status', filters)
+        counts = dict(totals)
+        print("=" * 80)
+        print(f"Database: {DB_NAME}")
+        print(f"Total Applied: {counts.get('applied', 0)}")
+        print(f"Total Rejected: {counts.get('rejected', 0)}")
+        print("=" * 80)
+        print()
+    columns, rows, next_after = await list_jobs(filters, after, limit)
+    output(columns, rows, fmt, next_after, jobs=True)
+
+
+async def query(args):
+    filters = Filters(args.status, args.company, args.since, args.until, args.reason, args.skill, args.run)
+    try:
+        if args.view:
+            columns, rows = await aggregate(args.view, filters, args.limit)
+            output(columns, rows, args.format)
+        else:
+            await view_database(filters, args.after, args.limit or PAGE_SIZE, args.format)
+    finally:
+        with contextlib.redirect_stdout(sys.stderr):
+            await close_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", choices=["applied", "rejected"])
+    parser.add_argument("--company", help="Exact company name (any case)")
+    parser.add_argument("--since", help="Processed at or after this date (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--until", help="Processed before this date (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--reason", help="Rejection reason contains this text")
+    parser.add_argument("--skill", help="Skills contain this text")
+    parser.add_argument("--run", help="Only jobs of this run id")
+    parser.add_argument("--view", choices=sorted(VIEWS), help="Show an aggregate instead of jobs")
+    parser.add_argument("--after", type=int, help="Continue a job list after this id (printed at the end of a page)")
+    parser.add_argument("--limit", type=int, help=f"Rows per page (default {PAGE_SIZE}) or aggregate rows to show")
+    parser.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    args = parser.parse_args()
+
+    if not os.path.exists(DB_NAME):
+        print(f"Database file '{DB_NAME}' not found. Run the main script first to create it.")
+        return
+    asyncio.run(query(args))
+
+
+if __name__ == "__main__":
+    main()
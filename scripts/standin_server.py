@@ -0,0 +1,575 @@
+"""
+Offline stand-in for the Wellfound login page and jobs feed, for timing end-to-end runs locally.
+
+Serves /login, /jobs (with the sort menu, infinite scroll, job modals and hide form) and /jobs/<id>
+using the same markup and selectors the automation relies on. The feed is generated from a seed
+or loaded from a recorded JSON file. Like the real feed, /jobs pulls in company logos, a web font,
+a video and an analytics script; /api/stats counts how many of them were actually downloaded.
+POST /emails stands in for the Resend API (RESEND_API_URL=http://127.0.0.1:8765/emails), so report
+delivery and its retries can be tried without sending mail.
+
+Run from the project root:
+    python -m scripts.standin_server --port 8765 --companies 200 --latency 0.05
+    python -m scripts.standin_server --captcha login          # CAPTCHA iframe on the login page
+    python -m scripts.standin_server --dump feed.json         # write the generated feed and exit
+    python -m scripts.standin_server --feed feed.json         # serve a recorded feed
+    python -m scripts.standin_server --time-main              # serve and time one full main.py run
+    python -m scripts.standin_server --time-main --profile    # ... under the profiler (see main.py --profile)
+    python -m scripts.standin_server --email-failures 2       # first two /emails requests answer 503
+"""
+import argparse
+import base64
+import html
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+CAPTCHA_IFRAME = '<iframe src="https://geo.captcha-delivery.com/captcha/?initialCid=standin" width="1" height="1"></iframe>'
+
+COMPANY_WORDS = [
+    "Acme", "Blue", "Fin", "Nimbus", "Quartz", "Orbit", "Lumen", "Pixel", "Cedar", "Harbor", "Vector", "Atlas",
+    "Kite", "Ember", "Nova", "Sparrow", "Delta", "Maple", "Onyx", "Tidal",
+]
+COMPANY_SUFFIXES = ["Robotics", "Analytics", "Labs", "Health", "Pay", "AI", "Systems", "Cloud", "Studio", "Works"]
+POSITIONS = [
+    "Frontend Engineer", "Full Stack Developer", "Senior Backend Engineer (5+ years)", "React Developer",
+    "Software Engineer Intern", "Junior Python Developer", "Android Developer", "Data Intern",
+    "Node.js Engineer", "Founding Engineer", "WordPress Developer", "Product Engineer (2-4 yrs)",
+]
+LOCATIONS = ["Remote • India", "Remote • Worldwide", "Remote • Europe", "In office • Bengaluru", "Hybrid • Berlin"]
+COMPENSATIONS = ["₹8L – ₹14L • 0.05% – 0.1%", "₹30L – ₹45L", "$60k – $90k • 0.1% – 0.25%", "€45k – €60k", None]
+SKILLS = [
+    "JavaScript", "TypeScript", "React", "Node.js", "Python", "HTML", "Java", "PHP", "Flutter", "Django",
+    "AWS", "Docker", "PostgreSQL", "GraphQL", "Kubernetes", "React Native", "Go", "Figma",
+]
+DESCRIPTION_LINES = [
+    "We are building the future of our industry and want curious engineers.",
+    "You will own features end to end, from design to deployment.",
+    "Requires {years} years of experience with modern web frameworks.",
+    "Entry level candidates and fresh graduates are welcome.",
+    "This is an unpaid internship with a certificate on completion.",
+    "Engagement is as a contractor for the first six months.",
+    "Nice to have: open source contributions and a portfolio.",
+    "We offer flexible hours, learning budget and team offsites.",
+]
+JOB_TYPES = ["Full-time", "Part-time", "Contract", "Internship"]
+
+# Assets the real feed pulls in and the automation never needs: (content type, size in bytes, first bytes)
+ASSETS = {
+    'logo': ("image/png", 24 * 1024, b"\x89PNG\r\n\x1a\n"),
+    'font': ("font/woff2", 48 * 1024, b"wOF2"),
+    'media': ("video/mp4", 256 * 1024, b"\x00\x00\x00\x18ftypmp42"),
+    'analytics': ("application/javascript", 8 * 1024, b"/* analytics */ navigator.sendBeacon('/api/beacon');\n"),
+}
+
+
+# Job fields kept in feed pages with --lean-feed; the rest only comes with the job detail request
+LEAN_JOB_FIELDS = ('id', 'position', 'location', 'compensation')
+
+
+def generate_feed(companies: int, seed: int = 42) -> list[dict]:
+    """Build a reproducible feed of companies, each with 1-4 job listings."""
+    rng = random.Random(seed)
+    feed = []
+    job_id = 1000
+    for index in range(companies):
+        jobs = []
+        for _ in range(rng.randint(1, 4)):
+            job_id += 1
+            lines = rng.sample(DESCRIPTION_LINES, rng.randint(2, 5))
+            jobs.append({
+                'id': job_id,
+                'position': rng.choice(POSITIONS),
+                'location': rng.choice(LOCATIONS),
+                'compensation': rng.choice(COMPENSATIONS),
+                'type': rng.choice(JOB_TYPES),
+                'skills': rng.sample(SKILLS, rng.randint(2, 6)),
+                'details': [rng.choice(["Remote", "On-site"]), f"{rng.randint(0, 6)}+ years exp"],
+                'description': "\n".join(line.format(years=rng.randint(0, 7)) for line in lines),
+            })
+        feed.append({
+            'id': index,
+            'name': f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {index}",
+            'pitch': "Building useful things",
+            'jobs': jobs,
+        })
+    return feed
+
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Log in</title></head>
+<body>
+  {captcha}
+  <form method="post" action="/login">
+    <input type="email" name="email" placeholder="Email">
+    <input type="password" name="password" placeholder="Password">
+    <input type="submit" value="Log in">
+  </form>
+</body></html>
+"""
+
+CAPTCHA_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Verification</title></head>
+<body>{captcha}</body></html>
+"""
+
+# Markup of one job's details, shared by the modal and the /jobs/<id> page
+DETAILS_TEMPLATE = """
+<h1>{position}</h1>
+<span>{job_type}</span>
+<ul class="flex flex-wrap gap-2">{details}</ul>
+<div><span>Skills</span><div class="flex flex-wrap">{skills}</div></div>
+<div id="job-description">{description}</div>
+<textarea id="form-input--userNote"></textarea>
+<button data-test="JobDescriptionSlideIn--SubmitButton" type="button" data-job="{id}">Apply</button>
+"""
+
+JOB_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{position}</title></head>
+<body>{details}
+<script>
+document.querySelector('[data-test="JobDescriptionSlideIn--SubmitButton"]').addEventListener('click', event => {{
+    fetch('/api/apply/' + event.target.dataset.job, {{method: 'POST'}});
+    event.target.textContent = 'Applied';
+}});
+</script>
+</body></html>
+"""
+
+JOBS_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Jobs</title>
+<style>
+  .ReactModal__Overlay { position: fixed; inset: 0; background: rgba(0,0,0,.3); }
+  .ReactModal__Content { position: fixed; top: 5%; left: 20%; right: 20%; bottom: 5%; background: #fff; overflow: auto; padding: 1em; }
+  [data-test="StartupResult"] { border: 1px solid #ddd; margin: 1em; padding: 1em; min-height: 120px; }
+  .styles_component__Ey28k { cursor: pointer; padding: .5em; }
+  @font-face { font-family: Standin; src: url(/assets/font.woff2) format('woff2'); }
+  body { font-family: Standin, sans-serif; }
+</style>
+<script async src="/assets/analytics.js"></script>
+</head>
+<body>
+  <video src="/assets/promo.mp4" preload="auto" muted width="1" height="1"></video>
+  <button type="button" id="sort"><span>Recommended</span></button>
+  <div id="sort-menu" hidden><span id="most-recent">See most recent jobs first</span></div>
+  <div id="feed"></div>
+  <div id="modal-root"></div>
+<script>
+const PAGE_SIZE = __PAGE_SIZE__;
+let nextPage = 0, loading = false, exhausted = false;
+const feed = document.getElementById('feed');
+
+function showLoader() {
+    const loader = document.createElement('div');
+    loader.className = 'styles_component__YafBz';
+    loader.textContent = 'Loading...';
+    document.body.appendChild(loader);
+    return loader;
+}
+
+const esc = value => String(value).replace(/[&<>"]/g, ch => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})[ch]);
+
+function jobMarkup(job) {
+    return `<div class="styles_component__Ey28k" data-job="${job.id}">
+        <a href="/jobs/${job.id}"><span class="styles_title__xpQDw">${esc(job.position)}</span></a>
+        <span class="styles_locations__HHbZs">${esc(job.location)}</span>
+        ${job.compensation ? `<span class="styles_compensation__3JnvU">${esc(job.compensation)}</span>` : ''}
+    </div>`;
+}
+
+function cardMarkup(company) {
+    return `<div class="flex">
+        <img src="/assets/logo/${company.id}.png" width="48" height="48" alt="">
+        <h2 class="inline text-md font-semibold">${esc(company.name)}</h2>
+        <span class="text-xs">${esc(company.pitch)}</span>
+    </div>
+    ${company.jobs.map(jobMarkup).join('')}
+    <button type="button" class="hide">Hide</button>`;
+}
+
+async function loadPage() {
+    if (loading || exhausted) return;
+    loading = true;
+    const loader = showLoader();
+    try {
+        const response = await fetch(`/api/feed?page=${nextPage}&size=${PAGE_SIZE}`);
+        const companies = await response.json();
+        if (companies.length === 0) exhausted = true;
+        for (const company of companies) {
+            const card = document.createElement('div');
+            card.setAttribute('data-test', 'StartupResult');
+            card.dataset.company = company.id;
+            card.innerHTML = cardMarkup(company);
+            feed.appendChild(card);
+        }
+        nextPage++;
+    } finally {
+        loader.remove();
+        loading = false;
+    }
+}
+
+async function openModal(jobId) {
+    const response = await fetch(`/api/job/${jobId}`);
+    const job = await response.json();
+    const root = document.getElementById('modal-root');
+    root.innerHTML = `<div class="ReactModal__Overlay"><div class="ReactModal__Content">
+        <button data-test="closeButton" type="button"><span>×</span></button>
+        ${job.html}
+    </div></div>`;
+}
+
+document.getElementById('sort').addEventListener('click', () => {
+    document.getElementById('sort-menu').hidden = false;
+});
+
+document.getElementById('most-recent').addEventListener('click', () => {
+    document.getElementById('sort-menu').hidden = true;
+    feed.innerHTML = '';
+    nextPage = 0;
+    exhausted = false;
+    loadPage();
+});
+
+document.addEventListener('click', event => {
+    const close = event.target.closest('[data-test="closeButton"]');
+    if (close) {
+        document.getElementById('modal-root').innerHTML = '';
+        return;
+    }
+    const apply = event.target.closest('[data-test="JobDescriptionSlideIn--SubmitButton"]');
+    if (apply) {
+        fetch('/api/apply/' + apply.dataset.job, {method: 'POST'});
+        apply.textContent = 'Applied';
+        return;
+    }
+    const listing = event.target.closest('.styles_component__Ey28k');
+    if (listing) {
+        event.preventDefault();
+        openModal(listing.dataset.job);
+        return;
+    }
+    const hide = event.target.closest('button.hide');
+    if (hide) {
+        const card = hide.closest('[data-test="StartupResult"]');
+        const form = document.createElement('div');
+        form.innerHTML = `<input name="hideReason" type="text">
+            <button type="button" class="confirm-hide"><span class="fill-current stroke-current w-3 leading-none">✓</span></button>`;
+        card.appendChild(form);
+        return;
+    }
+    const confirm = event.target.closest('.confirm-hide');
+    if (confirm) {
+        const card = confirm.closest('[data-test="StartupResult"]');
+        fetch('/api/hide/' + card.dataset.company, {method: 'POST'});
+        card.remove();
+    }
+});
+
+window.addEventListener('scroll', () => {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) loadPage();
+});
+
+loadPage();
+</script>
+</body></html>
+"""
+
+
+class StandinState:
+    """Feed, options and counters shared by all request handlers."""
+
+    def __init__(self, feed: list[dict], page_size: int = 10, latency: float = 0.0, jitter: float = 0.0,
+                 captcha: str = "none", seed: int = 42, session_ttl: int = 86400, lean_feed: bool = False,
+                 email_failures: int = 0):
+        self.feed = feed
+        self.jobs = {job['id']: job for company in feed for job in company['jobs']}
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.captcha = captcha
+        self.session_ttl = session_ttl
+        self.lean_feed = lean_feed
+        self.email_failures = email_failures
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'logins': 0, 'feed_pages': 0, 'job_views': 0, 'applied': [], 'hidden': [],
+                      'assets': {}, 'asset_bytes': 0, 'emails': []}
+
+    def delay(self):
+        with self.lock:
+            self.stats['requests'] += 1
+            extra = self.rng.uniform(0, self.jitter) if self.jitter else 0.0
+        if self.latency or extra:
+            time.sleep(self.latency + extra)
+
+
+def _details(job: dict) -> str:
+    return DETAILS_TEMPLATE.format(
+        id=job['id'],
+        position=html.escape(job['position']),
+        job_type=job['type'],
+        details="".join(f"<li>{html.escape(item)}</li>" for item in job['details']),
+        skills="".join(f"<div>{html.escape(skill)}</div>" for skill in job['skills']),
+        description="".join(f"<p>{html.escape(line)}</p>" for line in job['description'].splitlines()),
+    )
+
+
+def make_handler(state: StandinState):
+    class Handler(BaseHTTPRequestHandler):
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: str | bytes = "", content_type: str = "text/html; charset=utf-8",
+                  headers: dict = None):
+            data = body if isinstance(body, bytes) else body.encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _redirect(self, location: str, headers: dict = None):
+            self._send(303, headers={"Location": location, **(headers or {})})
+
+        def _logged_in(self) -> bool:
+            return "standin_session=1" in (self.headers.get("Cookie") or "")
+
+        def do_GET(self):
+            state.delay()
+            url = urlparse(self.path)
+            path = url.path.rstrip("/") or "/"
+
+            if path == "/login":
+                captcha = CAPTCHA_IFRAME if state.captcha == "login" else ""
+                return self._send(200, LOGIN_PAGE.format(captcha=captcha))
+
+            if path == "/jobs":
+                if not self._logged_in():
+                    return self._redirect("/login")
+                return self._send(200, JOBS_PAGE.replace("__PAGE_SIZE__", str(state.page_size)))
+
+            if path.startswith("/jobs/"):
+                job = state.jobs.get(_job_id(path))
+                if job is None:
+                    return self._send(404, "Not found")
+                with state.lock:
+                    state.stats['job_views'] += 1
+                return self._send(200, JOB_PAGE.format(position=html.escape(job['position']), details=_details(job)))
+
+            if path == "/api/feed":
+                query = parse_qs(url.query)
+                page = int(query.get("page", ["0"])[0])
+                size = int(query.get("size", [str(state.page_size)])[0])
+                with state.lock:
+                    state.stats['feed_pages'] += 1
+                # Hidden companies stay in the feed so page offsets do not shift mid-scroll
+                companies = state.feed[page * size:(page + 1) * size]
+                if state.lean_feed:
+                    companies = [{**company, 'jobs': [{key: job[key] for key in LEAN_JOB_FIELDS} for job in company['jobs']]}
+                                 for company in companies]
+                return self._send(200, json.dumps(companies), "application/json")
+
+            if path.startswith("/api/job/"):
+                job = state.jobs.get(_job_id(path))
+                if job is None:
+                    return self._send(404, "Not found")
+                with state.lock:
+                    state.stats['job_views'] += 1
+                return self._send(200, json.dumps({**job, 'html': _details(job)}), "application/json")
+
+            if path.startswith("/assets/"):
+                kind = _asset_kind(path)
+                if kind is None:
+                    return self._send(404, "Not found")
+                content_type, size, head = ASSETS[kind]
+                with state.lock:
+                    state.stats['assets'][kind] = state.stats['assets'].get(kind, 0) + 1
+                    state.stats['asset_bytes'] += size
+                return self._send(200, head.ljust(size, b"\0"), content_type, {"Cache-Control": "no-store"})
+
+            if path == "/api/stats":
+                with state.lock:
+                    return self._send(200, json.dumps(state.stats), "application/json")
+
+            return self._redirect("/jobs")
+
+        def _read_body(self) -> bytes:
+            if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            # Streamed uploads (like the report attachment) come chunked, without a length
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(body)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+
+        def do_POST(self):
+            state.delay()
+            body = self._read_body()
+            path = urlparse(self.path).path.rstrip("/")
+
+            if path == "/emails":
+                with state.lock:
+                    failing = state.email_failures > 0
+                    state.email_failures -= failing
+                if failing:
+                    return self._send(503, '{"message": "stand-in failure"}', "application/json")
+                message = json.loads(body)
+                attachments = [{'filename': item['filename'], 'bytes': len(base64.b64decode(item['content']))}
+                               for item in message.get('attachments', [])]
+                with state.lock:
+                    state.stats['emails'].append({'to': message.get('to'), 'subject': message.get('subject'),
+                                                  'attachments': attachments})
+                return self._send(200, json.dumps({'id': f"standin-{len(state.stats['emails'])}"}), "application/json")
+
+            if path == "/login":
+                with state.lock:
+                    state.stats['logins'] += 1
+                if state.captcha == "submit":
+                    return self._send(200, CAPTCHA_PAGE.format(captcha=CAPTCHA_IFRAME))
+                cookie = f"standin_session=1; Path=/; Max-Age={state.session_ttl}"
+                return self._redirect("/jobs", {"Set-Cookie": cookie})
+
+            if path.startswith("/api/apply/"):
+                with state.lock:
+                    state.stats['applied'].append(_job_id(path))
+                return self._send(200, "{}", "application/json")
+
+            if path == "/api/beacon":
+                return self._send(204)
+
+            if path.startswith("/api/hide/"):
+                with state.lock:
+                    state.stats['hidden'].append(_job_id(path))
+                return self._send(200, "{}", "application/json")
+
+            return self._send(404, "Not found")
+
+    return Handler
+
+
+def _job_id(path: str) -> Optional[int]:
+    try:
+        return int(path.rsplit("/", 1)[1].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def _asset_kind(path: str) -> Optional[str]:
+    if path.startswith("/assets/logo/"):
+        return 'logo'
+    return {"/assets/font.woff2": 'font', "/assets/promo.mp4": 'media', "/assets/analytics.js": 'analytics'}.get(path)
+
+
+def start_server(state: StandinState, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Start the stand-in in a daemon thread and return the server (call shutdown() to stop it)."""
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_main(base_url: str, profile: bool = False, state_dir: Optional[str] = None) -> float:
+    """
+    Run main.py once against base_url and return the wall time in seconds.
+    The database (and the seen jobs loaded from it), pacer state and browser profile are kept in state_dir,
+    a new temporary directory by default, so the stand-in never reads or changes those of real runs.
+    """
+    # Settings are read at import time, so the URL and paths have to be set before main is imported
+    os.environ["WELLFOUND_BASE_URL"] = base_url
+    state_dir = state_dir or tempfile.mkdtemp(prefix="standin-run-")
+    os.makedirs(state_dir, exist_ok=True)
+    from config import settings
+    from services import db
+    settings.pacer_state_file = os.path.join(state_dir, os.path.basename(settings.pacer_state_file))
+    settings.user_data_dir = os.path.join(state_dir, "browser-profile")
+    db.DB_NAME = os.path.join(state_dir, db.DB_NAME)
+    print(f"Run state kept in {state_dir}")
+    import asyncio
+    import main
+
+    start = time.perf_counter()
+    if profile:
+        main.run_profiled(main.main, main.profile_dir)
+    else:
+        asyncio.run(main.main())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--companies", type=int, default=100, help="Number of companies in a generated feed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--feed", help="Serve a recorded feed (JSON written by --dump) instead of generating one")
+    parser.add_argument("--dump", help="Write the generated feed to this JSON file and exit")
+    parser.add_argument("--page-size", type=int, default=10, help="Companies loaded per infinite-scroll page")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency, up to this many seconds")
+    parser.add_argument("--captcha", choices=["none", "login", "submit"], default="none",
+                        help="Show a CAPTCHA iframe on the login page or after submitting it")
+    parser.add_argument("--session-ttl", type=int, default=86400,
+                        help="Seconds the login cookie stays valid (0 = expire immediately, forcing a fresh login)")
+    parser.add_argument("--lean-feed", action="store_true",
+                        help="Leave descriptions and skills out of feed pages, so they only arrive when a job is opened")
+    parser.add_argument("--email-failures", type=int, default=0,
+                        help="Answer this many /emails requests with 503 before accepting them")
+    parser.add_argument("--time-main", action="store_true", help="Run main.py once against the stand-in and print timings")
+    parser.add_argument("--profile", action="store_true", help="With --time-main, profile the run like main.py --profile")
+    parser.add_argument("--state-dir", help="With --time-main, keep the run's database, pacer state and browser profile "
+                                            "here (default: a new temporary directory), e.g. to time a second run warm")
+    args = parser.parse_args()
+
+    if args.feed:
+        with open(args.feed, encoding="utf-8") as f:
+            feed = json.load(f)
+    else:
+        feed = generate_feed(args.companies, args.seed)
+
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as f:
+            json.dump(feed, f, ensure_ascii=False, indent=1)
+        print(f"Wrote {len(feed)} companies to {args.dump}")
+        return
+
+    state = StandinState(feed, args.page_size, args.latency, args.jitter, args.captcha, args.seed, args.session_ttl,
+                         args.lean_feed, args.email_failures)
+    server = start_server(state, args.host, args.port)
+    base_url = f"http://{args.host}:{args.port}"
+    print(f"Stand-in serving {len(feed)} companies at {base_url}")
+
+    try:
+        if args.time_main:
+            seconds = time_main(base_url, args.profile, args.state_dir)
+            print("=" * 60)
+            print(f"main.py finished in {seconds:.2f}s")
+            print(f"Requests: {state.stats['requests']}, feed pages: {state.stats['feed_pages']}, "
+                  f"job views: {state.stats['job_views']}, applied: {len(state.stats['applied'])}")
+            assets = ", ".join(f"{kind} {count}" for kind, count in sorted(state.stats['assets'].items())) or "none"
+            print(f"Assets served: {assets} ({state.stats['asset_bytes'] / 1024:.0f} KB)")
+            print("=" * 60)
+        else:
+            print(f"Run main.py with WELLFOUND_BASE_URL={base_url}. Press Ctrl+C to stop.")
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
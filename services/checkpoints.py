@@ -0,0 +1,100 @@
+import time
+import uuid
+from typing import NamedTuple, Optional
+from services.db import get_sqlite_connection, store_statement
+
+_SAVE_QUERY = """
+    INSERT INTO run_checkpoints (run_id, status, feed_cursor, last_company, applied, rejected, companies, started_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(run_id) DO UPDATE SET
+        status = excluded.status,
+        feed_cursor = excluded.feed_cursor,
+        last_company = excluded.last_company,
+        applied = excluded.applied,
+        rejected = excluded.rejected,
+        companies = excluded.companies,
+        updated_at = excluded.updated_at
+"""
+
+_SELECT_COLUMNS = "run_id, status, feed_cursor, last_company, applied, rejected, companies, started_at"
+
+
+class Checkpoint(NamedTuple):
+    """Progress of a run through the jobs feed, as of the last company it handled."""
+    run_id: str
+    status: str = 'running'
+    # Sequence number (feed position) of the last card handled
+    feed_cursor: int = 0
+    # Normalized name of the last company handled
+    last_company: Optional[str] = None
+    applied: int = 0
+    rejected: int = 0
+    companies: int = 0
+    started_at: float = 0.0
+
+    def _params(self) -> tuple:
+        return (self.run_id, self.status, self.feed_cursor, self.last_company, self.applied, self.rejected,
+                self.companies, self.started_at, time.time())
+
+
+async def init_checkpoints():
+    """Create the run_checkpoints table if it doesn't exist."""
+    conn = await get_sqlite_connection()
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS run_checkpoints (
+            run_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL CHECK(status IN ('running', 'finished')),
+            feed_cursor INTEGER NOT NULL DEFAULT 0,
+            last_company TEXT,
+            applied INTEGER NOT NULL DEFAULT 0,
+            rejected INTEGER NOT NULL DEFAULT 0,
+            companies INTEGER NOT NULL DEFAULT 0,
+            started_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    await conn.commit()
+
+async def load_checkpoint(run_id: Optional[str] = None) -> Optional[Checkpoint]:
+    """The checkpoint of a run, or without run_id the most recent run that did not finish."""
+    conn = await get_sqlite_connection()
+    if run_id:
+        query, params = f"SELECT {_SELECT_COLUMNS} FROM run_checkpoints WHERE run_id = ?", (run_id,)
+    else:
+        query, params = (f"SELECT {_SELECT_COLUMNS} FROM run_checkpoints WHERE status = 'running' "
+                         "ORDER BY updated_at DESC LIMIT 1"), ()
+    async with conn.execute(query, params) as cursor:
+        row = await cursor.fetchone()
+    return Checkpoint(*row) if row else None
+
+async def begin_run(resume: Optional[str] = None) -> Checkpoint:
+    """
+    Start a new run, or continue an unfinished one.
+
+    Args:
+        resume: Run id to continue, or "latest" for the most recent unfinished run
+
+    Returns:
+        The checkpoint to continue from (empty for a new run)
+    """
+    await init_checkpoints()
+    if resume:
+        checkpoint = await load_checkpoint(None if resume == "latest" else resume)
+        if checkpoint is None:
+            print("No unfinished run to resume, starting a new one")
+        elif checkpoint.status == 'finished':
+            print(f"Run {checkpoint.run_id} already finished, starting a new one")
+        else:
+            print(f"Resuming run {checkpoint.run_id} after {checkpoint.companies} companies "
+                  f"(feed position {checkpoint.feed_cursor}, applied {checkpoint.applied}, rejected {checkpoint.rejected})")
+            return checkpoint
+
+    checkpoint = Checkpoint(uuid.uuid4().hex, started_at=time.time())
+    conn = await get_sqlite_connection()
+    await conn.execute(_SAVE_QUERY, checkpoint._params())
+    await conn.commit()
+    return checkpoint
+
+async def save_checkpoint(checkpoint: Checkpoint) -> bool:
+    """Queue the checkpoint behind the run's job rows, so both are committed in the same transaction."""
+    return await store_statement(_SAVE_QUERY, checkpoint._params())
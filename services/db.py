@@ -1,21 +1,91 @@
+import asyncio
 import aiosqlite
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, NamedTuple, AsyncIterator
+from services import seen_jobs
+from utils.timing import timed
 
 DB_NAME = "wellfound.db"
 
+# Write-behind settings: rows are flushed when a batch fills up or the oldest row waited this long
+WRITE_QUEUE_SIZE = 1000
+WRITE_BATCH_SIZE = 50
+WRITE_FLUSH_INTERVAL = 2.0
+
+# A batch that fails to commit is tried again after this pause, then written one row at a time
+WRITE_RETRY_DELAY = 0.5
+
+# Rows fetched per cursor round trip when streaming jobs out of the table
+READ_BATCH_SIZE = 500
+
+INSERT_JOB_QUERY = """
+    INSERT INTO job_applications 
+    (company_name, position, remote_policy, compensation, skills, description, status, notes, url, type, location, exp_required, application_date, time, run_id, processed_at) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Schema changes for databases created by earlier versions, applied in order.
+# PRAGMA user_version holds how many of them a database has already received.
+MIGRATIONS = [
+    # 1: jobs remember the run that processed them, so reports can be built per run
+    (
+        "ALTER TABLE job_applications ADD COLUMN run_id TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_job_applications_run_id ON job_applications(run_id)",
+    ),
+    # 2: a sortable copy of time (dd-mm-yy:hh:mm:ss) as YYYY-MM-DD HH:MM:SS, for time-window queries
+    (
+        "ALTER TABLE job_applications ADD COLUMN processed_at TEXT",
+        """UPDATE job_applications
+           SET processed_at = '20' || substr(time, 7, 2) || '-' || substr(time, 4, 2) || '-' || substr(time, 1, 2)
+                              || ' ' || substr(time, 10, 8)
+           WHERE time GLOB '[0-9][0-9]-[0-9][0-9]-[0-9][0-9]:[0-9][0-9]:[0-9][0-9]:[0-9][0-9]'""",
+        "CREATE INDEX IF NOT EXISTS idx_job_applications_processed_at ON job_applications(processed_at)",
+    ),
+    # 3: filters of scripts/query_db.py. Keyset pages by status walk the status index in rowid order;
+    # the company index also holds the status, so per-company counts never read the table
+    (
+        "CREATE INDEX IF NOT EXISTS idx_job_applications_status ON job_applications(status)",
+        "CREATE INDEX IF NOT EXISTS idx_job_applications_company ON job_applications(company_name COLLATE NOCASE, status)",
+    ),
+]
+
+
+class Statement(NamedTuple):
+    """A write queued behind the job rows and committed in the same transaction as the rows before it."""
+    query: str
+    params: Tuple
+
+
 # Global connection variable
 _db_conn: Optional[aiosqlite.Connection] = None
 # Track if database has been initialized
 _db_initialized: bool = False
 
-async def get_sqlite_connection(db_path: str = DB_NAME) -> Optional[aiosqlite.Connection]:
-    """Create and return a SQLite database connection. Reuses existing connection if available."""
+# Write-behind queue, its flush task, and rows taken off the queue but not yet committed (left for flush_writes)
+_write_queue: Optional[asyncio.Queue] = None
+_writer_task: Optional[asyncio.Task] = None
+_pending_rows: List[Tuple] = []
+_STOP = object()
+
+# Job rows that were queued (so store_single_job returned True) but could not be committed
+_dropped_jobs: int = 0
+
+# When set (worker processes), rows are sent to the supervisor's single writer instead of SQLite
+_result_queue = None
+
+async def get_sqlite_connection(db_path: Optional[str] = None) -> Optional[aiosqlite.Connection]:
+    """Create and return a SQLite database connection (to DB_NAME by default). Reuses existing connection if available."""
     global _db_conn
     if _db_conn is not None:
         return _db_conn
     
+    db_path = db_path or DB_NAME
     try:
         conn = await aiosqlite.connect(db_path)
+        # WAL lets commits append to the log instead of rewriting pages; NORMAL skips the fsync per commit
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute("PRAGMA busy_timeout=5000")
         print(f"Connected to SQLite database: {db_path}")
         _db_conn = conn
         return conn
@@ -25,8 +95,9 @@ async def get_sqlite_connection(db_path: str = DB_NAME) -> Optional[aiosqlite.Co
         return None
 
 async def close_connection():
-    """Close the database connection."""
+    """Flush queued writes and close the database connection."""
     global _db_conn, _db_initialized
+    await flush_writes()
     if _db_conn is not None:
         await _db_conn.close()
         _db_conn = None
@@ -62,63 +133,244 @@ async def init_database(conn: aiosqlite.Connection):
             )
         """)
         await conn.commit()
+        await _migrate(conn)
         _db_initialized = True
         print("Database table initialized successfully")
     except Exception as e:
         print(f"Error initializing database: {e}")
         raise e
 
-async def store_single_job(job_obj: Dict[str, Any], status: str) -> bool:
-    """Store a single job immediately in the database.
-    
-    Args:
-        job_obj: Dictionary containing job data
-        status: Either 'applied' or 'rejected'
-    
-    Returns:
-        True if successful, False otherwise
+async def _migrate(conn: aiosqlite.Connection):
+    """Apply the migrations a database has not received yet, each in its own transaction."""
+    async with conn.execute("PRAGMA user_version") as cursor:
+        (version,) = await cursor.fetchone()
+    for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+        try:
+            # explicit, since sqlite3 would otherwise run schema statements outside a transaction
+            await conn.execute("BEGIN")
+            for statement in statements:
+                await conn.execute(statement)
+            # PRAGMA does not take parameters; number is an int from enumerate
+            await conn.execute(f"PRAGMA user_version = {number}")
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        print(f"Applied database migration {number}")
+
+def iso_time(value: Optional[str]) -> Optional[str]:
+    """The time column's dd-mm-yy:hh:mm:ss as YYYY-MM-DD HH:MM:SS, which sorts and compares as text."""
+    if not value or len(value) != 17:
+        return None
+    return f"20{value[6:8]}-{value[3:5]}-{value[0:2]} {value[9:]}"
+
+def _job_row(job_obj: Dict[str, Any], status: str, notes: Optional[str]) -> Tuple:
+    """Build the job_applications row for a job dictionary."""
+    return (
+        job_obj.get('company_name', 'Unknown Company'),
+        job_obj.get('position', 'Unknown Position'),
+        job_obj.get('remote_policy', None),
+        job_obj.get('compensation', None),
+        job_obj.get('skills', None),
+        job_obj.get('description', None),
+        status,
+        notes,
+        job_obj.get('url', None),
+        job_obj.get('type', None),
+        job_obj.get('location', None),
+        job_obj.get('exp_required', None),
+        job_obj.get('application_date', None),
+        job_obj.get('time', None),
+        job_obj.get('run_id', None),
+        iso_time(job_obj.get('time', None)),
+    )
+
+async def _commit(conn: aiosqlite.Connection, pending: List[Tuple], count: int):
+    """
+    Commit the first count entries of pending in one transaction and remove them from it.
+    Anything that interrupts the statements, cancellation included, rolls them back and leaves pending as it was.
+    A cancellation during COMMIT waits for the commit to finish, so committed rows are never queued twice.
+    """
+    rows = pending[:count]
+    jobs = [row for row in rows if not isinstance(row, Statement)]
+    try:
+        if jobs:
+            await conn.executemany(INSERT_JOB_QUERY, jobs)
+        for row in rows:
+            if isinstance(row, Statement):
+                await conn.execute(row.query, row.params)
+        commit = asyncio.ensure_future(conn.commit())
+        try:
+            await asyncio.shield(commit)
+        except asyncio.CancelledError:
+            await commit
+            del pending[:count]
+            raise
+    except BaseException:
+        if conn.in_transaction:
+            await conn.rollback()
+        raise
+    del pending[:count]
+
+@timed("db_commit")
+async def _flush_rows(conn: aiosqlite.Connection, pending: List[Tuple]):
     """
+    Insert the pending rows, and run the statements queued among them, in one transaction.
+    A batch that fails twice (a bad row, or the database staying locked) is written row by row,
+    in order, so only the rows that fail on their own are dropped; they are counted in dropped_jobs().
+    Rows leave pending only once committed or dropped, so an interrupted flush can be resumed with what is left.
+    """
+    global _dropped_jobs
+    try:
+        await _commit(conn, pending, len(pending))
+        return
+    except Exception as e:
+        print(f"Error storing a batch of {len(pending)} writes, retrying: {e}")
+    await asyncio.sleep(WRITE_RETRY_DELAY)
+    try:
+        await _commit(conn, pending, len(pending))
+        return
+    except Exception as e:
+        print(f"Error storing the batch again, writing it row by row: {e}")
+
+    while pending:
+        row = pending[0]
+        try:
+            await _commit(conn, pending, 1)
+        except Exception as e:
+            del pending[0]
+            if isinstance(row, Statement):
+                print(f"Dropped a queued database write: {e}")
+            else:
+                _dropped_jobs += 1
+                print(f"Dropped job {row[1]} at {row[0]}: {e}")
+
+def dropped_jobs() -> int:
+    """Number of queued job rows this process failed to commit."""
+    return _dropped_jobs
+
+async def _writer_loop(conn: aiosqlite.Connection, queue: asyncio.Queue):
+    """Drain the write queue, committing on batch size or flush interval."""
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        row = await queue.get()
+        if row is _STOP:
+            break
+        _pending_rows.append(row)
+
+        deadline = loop.time() + WRITE_FLUSH_INTERVAL
+        while len(_pending_rows) < WRITE_BATCH_SIZE:
+            # rows already queued are taken without a timer; wait_for only runs when the queue is empty
+            try:
+                row = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if row is _STOP:
+                stopping = True
+                break
+            _pending_rows.append(row)
+
+        await _flush_rows(conn, _pending_rows)
+
+async def _enqueue(conn: aiosqlite.Connection, row: Tuple):
+    """Queue a row for the background writer, starting it on first use."""
+    global _write_queue, _writer_task
+    if _writer_task is None or _writer_task.done():
+        _write_queue = _write_queue or asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        _writer_task = asyncio.create_task(_writer_loop(conn, _write_queue))
+    # Bounded queue: blocks only when the writer falls WRITE_QUEUE_SIZE rows behind
+    await _write_queue.put(row)
+
+def route_writes_to(result_queue):
+    """Send stored jobs as ('job', row) messages to a multiprocessing queue instead of writing them."""
+    global _result_queue
+    _result_queue = result_queue
+
+async def store_job_row(row: Tuple) -> bool:
+    """Queue an already built job_applications row for the background writer."""
     try:
         conn = await get_sqlite_connection()
         if not conn:
             print("Failed to get database connection for storing job")
             return False
-        
-        # Ensure database is initialized (idempotent - safe to call multiple times)
         await init_database(conn)
-        
-        # Prepare query for inserting job
-        query = """
-            INSERT INTO job_applications 
-            (company_name, position, remote_policy, compensation, skills, description, status, notes, url, type, location, exp_required, application_date, time) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        data = (
-            job_obj.get('company_name', 'Unknown Company'),
-            job_obj.get('position', 'Unknown Position'),
-            job_obj.get('remote_policy', None),
-            job_obj.get('compensation', None),
-            job_obj.get('skills', None),
-            job_obj.get('description', None),
-            status,
-            job_obj.get('notes', None),
-            job_obj.get('url', None),
-            job_obj.get('type', None),
-            job_obj.get('location', None),
-            job_obj.get('exp_required', None),
-            job_obj.get('application_date', None),
-            job_obj.get('time', None),
-        )
-        
-        await conn.execute(query, data)
-        await conn.commit()
+        await _enqueue(conn, row)
+        seen_jobs.mark_seen(row[0], row[1])
         return True
-        
     except Exception as e:
         print(f"Error storing job in database: {e}")
         return False
 
+async def store_statement(query: str, params: Tuple) -> bool:
+    """Queue a write for the background writer, to be committed together with the job rows queued before it."""
+    try:
+        conn = await get_sqlite_connection()
+        if not conn:
+            return False
+        await init_database(conn)
+        await _enqueue(conn, Statement(query, params))
+        return True
+    except Exception as e:
+        print(f"Error queueing database write: {e}")
+        return False
+
+async def flush_writes():
+    """Stop the background writer and commit every queued row.
+    Safe to call during shutdown, including after a crash or KeyboardInterrupt."""
+    global _write_queue, _writer_task
+    task, queue = _writer_task, _write_queue
+    _writer_task, _write_queue = None, None
+    if task is None or queue is None:
+        return
+
+    if not task.done():
+        try:
+            # a full queue makes room as the writer drains it
+            await queue.put(_STOP)
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Let the writer roll back its batch before the connection is used here. The cancellation is
+            # repeated, since asyncio.wait_for can swallow one that arrives as the queue hands over a row
+            while not task.done():
+                task.cancel()
+                await asyncio.wait([task], timeout=1)
+        except Exception as e:
+            print(f"Error in database writer: {e}")
+
+    # Commit whatever the writer did not get to (e.g. it was cancelled mid-batch)
+    while not queue.empty():
+        row = queue.get_nowait()
+        if row is not _STOP:
+            _pending_rows.append(row)
+    if _pending_rows and _db_conn is not None:
+        await _flush_rows(_db_conn, _pending_rows)
+
+@timed()
+async def store_single_job(job_obj: Dict[str, Any], status: str) -> bool:
+    """Queue a single job for the background database writer.
+    The row is committed in the next batch; call flush_writes() to force it out.
+    
+    Args:
+        job_obj: Dictionary containing job data
+        status: Either 'applied' or 'rejected'
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    data = _job_row(job_obj, status, job_obj.get('notes', None))
+    if _result_queue is not None:
+        _result_queue.put(('job', data))
+        seen_jobs.mark_seen(data[0], data[1])
+        return True
+    return await store_job_row(data)
+
 async def initialize_database_connection() -> bool:
     """Initialize the database connection and create tables if needed.
     
@@ -137,6 +389,73 @@ async def initialize_database_connection() -> bool:
         print(f"Error initializing database: {e}")
         return False
 
+async def load_seen_jobs() -> int:
+    """Load every previously stored job into the in-memory seen-job index.
+    
+    Returns:
+        Number of distinct jobs in the index
+    """
+    try:
+        conn = await get_sqlite_connection()
+        if not conn:
+            return 0
+        await init_database(conn)
+
+        async with conn.execute("SELECT DISTINCT company_name, position FROM job_applications") as cursor:
+            size = seen_jobs.load(await cursor.fetchall())
+        print(f"Loaded {size} previously processed jobs")
+        return size
+    except Exception as e:
+        print(f"Error loading seen jobs: {e}")
+        return 0
+
+async def count_run_jobs(run_id: str) -> Dict[str, int]:
+    """Number of stored jobs per status for a run."""
+    await flush_writes()
+    conn = await get_sqlite_connection()
+    await init_database(conn)
+    async with conn.execute(
+        "SELECT status, COUNT(*) FROM job_applications WHERE run_id = ? GROUP BY status", (run_id,)
+    ) as cursor:
+        return {status: count for status, count in await cursor.fetchall()}
+
+async def iter_jobs(columns: List[str], run_id: Optional[str] = None, since: Optional[str] = None,
+                    until: Optional[str] = None, batch_size: int = READ_BATCH_SIZE) -> AsyncIterator[List[Tuple]]:
+    """
+    Stream stored jobs in batches through a cursor, so any number of rows fits in memory.
+    Queued rows are committed first so the selection is complete.
+
+    Args:
+        columns: Columns to select, in order
+        run_id: Only jobs of this run (in insertion order)
+        since, until: Only jobs processed in [since, until), as YYYY-MM-DD[ HH:MM:SS] (in time order)
+    """
+    await flush_writes()
+    conn = await get_sqlite_connection()
+    await init_database(conn)
+
+    conditions, params = [], []
+    if run_id is not None:
+        conditions.append("run_id = ?")
+        params.append(run_id)
+    if since:
+        conditions.append("processed_at >= ?")
+        params.append(since)
+    if until:
+        conditions.append("processed_at < ?")
+        params.append(until)
+    # Both orders follow an index, so SQLite never sorts the selection in a temporary table
+    order = "id" if run_id is not None or not (since or until) else "processed_at, id"
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"SELECT {', '.join(columns)} FROM job_applications {where} ORDER BY {order}"
+
+    async with conn.execute(query, params) as cursor:
+        while True:
+            rows = await cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
 async def store_jobs(applied: list, rejected: list) -> None:
     """Store multiple jobs (applied and rejected) in the database.
     
@@ -159,54 +478,15 @@ async def store_jobs(applied: list, rejected: list) -> None:
             # Initialize database table
             await init_database(conn)
 
-            # Prepare query for inserting jobs (SQLite uses ? placeholders)
-            query = """
-                INSERT INTO job_applications 
-                (company_name, position, remote_policy, compensation, skills, description, status, notes, url, type, location, exp_required, application_date, time) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-
-            # Store applied jobs
-            for job in applied:
-                data = (
-                    job.get('company_name', 'Unknown Company'),  # Use fallback value
-                    job.get('position', 'Unknown Position'),     # Use fallback value
-                    job.get('remote_policy', None),
-                    job.get('compensation', None),
-                    job.get('skills', None),
-                    job.get('description', None),
-                    'applied',  # status
-                    None,  # notes is null for applied jobs
-                    job.get('url', None),
-                    job.get('type', None),
-                    job.get('location', None),
-                    job.get('exp_required', None),
-                    job.get('application_date', None),
-                    job.get('time'),  # timestamp when job was processed
-                )
-                await conn.execute(query, data)
-                applied_count += 1
-
-            # Store rejected jobs
-            for job in rejected:
-                data = (
-                    job.get('company_name', 'Unknown Company'),  # Use fallback value
-                    job.get('position', 'Unknown Position'),     # Use fallback value
-                    job.get('remote_policy', None),
-                    job.get('compensation', None),
-                    job.get('skills', None),
-                    job.get('description', None),
-                    'rejected',  # status
-                    job.get('notes', None),  # notes for rejection reason
-                    job.get('url', None),
-                    job.get('type', None),
-                    job.get('location', None),
-                    job.get('exp_required', None),
-                    job.get('application_date', None),  # null for rejected jobs
-                    job.get('time'),  # timestamp when job was processed
-                )
-                await conn.execute(query, data)
-                rejected_count += 1
+            # notes is null for applied jobs, rejection reason for rejected ones
+            rows = [_job_row(job, 'applied', None) for job in applied]
+            rows += [_job_row(job, 'rejected', job.get('notes', None)) for job in rejected]
+            applied_count = len(applied)
+            rejected_count = len(rejected)
+
+            await conn.executemany(INSERT_JOB_QUERY, rows)
+            for row in rows:
+                seen_jobs.mark_seen(row[0], row[1])
 
             # Commit all changes
             await conn.commit()
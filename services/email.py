@@ -1,222 +1,328 @@
+import asyncio
 import os
-import csv
+import re
 import smtplib
-import base64
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
+from email.policy import SMTP as SMTP_POLICY
 from datetime import datetime
+from typing import NamedTuple, Optional
 
+import aiohttp
+
+from utils.timing import timed
+from services.db import count_run_jobs
+from services.outbox import init_outbox, add_to_outbox, pending_reports, mark_sent, mark_failed, remove_from_outbox
+from services.report import Report, export_report, iter_base64, json_with_attachment
+from config.settings import (report_compression, resend_api_url, smtp_host, smtp_port, smtp_starttls, email_timeout,
+                             email_attempts)
 from config.secrets import resend_api_key, from_email, to_email, email, password
 
 
-def create_csv_report(applied: list, rejected: list) -> str:
+# MIME type of the attached report, by compression
+ATTACHMENT_TYPES = {None: ('text', 'csv'), 'gzip': ('application', 'gzip'), 'zip': ('application', 'zip')}
+
+# Longest pause between two delivery attempts
+MAX_BACKOFF = 30
+
+# Resend statuses worth another attempt; any other error status means the request itself is wrong
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+# Stands in for the attachment's base64 while the rest of a MIME message is encoded
+_PAYLOAD_PLACEHOLDER = "ATTACHMENT-PAYLOAD"
+
+# Lines starting with a period are doubled in SMTP DATA so none ends the message early
+_LEADING_PERIOD = re.compile(rb'(?m)^\.')
+
+
+class DeliveryError(Exception):
+    """A delivery attempt failed. Permanent errors (bad credentials, refused addresses) are not retried."""
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class ReportEmail(NamedTuple):
+    sender: str
+    recipient: str
+    subject: str
+    text: str
+    # Path of the (possibly compressed) CSV report to attach
+    attachment: str
+
+
+def report_email(report: Report) -> ReportEmail:
+    """The email carrying a report, addressed as configured in config/secrets.py."""
+    return ReportEmail(
+        sender=from_email if from_email else email,
+        recipient=to_email if to_email else email,
+        subject=f"Job Application Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        text=f"""Job Application Report
+
+Summary:
+- Applied: {report.applied} jobs
+- Rejected: {report.rejected} jobs
+- Total: {report.rows} jobs
+
+Please find the detailed CSV report attached.""",
+        attachment=report.path,
+    )
+
+
+class ResendTransport:
     """
-    Create a CSV file containing job application data.
-    
-    Args:
-        applied: List of applied job dictionaries
-        rejected: List of rejected job dictionaries
-    
-    Returns:
-        str: Filename of the created CSV file
+    Resend HTTP API (FREE - 3,000 emails/month) over one aiohttp session, so connections are reused.
+    The attachment's base64 is streamed into the request body straight from the file.
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_filename = f"job_report_{timestamp}.csv"
-    
-    # Define CSV columns
-    fieldnames = [
-        'status', 'company_name', 'position', 'remote_policy', 'compensation',
-        'location', 'type', 'exp_required', 'skills', 'url', 
-        'application_date', 'time', 'notes'
-    ]
-    
-    # Write CSV file
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Write applied jobs
-        for job in applied:
-            writer.writerow({
-                'status': 'applied',
-                'company_name': job.get('company_name', ''),
-                'position': job.get('position', ''),
-                'remote_policy': job.get('remote_policy', ''),
-                'compensation': job.get('compensation', ''),
-                'location': job.get('location', ''),
-                'type': job.get('type', ''),
-                'exp_required': job.get('exp_required', ''),
-                'skills': job.get('skills', ''),
-                'url': job.get('url', ''),
-                'application_date': job.get('application_date', ''),
-                'time': job.get('time', ''),
-                'notes': job.get('notes', '')
-            })
-        
-        # Write rejected jobs
-        for job in rejected:
-            writer.writerow({
-                'status': 'rejected',
-                'company_name': job.get('company_name', ''),
-                'position': job.get('position', ''),
-                'remote_policy': job.get('remote_policy', ''),
-                'compensation': job.get('compensation', ''),
-                'location': job.get('location', ''),
-                'type': job.get('type', ''),
-                'exp_required': job.get('exp_required', ''),
-                'skills': job.get('skills', ''),
-                'url': job.get('url', ''),
-                'application_date': job.get('application_date', ''),
-                'time': job.get('time', ''),
-                'notes': job.get('notes', '')
-            })
-    
-    print(f"CSV report created: {csv_filename}")
-    return csv_filename
-
-
-async def send_email_with_attachment(csv_filename: str, applied: list, rejected: list):
+    name = "Resend"
+
+    def __init__(self, api_key: str, url: str = resend_api_url, timeout: float = email_timeout):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+        return self._session
+
+    async def send(self, message: ReportEmail):
+        data = {
+            "from": message.sender,
+            "to": [message.recipient],
+            "subject": message.subject,
+            "text": message.text,
+            # content is filled in from the file by json_with_attachment
+            "attachments": [{"filename": os.path.basename(message.attachment), "content": None}],
+        }
+
+        async def body():
+            for chunk in json_with_attachment(data, message.attachment):
+                yield chunk
+
+        try:
+            async with self._get_session().post(self.url, data=body(),
+                                                headers={"Content-Type": "application/json"}) as response:
+                if response.status >= 400:
+                    detail = (await response.text())[:200]
+                    raise DeliveryError(f"HTTP {response.status}: {detail}",
+                                        permanent=response.status not in RETRY_STATUSES)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise DeliveryError(f"{type(e).__name__}: {e}") from e
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class SMTPTransport:
     """
-    Send email with CSV attachment. Tries Resend API first, falls back to SMTP.
-    
-    Args:
-        csv_filename: Path to the CSV file to attach
-        applied: List of applied job dictionaries
-        rejected: List of rejected job dictionaries
-    
-    Raises:
-        Exception: If both Resend and SMTP fail
+    smtplib on a dedicated thread, so sending never blocks the event loop.
+    The connection stays open between messages and is replaced when it stops answering.
+    The attachment's base64 is written to the socket chunk by chunk, straight from the file.
     """
-    # Determine email addresses
-    sender_email = from_email if from_email else email
-    recipient = to_email if to_email else email
-    
-    # Try Resend API first (FREE - 3,000 emails/month)
-    if resend_api_key:
-        try:
-            import requests
-            
-            # Read CSV file content
-            with open(csv_filename, 'rb') as f:
-                csv_content = f.read()
-            
-            # Resend API endpoint
-            url = "https://api.resend.com/emails"
-            
-            # Prepare email data
-            email_data = {
-                "from": sender_email,
-                "to": [recipient],
-                "subject": f"Job Application Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                "text": f"""Job Application Report
+    name = "SMTP"
 
-Summary:
-- Applied: {len(applied)} jobs
-- Rejected: {len(rejected)} jobs
-- Total: {len(applied) + len(rejected)} jobs
+    def __init__(self, host: str = smtp_host, port: int = smtp_port, starttls: bool = smtp_starttls,
+                 username: str = email, password: str = password, timeout: float = email_timeout):
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._server: Optional[smtplib.SMTP] = None
+        # One thread: smtplib connections are not thread-safe, and messages go out one at a time anyway
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
 
-Please find the detailed CSV report attached.""",
-                "attachments": [{
-                    "filename": csv_filename,
-                    "content": base64.b64encode(csv_content).decode('utf-8')
-                }]
-            }
-            
-            headers = {
-                "Authorization": f"Bearer {resend_api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.post(url, json=email_data, headers=headers)
-            response.raise_for_status()
-            print(f"Email report sent successfully via Resend to {recipient}")
+    def _connection(self) -> smtplib.SMTP:
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop()
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            # Local sinks take mail without logging in
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        self._server = server
+        return server
+
+    def _drop(self):
+        server, self._server = self._server, None
+        if server is None:
             return
-            
-        except ImportError:
-            print("Error: 'requests' package is required for Resend. Install it with: pip install requests")
-            print("Falling back to SMTP...")
-        except Exception as e:
-            print(f"Error sending email via Resend: {e}")
-            print("Falling back to SMTP...")
-    
-    # Fallback to SMTP if Resend is not configured or failed
-    # Create email message
-    msg = MIMEMultipart()
-    msg['From'] = sender_email
-    msg['To'] = recipient
-    msg['Subject'] = f"Job Application Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    
-    # Email body
-    body = f"""
-    Job Application Report
-    
-    Summary:
-    - Applied: {len(applied)} jobs
-    - Rejected: {len(rejected)} jobs
-    - Total: {len(applied) + len(rejected)} jobs
-    
-    Please find the detailed CSV report attached.
-    """
-    msg.attach(MIMEText(body, 'plain'))
-    
-    # Attach CSV file
-    with open(csv_filename, 'rb') as attachment:
-        part = MIMEBase('application', 'octet-stream')
-        part.set_payload(attachment.read())
-        encoders.encode_base64(part)
-        part.add_header(
-            'Content-Disposition',
-            f'attachment; filename= {csv_filename}'
-        )
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def _message(self, message: ReportEmail) -> tuple[bytes, bytes]:
+        """The MIME message around the attachment's base64: (everything before it, everything after it)."""
+        msg = MIMEMultipart()
+        msg['From'] = message.sender
+        msg['To'] = message.recipient
+        msg['Subject'] = message.subject
+        msg.attach(MIMEText(message.text, 'plain'))
+
+        # The attachment's content is filled in from the file while sending
+        part = MIMEBase(*ATTACHMENT_TYPES[report_compression])
+        part.set_payload(_PAYLOAD_PLACEHOLDER)
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.add_header('Content-Disposition', 'attachment', filename=os.path.basename(message.attachment))
         msg.attach(part)
-    
-    # Send email using SMTP
-    server = smtplib.SMTP('smtp.gmail.com', 587)
-    server.starttls()
-    server.login(email, password)
-    text = msg.as_string()
-    server.sendmail(sender_email, recipient, text)
-    server.quit()
-    print(f"Email report sent successfully via SMTP to {recipient}")
-
-
-async def send_email_report(applied: list, rejected: list):
+
+        prefix, suffix = msg.as_bytes(policy=SMTP_POLICY).split(_PAYLOAD_PLACEHOLDER.encode('ascii'))
+        return _LEADING_PERIOD.sub(b'..', prefix), _LEADING_PERIOD.sub(b'..', suffix.lstrip(b"\r\n"))
+
+    def _transmit(self, server: smtplib.SMTP, message: ReportEmail):
+        """One SMTP transaction, with the DATA body streamed instead of built in memory."""
+        prefix, suffix = self._message(message)
+        server.ehlo_or_helo_if_needed()
+        code, response = server.mail(message.sender)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(code, response, message.sender)
+        code, response = server.rcpt(message.recipient)
+        if code not in (250, 251):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused({message.recipient: (code, response)})
+        code, response = server.docmd("data")
+        if code != 354:
+            server.rset()
+            raise smtplib.SMTPDataError(code, response)
+
+        server.send(prefix)
+        # Base64 lines never start with a period
+        for chunk in iter_base64(message.attachment, mime=True):
+            server.send(chunk.replace(b"\n", b"\r\n"))
+        server.send(suffix + (b"" if suffix.endswith(b"\r\n") else b"\r\n") + b".\r\n")
+        code, response = server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, response)
+
+    def _send(self, message: ReportEmail):
+        try:
+            self._transmit(self._connection(), message)
+        except smtplib.SMTPAuthenticationError as e:
+            self._drop()
+            raise DeliveryError(f"login refused ({e.smtp_code}). If using Gmail, use an App Password "
+                                f"instead of your regular password", permanent=True) from e
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
+            raise DeliveryError(f"address refused: {e}", permanent=True) from e
+        except (smtplib.SMTPException, OSError) as e:
+            self._drop()
+            raise DeliveryError(f"{type(e).__name__}: {e}") from e
+
+    async def send(self, message: ReportEmail):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._send, message)
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._drop)
+        self._executor.shutdown(wait=False)
+
+
+class EmailDelivery:
     """
-    Send email report with CSV attachment containing job application data.
-    
-    Args:
-        applied: List of applied job dictionaries
-        rejected: List of rejected job dictionaries
+    Sends a message through the first transport that takes it (Resend, then SMTP), repeating
+    the whole sequence up to attempts times with exponential backoff between rounds.
     """
+
+    def __init__(self, transports: list, attempts: int = email_attempts):
+        self.transports = transports
+        self.attempts = attempts
+
+    async def deliver(self, message: ReportEmail) -> Optional[str]:
+        """Returns None once the message is sent, otherwise the last error."""
+        error = "no email transport configured"
+        for attempt in range(1, self.attempts + 1):
+            permanent = True
+            for transport in self.transports:
+                try:
+                    await transport.send(message)
+                    print(f"Email report sent successfully via {transport.name} to {message.recipient}")
+                    return None
+                except DeliveryError as e:
+                    print(f"Error sending email via {transport.name} (attempt {attempt}/{self.attempts}): {e}")
+                    error = f"{transport.name}: {e}"
+                    permanent = permanent and e.permanent
+            if permanent or attempt == self.attempts:
+                break
+            await asyncio.sleep(min(MAX_BACKOFF, 2 ** attempt))
+        return error
+
+    async def close(self):
+        for transport in self.transports:
+            await transport.close()
+
+
+def default_delivery() -> EmailDelivery:
+    """Resend when an API key is configured, with SMTP as the fallback."""
+    transports = [ResendTransport(resend_api_key)] if resend_api_key else []
+    if smtp_host:
+        transports.append(SMTPTransport())
+    return EmailDelivery(transports)
+
+
+async def _send_report(delivery: EmailDelivery, run_id: str):
+    """Build a run's report from the database and try to deliver it, recording the outcome in the outbox."""
+    counts = await count_run_jobs(run_id)
+    if not counts:
+        print(f"No jobs to report for run {run_id}. Skipping email.")
+        await remove_from_outbox(run_id)
+        return
+
+    # Create the compressed CSV file, streamed from the database
+    report = await export_report(run_id=run_id, compression=report_compression)
     try:
-        if len(applied) == 0 and len(rejected) == 0:
-            print("No jobs to report. Skipping email.")
-            return
-        
-        # Create CSV file
-        csv_filename = create_csv_report(applied, rejected)
-        
-        # Send email with attachment
-        try:
-            await send_email_with_attachment(csv_filename, applied, rejected)
-        except Exception as e:
-            print(f"Error sending email: {e}")
-            print("Note: If using Gmail, you may need to:")
-            print("1. Enable 'Less secure app access' OR")
-            print("2. Use an App Password instead of your regular password")
-            raise e
-        
-        # Clean up CSV file
+        error = await delivery.deliver(report_email(report))
+    finally:
+        # Rebuilt from the database if the report has to be sent again
         try:
-            if os.path.exists(csv_filename):
-                os.remove(csv_filename)
-                print(f"Temporary CSV file {csv_filename} removed")
-        except Exception as e:
-            print(f"Warning: Could not remove temporary CSV file: {e}")
-                
-    except Exception as e:
-        print(f"Error in send_email_report: {e}")
-        raise e
+            os.remove(report.path)
+        except OSError as e:
+            print(f"Warning: Could not remove temporary report file: {e}")
 
+    if error is None:
+        await mark_sent(run_id)
+    elif await mark_failed(run_id, error):
+        print(f"Report of run {run_id} kept in the outbox, it will be sent again by the next run")
+    else:
+        print(f"Giving up on the report of run {run_id}: {error}")
+
+
+@timed()
+async def send_email_report(run_id: Optional[str] = None):
+    """
+    Queue a run's report in the outbox, then send every pending report (earlier failures first).
+    Failed deliveries stay in the outbox instead of being lost.
+
+    Args:
+        run_id: Run to report on (None only retries the outbox)
+    """
+    await init_outbox()
+    if run_id:
+        await add_to_outbox(run_id)
+
+    delivery = default_delivery()
+    try:
+        for pending in await pending_reports():
+            await _send_report(delivery, pending)
+    finally:
+        await delivery.close()
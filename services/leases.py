@@ -0,0 +1,73 @@
+import time
+from services.db import get_sqlite_connection
+
+# Seconds a claimed item stays reserved for its worker before others may take it over
+LEASE_SECONDS = 600
+
+_CLAIM_QUERY = """
+    INSERT INTO work_leases (run_id, item_key, worker_id, status, leased_until, updated_at)
+    VALUES (?, ?, ?, 'leased', ?, ?)
+    ON CONFLICT(run_id, item_key) DO UPDATE SET
+        worker_id = excluded.worker_id,
+        leased_until = excluded.leased_until,
+        updated_at = excluded.updated_at
+    WHERE work_leases.status = 'leased' AND work_leases.leased_until < ?
+"""
+
+async def init_leases():
+    """Create the work_leases table if it doesn't exist."""
+    conn = await get_sqlite_connection()
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS work_leases (
+            run_id TEXT NOT NULL,
+            item_key TEXT NOT NULL,
+            worker_id TEXT NOT NULL,
+            status TEXT NOT NULL CHECK(status IN ('leased', 'done')),
+            leased_until REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (run_id, item_key)
+        )
+    """)
+    await conn.commit()
+
+async def release_worker(run_id: str, worker_id: str) -> int:
+    """Expire every unfinished lease of a worker so other workers can reclaim its items.
+
+    Returns:
+        Number of leases released
+    """
+    conn = await get_sqlite_connection()
+    cursor = await conn.execute(
+        "UPDATE work_leases SET leased_until = 0 WHERE run_id = ? AND worker_id = ? AND status = 'leased'",
+        (run_id, worker_id),
+    )
+    await conn.commit()
+    return cursor.rowcount
+
+class WorkLeases:
+    """Claims items (company cards) for one worker so that workers process disjoint work."""
+
+    def __init__(self, run_id: str, worker_id: str, lease_seconds: float = LEASE_SECONDS):
+        self.run_id = run_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+
+    async def claim(self, item_key: str) -> bool:
+        """Reserve an item. Succeeds if it is unclaimed or its previous lease expired unfinished."""
+        conn = await get_sqlite_connection()
+        now = time.time()
+        cursor = await conn.execute(
+            _CLAIM_QUERY,
+            (self.run_id, item_key, self.worker_id, now + self.lease_seconds, now, now),
+        )
+        await conn.commit()
+        return cursor.rowcount == 1
+
+    async def complete(self, item_key: str):
+        """Mark a claimed item as finished so it is never handed out again in this run."""
+        conn = await get_sqlite_connection()
+        await conn.execute(
+            "UPDATE work_leases SET status = 'done', updated_at = ? WHERE run_id = ? AND item_key = ? AND worker_id = ?",
+            (time.time(), self.run_id, item_key, self.worker_id),
+        )
+        await conn.commit()
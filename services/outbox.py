@@ -0,0 +1,66 @@
+import time
+from services.db import get_sqlite_connection
+
+# Runs that try to deliver a report before it is given up as failed
+MAX_OUTBOX_RUNS = 5
+
+
+async def init_outbox():
+    """Create the email_outbox table if it doesn't exist."""
+    conn = await get_sqlite_connection()
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            run_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL CHECK(status IN ('pending', 'sent', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    await conn.commit()
+
+async def add_to_outbox(run_id: str):
+    """Queue the report of a run. The report itself is rebuilt from the database whenever it is sent."""
+    conn = await get_sqlite_connection()
+    now = time.time()
+    await conn.execute(
+        "INSERT OR IGNORE INTO email_outbox (run_id, status, created_at, updated_at) VALUES (?, 'pending', ?, ?)",
+        (run_id, now, now),
+    )
+    await conn.commit()
+
+async def pending_reports() -> list[str]:
+    """Run ids of the reports still to send, oldest first."""
+    conn = await get_sqlite_connection()
+    async with conn.execute("SELECT run_id FROM email_outbox WHERE status = 'pending' ORDER BY created_at") as cursor:
+        return [run_id for (run_id,) in await cursor.fetchall()]
+
+async def mark_sent(run_id: str):
+    conn = await get_sqlite_connection()
+    await conn.execute(
+        "UPDATE email_outbox SET status = 'sent', attempts = attempts + 1, last_error = NULL, updated_at = ? WHERE run_id = ?",
+        (time.time(), run_id),
+    )
+    await conn.commit()
+
+async def mark_failed(run_id: str, error: str) -> bool:
+    """Record a failed delivery. Returns True if the report stays pending for a later run."""
+    conn = await get_sqlite_connection()
+    await conn.execute(
+        """UPDATE email_outbox
+           SET attempts = attempts + 1, last_error = ?, updated_at = ?,
+               status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END
+           WHERE run_id = ?""",
+        (error, time.time(), MAX_OUTBOX_RUNS, run_id),
+    )
+    await conn.commit()
+    async with conn.execute("SELECT status FROM email_outbox WHERE run_id = ?", (run_id,)) as cursor:
+        row = await cursor.fetchone()
+    return row is not None and row[0] == 'pending'
+
+async def remove_from_outbox(run_id: str):
+    """Drop a report that has nothing to send."""
+    conn = await get_sqlite_connection()
+    await conn.execute("DELETE FROM email_outbox WHERE run_id = ?", (run_id,))
+    await conn.commit()
@@ -0,0 +1,118 @@
+import base64
+import csv
+import gzip
+import io
+import json
+import os
+import zipfile
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, NamedTuple, Optional
+from services.db import iter_jobs
+
+# Columns of the CSV report, in order
+REPORT_COLUMNS = [
+    'status', 'company_name', 'position', 'remote_policy', 'compensation',
+    'location', 'type', 'exp_required', 'skills', 'url',
+    'application_date', 'time', 'notes'
+]
+
+_EXTENSIONS = {None: ".csv", "gzip": ".csv.gz", "zip": ".zip"}
+
+# Bytes read per step when encoding an attachment; a multiple of 57 so MIME lines (76 chars) never split
+_ENCODE_CHUNK = 57 * 1024
+
+# Stands in for the attachment content while the rest of a JSON body is encoded
+_CONTENT_PLACEHOLDER = "\x00attachment\x00"
+
+
+class Report(NamedTuple):
+    path: str
+    applied: int
+    rejected: int
+
+    @property
+    def rows(self) -> int:
+        return self.applied + self.rejected
+
+
+def report_filename(compression: Optional[str] = None, directory: str = "") -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(directory, f"job_report_{timestamp}{_EXTENSIONS[compression]}")
+
+
+@contextmanager
+def _text_stream(path: str, compression: Optional[str]):
+    """A text stream that compresses as it is written; zip archives hold one CSV named like the archive."""
+    if compression is None:
+        with open(path, "w", newline="", encoding="utf-8") as stream:
+            yield stream
+    elif compression == "gzip":
+        with gzip.open(path, "wt", newline="", encoding="utf-8") as stream:
+            yield stream
+    else:
+        member = os.path.basename(path)[:-len(".zip")] + ".csv"
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            with io.TextIOWrapper(archive.open(member, "w", force_zip64=True), newline="", encoding="utf-8") as stream:
+                yield stream
+
+
+async def export_report(run_id: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+                        compression: Optional[str] = "gzip", path: Optional[str] = None) -> Report:
+    """
+    Write the stored jobs of a run and/or a time window to a CSV file, compressing as rows arrive.
+    Rows are streamed from the database in batches, so the size of the report does not matter.
+
+    Args:
+        run_id: Only jobs of this run
+        since, until: Only jobs processed in [since, until), as YYYY-MM-DD[ HH:MM:SS]
+        compression: "gzip", "zip" or None
+        path: Output file (default: job_report_<timestamp> with the compression's extension)
+
+    Returns:
+        Report: The file written and the number of applied and rejected jobs in it
+    """
+    if compression not in _EXTENSIONS:
+        raise ValueError(f"Unknown report compression: {compression}")
+    path = path or report_filename(compression)
+    statuses: Counter = Counter()
+
+    with _text_stream(path, compression) as stream:
+        writer = csv.writer(stream)
+        writer.writerow(REPORT_COLUMNS)
+        async for rows in iter_jobs(REPORT_COLUMNS, run_id, since, until):
+            writer.writerows(rows)
+            statuses.update(row[0] for row in rows)
+
+    print(f"CSV report created: {path}")
+    return Report(path, statuses['applied'], statuses['rejected'])
+
+
+def iter_base64(path: str, mime: bool = False) -> Iterator[bytes]:
+    """
+    Base64 of a file, chunk by chunk, without reading the whole file.
+
+    Args:
+        mime: Break lines every 76 characters, as MIME bodies require
+    """
+    encode = base64.encodebytes if mime else base64.b64encode
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_ENCODE_CHUNK)
+            if not chunk:
+                break
+            yield encode(chunk)
+
+
+def json_with_attachment(data: dict, path: str) -> Iterator[bytes]:
+    """
+    Encode a JSON request body whose attachments[0].content is the base64 of a file, streaming the file
+    into the body. Neither the file nor its encoding is held in memory as a whole.
+    """
+    data = dict(data, attachments=[dict(data['attachments'][0], content=_CONTENT_PLACEHOLDER)])
+    body = json.dumps(data)
+    prefix, suffix = body.split(json.dumps(_CONTENT_PLACEHOLDER))
+    yield prefix.encode("utf-8") + b'"'
+    yield from iter_base64(path)
+    yield b'"' + suffix.encode("utf-8")
@@ -0,0 +1,75 @@
+from collections import deque
+from typing import Any, Dict, Optional
+from services.db import store_single_job, dropped_jobs
+from config.settings import store_in_db
+
+# Processed jobs kept in memory (as summaries) for the end-of-run printout
+RECENT_RESULTS = 20
+
+
+class JobSummary:
+    """The few fields of a processed job worth keeping in memory; the full job is in the database."""
+    __slots__ = ("status", "company_name", "position", "notes")
+
+    def __init__(self, status: str, company_name: str, position: str, notes: Optional[str]):
+        self.status = status
+        self.company_name = company_name
+        self.position = position
+        self.notes = notes
+
+    def __repr__(self) -> str:
+        note = f" ({self.notes})" if self.notes else ""
+        return f"{self.status}: {self.position} at {self.company_name}{note}"
+
+
+class ResultSink:
+    """
+    Destination of every processed job of a run. Jobs are streamed to the database, tagged with the
+    run id; only counters and the last few summaries stay in memory, however long the run is.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, applied: int = 0, rejected: int = 0,
+                 recent: int = RECENT_RESULTS):
+        self.run_id = run_id
+        # Counts include the jobs of a resumed run from before the restart
+        self.applied = applied
+        self.rejected = rejected
+        self._queue_failures = 0
+        # Rows dropped by the database writer before this run started are not the run's
+        self._dropped_before = dropped_jobs()
+        self.recent: deque = deque(maxlen=recent)
+
+    @property
+    def total(self) -> int:
+        return self.applied + self.rejected
+
+    @property
+    def store_failures(self) -> int:
+        """Jobs that never reached the database: refused when queued, or dropped by the writer when committed.
+        Worker processes hand their rows to the supervisor, which reports the rows it drops itself."""
+        return self._queue_failures + dropped_jobs() - self._dropped_before
+
+    async def record(self, job_obj: Dict[str, Any], status: str) -> bool:
+        """
+        Count a job as 'applied' or 'rejected' and queue it for the database.
+
+        Returns:
+            False if the job could not be stored
+        """
+        if status == 'applied':
+            self.applied += 1
+        else:
+            self.rejected += 1
+        self.recent.append(JobSummary(status, job_obj.get('company_name'), job_obj.get('position'),
+                                      job_obj.get('notes')))
+        if not store_in_db:
+            return True
+        job_obj['run_id'] = self.run_id
+        stored = await store_single_job(job_obj, status)
+        if not stored:
+            self._queue_failures += 1
+        return stored
+
+    def summary(self) -> dict:
+        return {'run_id': self.run_id, 'applied': self.applied, 'rejected': self.rejected,
+                'store_failures': self.store_failures}
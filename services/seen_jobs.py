@@ -0,0 +1,35 @@
+import hashlib
+from typing import Iterable, Tuple
+
+# Digests of every (company_name, position) already recorded
+_seen: set = set()
+
+
+def job_key(company_name: str, position: str) -> bytes:
+    """Return a compact, stable identity for a job listing."""
+    normalized = f"{' '.join(company_name.split()).lower()}\x1f{' '.join(position.split()).lower()}"
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=12).digest()
+
+
+def load(rows: Iterable[Tuple[str, str]]) -> int:
+    """Add (company_name, position) rows to the index. Returns the index size."""
+    for company_name, position in rows:
+        if company_name and position:
+            _seen.add(job_key(company_name, position))
+    return len(_seen)
+
+
+def is_seen(company_name: str, position: str) -> bool:
+    """Check whether a job was already processed in this or a previous run."""
+    return job_key(company_name, position) in _seen
+
+
+def mark_seen(company_name: str, position: str):
+    """Record a job as processed."""
+    if company_name and position:
+        _seen.add(job_key(company_name, position))
+
+
+def clear():
+    """Forget every recorded job."""
+    _seen.clear()
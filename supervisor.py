@@ -0,0 +1,178 @@
+"""
+Run several browser workers in parallel, each in its own process.
+
+Workers claim company cards through the work_leases table so no two of them process the same company.
+Stored jobs are sent back over a queue and written by this process only, so SQLite has a single writer.
+
+Usage:
+    python supervisor.py --workers 3
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+import queue
+import uuid
+
+from config.settings import limit
+
+# Times a crashed worker is restarted before its share of the work is left to the others
+MAX_RESTARTS = 3
+
+
+async def run_worker(worker_id: str, run_id: str, messages, worker_limit: int):
+    # Imported here so the supervisor process never loads the browser stack
+    from core.browser import initialize_browser, release_browser
+    from core.session import open_jobs_feed
+    from core.orchestrator import start_applying
+    from core.tab_pool import close_tab_pool
+    from services.db import route_writes_to, load_seen_jobs, initialize_database_connection, close_connection
+    from services.leases import WorkLeases
+    from services.results import ResultSink
+    from utils.pacer import pacer
+    from config.settings import user_data_dir, pacer_state_file
+
+    route_writes_to(messages)
+    await initialize_database_connection()
+    await load_seen_jobs()
+
+    # Workers share the learned rates; each one saves what it ended with
+    pacer.load(pacer_state_file)
+
+    results = ResultSink(run_id)
+    driver = None
+    try:
+        # Chrome locks a profile directory, so each worker keeps its own session
+        # (and its own browser: workers sharing the daemon's tab would navigate it under each other)
+        driver = await initialize_browser(f"{user_data_dir}-{worker_id}" if user_data_dir else None, attach=False)
+        if await open_jobs_feed(driver):
+            leases = WorkLeases(run_id, worker_id)
+            await start_applying(driver, results, 0, worker_limit, leases)
+    finally:
+        messages.put(('done', worker_id, results.applied, results.rejected))
+        pacer.save(pacer_state_file)
+        if driver is not None:
+            try:
+                await close_tab_pool()
+                await release_browser(driver)
+            except Exception as e:
+                print(f"[{worker_id}] Note: Error closing driver (non-critical): {type(e).__name__}")
+        await close_connection()
+
+
+def worker_process(worker_id: str, run_id: str, messages, worker_limit: int):
+    """Entry point of a worker process."""
+    asyncio.run(run_worker(worker_id, run_id, messages, worker_limit))
+
+
+def split_limit(total: int, workers: int) -> list[int]:
+    """
+    Per-worker application limits that add up to exactly total (0 = unlimited for everyone).
+    With a limit smaller than the worker count only that many workers get a share, since 0 means unlimited.
+    """
+    if total <= 0:
+        return [total] * workers
+    workers = min(workers, total)
+    share, extra = divmod(total, workers)
+    return [share + 1 if i < extra else share for i in range(workers)]
+
+
+async def supervise(workers: int):
+    from services.db import initialize_database_connection, close_connection, store_job_row, dropped_jobs
+    from services.leases import init_leases, release_worker
+
+    ctx = mp.get_context('spawn')
+    results = ctx.Queue()
+    run_id = uuid.uuid4().hex
+    shares = {f"worker-{i}": share for i, share in enumerate(split_limit(limit, workers))}
+    # What each worker may still apply to; a restarted worker gets its share minus what it already did
+    limits = dict(shares)
+
+    await initialize_database_connection()
+    await init_leases()
+
+    def spawn(worker_id: str):
+        process = ctx.Process(target=worker_process, args=(worker_id, run_id, results, limits[worker_id]),
+                              name=worker_id)
+        process.start()
+        return process
+
+    processes = {worker_id: spawn(worker_id) for worker_id in limits}
+    restarts = {worker_id: 0 for worker_id in processes}
+    finished = {}
+    stored = 0
+    loop = asyncio.get_running_loop()
+
+    async def handle(message):
+        nonlocal stored
+        if message[0] == 'job':
+            await store_job_row(message[1])
+            stored += 1
+        elif message[0] == 'done':
+            # A restarted worker reports only what it did since the restart
+            _, worker_id, applied, rejected = message
+            before = finished.get(worker_id, (0, 0))
+            finished[worker_id] = (before[0] + applied, before[1] + rejected)
+
+    async def drain():
+        while True:
+            try:
+                message = results.get_nowait()
+            except queue.Empty:
+                return
+            await handle(message)
+
+    print(f"Run {run_id}: started {len(processes)} workers (limits {', '.join(map(str, shares.values()))})")
+    try:
+        while processes:
+            try:
+                message = await loop.run_in_executor(None, results.get, True, 0.5)
+            except queue.Empty:
+                message = None
+            if message:
+                await handle(message)
+
+            for worker_id, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                process.join()
+                del processes[worker_id]
+                if process.exitcode == 0:
+                    continue
+                released = await release_worker(run_id, worker_id)
+                print(f"{worker_id} exited with code {process.exitcode}, released {released} leases")
+                # The worker's messages are all queued once it has exited; its applications count against its share
+                await drain()
+                if limit > 0:
+                    limits[worker_id] = shares[worker_id] - finished.get(worker_id, (0, 0))[0]
+                    if limits[worker_id] <= 0:
+                        continue
+                if restarts[worker_id] < MAX_RESTARTS:
+                    restarts[worker_id] += 1
+                    processes[worker_id] = spawn(worker_id)
+
+        # Rows sent just before the last worker exited
+        await drain()
+    finally:
+        for process in processes.values():
+            process.terminate()
+        await close_connection()
+
+    print("=" * 60)
+    print(f"Run {run_id} finished")
+    for worker_id, (applied, rejected) in sorted(finished.items()):
+        print(f"  {worker_id}: applied {applied}, rejected {rejected}")
+    print(f"  Jobs stored: {stored - dropped_jobs()}")
+    if dropped_jobs():
+        print(f"  Jobs dropped by the database writer: {dropped_jobs()}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="Number of browser worker processes")
+    args = parser.parse_args()
+    asyncio.run(supervise(max(1, args.workers)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from services import db, seen_jobs
+from services.checkpoints import begin_run, load_checkpoint, save_checkpoint
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen_jobs.clear()
+    yield
+    seen_jobs.clear()
+
+
+def run(coro_fn):
+    async def call():
+        try:
+            await db.initialize_database_connection()
+            return await coro_fn()
+        finally:
+            await db.close_connection()
+    return asyncio.run(call())
+
+
+def test_checkpoint_is_committed_with_the_jobs_before_it():
+    async def scenario():
+        checkpoint = await begin_run()
+        await db.store_single_job({'company_name': "Acme", 'position': "Engineer", 'run_id': checkpoint.run_id}, 'applied')
+        await save_checkpoint(checkpoint._replace(feed_cursor=7, last_company="acme", applied=1, companies=1))
+        await db.flush_writes()
+        return checkpoint.run_id, await load_checkpoint(), await db.count_run_jobs(checkpoint.run_id)
+
+    run_id, saved, counts = run(scenario)
+    assert saved.run_id == run_id and counts == {'applied': 1}
+    assert (saved.status, saved.feed_cursor, saved.last_company, saved.applied, saved.companies) == \
+        ('running', 7, "acme", 1, 1)
+
+
+def test_resume_continues_the_latest_unfinished_run():
+    async def scenario():
+        first = await begin_run()
+        await save_checkpoint(first._replace(feed_cursor=3, companies=2))
+        await db.flush_writes()
+        resumed = await begin_run("latest")
+        by_id = await begin_run(first.run_id)
+        return first, resumed, by_id
+
+    first, resumed, by_id = run(scenario)
+    assert resumed.run_id == first.run_id and resumed.feed_cursor == 3 and resumed.companies == 2
+    assert by_id == resumed
+
+
+def test_finished_or_unknown_runs_start_a_new_one():
+    async def scenario():
+        first = await begin_run()
+        await save_checkpoint(first._replace(status='finished'))
+        await db.flush_writes()
+        after_finished = await begin_run(first.run_id)
+        unknown = await begin_run("no-such-run")
+        return first, after_finished, unknown
+
+    first, after_finished, unknown = run(scenario)
+    assert after_finished.run_id != first.run_id and after_finished.feed_cursor == 0
+    assert unknown.run_id not in (first.run_id, after_finished.run_id)
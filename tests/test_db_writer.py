@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from services import db, seen_jobs
+
+
+def job(i: int, company: str = "Acme") -> dict:
+    return {'company_name': company, 'position': f"Engineer {i}", 'time': "01-03-26:10:00:00"}
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(db, "WRITE_RETRY_DELAY", 0)
+    monkeypatch.setattr(db, "_dropped_jobs", 0)
+    seen_jobs.clear()
+    yield
+    db._pending_rows.clear()
+    seen_jobs.clear()
+
+
+async def stored_positions() -> list:
+    conn = await db.get_sqlite_connection()
+    async with conn.execute("SELECT position FROM job_applications ORDER BY id") as cursor:
+        return [row[0] for row in await cursor.fetchall()]
+
+
+def test_full_batch_is_committed_without_flushing(monkeypatch):
+    monkeypatch.setattr(db, "WRITE_BATCH_SIZE", 5)
+
+    async def scenario():
+        try:
+            await db.initialize_database_connection()
+            for i in range(5):
+                await db.store_single_job(job(i), 'applied')
+            for _ in range(100):
+                if len(await stored_positions()) == 5:
+                    break
+                await asyncio.sleep(0.01)
+            return await stored_positions()
+        finally:
+            await db.close_connection()
+
+    assert asyncio.run(scenario()) == [f"Engineer {i}" for i in range(5)]
+
+
+def test_bad_row_is_dropped_and_the_rest_of_the_batch_kept():
+    async def scenario():
+        try:
+            await db.initialize_database_connection()
+            for i in range(3):
+                await db.store_single_job(job(i), 'applied')
+            # NOT NULL company_name fails the whole batch, twice
+            await db.store_single_job(job(3, company=None), 'applied')
+            await db.store_single_job(job(4), 'rejected')
+            await db.store_statement("PRAGMA user_version = user_version", ())
+            await db.flush_writes()
+            return await stored_positions()
+        finally:
+            await db.close_connection()
+
+    assert asyncio.run(scenario()) == ["Engineer 0", "Engineer 1", "Engineer 2", "Engineer 4"]
+    assert db.dropped_jobs() == 1
+
+
+def test_rows_of_a_cancelled_writer_are_committed_by_flush_writes(monkeypatch):
+    async def scenario():
+        try:
+            # The writer sits in the retry pause with the failed batch in hand
+            monkeypatch.setattr(db, "WRITE_BATCH_SIZE", 3)
+            monkeypatch.setattr(db, "WRITE_RETRY_DELAY", 60)
+            await db.initialize_database_connection()
+            await db.store_single_job(job(0), 'applied')
+            await db.store_single_job(job(1, company=None), 'applied')
+            await db.store_single_job(job(2), 'applied')
+            for _ in range(100):
+                if len(db._pending_rows) == 3:
+                    break
+                await asyncio.sleep(0.01)
+            db._writer_task.cancel()
+            await asyncio.wait([db._writer_task])
+            assert len(db._pending_rows) == 3
+
+            monkeypatch.setattr(db, "WRITE_RETRY_DELAY", 0)
+            await db.flush_writes()
+            return await stored_positions()
+        finally:
+            await db.close_connection()
+
+    assert asyncio.run(scenario()) == ["Engineer 0", "Engineer 2"]
+    assert db._pending_rows == []
+    assert db.dropped_jobs() == 1
+
+
+def test_flush_waits_for_room_in_a_full_queue(monkeypatch):
+    monkeypatch.setattr(db, "WRITE_QUEUE_SIZE", 10)
+    monkeypatch.setattr(db, "WRITE_BATCH_SIZE", 4)
+
+    async def scenario():
+        try:
+            await db.initialize_database_connection()
+            for i in range(30):
+                await db.store_single_job(job(i), 'applied')
+            await asyncio.wait_for(db.flush_writes(), 10)
+            return await stored_positions()
+        finally:
+            await db.close_connection()
+
+    assert asyncio.run(scenario()) == [f"Engineer {i}" for i in range(30)]
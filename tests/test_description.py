@@ -0,0 +1,45 @@
+import json
+import os
+
+import pytest
+
+from utils.description import DescriptionAnalyzer
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "benchmarks", "fixtures", "experience_corpus.json")
+
+with open(CORPUS, encoding="utf-8") as f:
+    EXPERIENCE_CASES = [(case['text'], case['expected']) for case in json.load(f)]
+
+
+@pytest.mark.parametrize("text, expected", EXPERIENCE_CASES)
+def test_experience_matches_recorded_corpus(text, expected):
+    experience = DescriptionAnalyzer().experience(text)
+    assert (list(experience) if experience else None) == expected
+
+
+def test_bad_words_in_config_order():
+    analyzer = DescriptionAnalyzer(["Unpaid", "contract", "equity only"])
+    analysis = analyzer.analyze("Contract role, unpaid trial week, 3 years of experience")
+    assert analysis.bad_words == ("Unpaid", "contract")
+    assert analysis.experience == (3, -1, "3+ years", True)
+    assert not analysis.no_experience
+
+
+def test_no_experience_wins_over_years():
+    analysis = DescriptionAnalyzer().analyze("Entry level role, 3 years a plus")
+    assert analysis.no_experience
+    assert analysis.experience == (0, 100, "No experience required", False)
+
+
+def test_cache_is_bounded_lru():
+    analyzer = DescriptionAnalyzer(cache_size=2)
+    analyzer.analyze("1 year")
+    analyzer.analyze("2 years")
+    analyzer.analyze("1 year")
+    analyzer.analyze("3 years")
+    assert (analyzer.hits, analyzer.misses) == (1, 3)
+    analyzer.analyze("1 year")
+    assert analyzer.hits == 2
+    analyzer.analyze("2 years")
+    assert analyzer.misses == 4
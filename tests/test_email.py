@@ -0,0 +1,213 @@
+import asyncio
+import email
+import os
+import socketserver
+import threading
+
+import pytest
+
+from scripts.standin_server import StandinState, start_server
+from services import db, email as email_module, outbox, seen_jobs
+from services.email import EmailDelivery, ReportEmail, ResendTransport, SMTPTransport, send_email_report
+
+
+class SMTPSink(socketserver.StreamRequestHandler):
+    """Just enough SMTP to take messages; what arrives after DATA is kept in server.messages."""
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.reply("220 sink")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.split()[0].upper() if line.strip() else b""
+            if command in (b"EHLO", b"HELO"):
+                self.reply("250 sink")
+            elif command in (b"MAIL", b"RCPT", b"NOOP", b"RSET"):
+                self.reply("250 OK")
+            elif command == b"DATA":
+                self.reply("354 go ahead")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if line == b".\r\n":
+                        break
+                    # undo the period doubling
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                self.server.messages.append(b"".join(lines))
+                self.reply("250 queued")
+            elif command == b"QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 not implemented")
+
+
+@pytest.fixture
+def smtp_sink():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPSink)
+    server.daemon_threads = True
+    server.messages = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def standin():
+    servers = []
+
+    def serve(email_failures: int = 0):
+        state = StandinState([], email_failures=email_failures)
+        server = start_server(state, port=0)
+        servers.append(server)
+        return state, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def attachment(tmp_path):
+    path = tmp_path / "job_report.csv.gz"
+    path.write_bytes(os.urandom(300 * 1024))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(email_module, "MAX_BACKOFF", 0)
+
+
+def message(path) -> ReportEmail:
+    return ReportEmail("bot@example.com", "me@example.com", "Job Application Report",
+                       "Summary:\n.hidden line\n- Applied: 1 jobs", str(path))
+
+
+def test_resend_streams_the_attachment_and_retries_a_503(standin, attachment):
+    state, url = standin(email_failures=1)
+
+    async def scenario():
+        delivery = EmailDelivery([ResendTransport("key", url=f"{url}/emails")], attempts=2)
+        try:
+            return await delivery.deliver(message(attachment))
+        finally:
+            await delivery.close()
+
+    assert asyncio.run(scenario()) is None
+    sent, = state.stats['emails']
+    assert sent['to'] == ["me@example.com"]
+    assert sent['attachments'] == [{'filename': attachment.name, 'bytes': attachment.stat().st_size}]
+
+
+def test_resend_client_errors_are_not_retried(standin, attachment):
+    state, url = standin()
+
+    async def scenario():
+        delivery = EmailDelivery([ResendTransport("key", url=f"{url}/no-such-endpoint")], attempts=3)
+        try:
+            return await delivery.deliver(message(attachment))
+        finally:
+            await delivery.close()
+
+    assert asyncio.run(scenario()).startswith("Resend: HTTP 404")
+    # One attempt only
+    assert state.stats['requests'] == 1
+
+
+def test_smtp_streams_a_message_that_decodes_to_the_file(smtp_sink, attachment):
+    host, port = smtp_sink.server_address
+
+    async def scenario():
+        transport = SMTPTransport(host, port, starttls=False, username=None, password=None)
+        try:
+            await transport.send(message(attachment))
+            # The connection is reused for the next message
+            await transport.send(message(attachment))
+        finally:
+            await transport.close()
+
+    asyncio.run(scenario())
+    assert len(smtp_sink.messages) == 2
+    parsed = email.message_from_bytes(smtp_sink.messages[0])
+    assert parsed['To'] == "me@example.com"
+    text, report = parsed.get_payload()
+    assert ".hidden line" in text.get_payload()
+    assert report.get_filename() == attachment.name
+    assert report.get_payload(decode=True) == attachment.read_bytes()
+
+
+def test_falls_back_to_smtp_when_resend_fails(standin, smtp_sink, attachment):
+    _, url = standin(email_failures=5)
+    host, port = smtp_sink.server_address
+
+    async def scenario():
+        delivery = EmailDelivery([ResendTransport("key", url=f"{url}/emails"),
+                                  SMTPTransport(host, port, starttls=False, username=None, password=None)])
+        try:
+            return await delivery.deliver(message(attachment))
+        finally:
+            await delivery.close()
+
+    assert asyncio.run(scenario()) is None
+    assert len(smtp_sink.messages) == 1
+
+
+def test_outbox_keeps_a_failed_report_until_a_later_run_sends_it(tmp_path, monkeypatch, standin):
+    monkeypatch.chdir(tmp_path)
+    seen_jobs.clear()
+    state, url = standin(email_failures=1)
+    monkeypatch.setattr(email_module, "default_delivery",
+                        lambda: EmailDelivery([ResendTransport("key", url=f"{url}/emails")], attempts=1))
+
+    async def status(run_id):
+        conn = await db.get_sqlite_connection()
+        async with conn.execute("SELECT status, attempts FROM email_outbox WHERE run_id = ?", (run_id,)) as cursor:
+            return await cursor.fetchone()
+
+    async def scenario():
+        try:
+            await db.initialize_database_connection()
+            await db.store_single_job({'company_name': "Acme", 'position': "Engineer", 'run_id': "run-1"}, 'applied')
+            await send_email_report("run-1")
+            after_failure = await status("run-1")
+            # The next run retries the pending report first
+            await send_email_report(None)
+            after_retry = await status("run-1")
+            # A run without jobs has nothing to send
+            await send_email_report("empty-run")
+            return after_failure, after_retry, await status("empty-run"), await outbox.pending_reports()
+        finally:
+            await db.close_connection()
+            seen_jobs.clear()
+
+    after_failure, after_retry, empty, pending = asyncio.run(scenario())
+    assert after_failure == ('pending', 1)
+    assert after_retry == ('sent', 2)
+    assert empty is None and pending == []
+    assert len(state.stats['emails']) == 1
+    # The temporary report files are removed
+    assert not [name for name in os.listdir(tmp_path) if name.startswith("job_report_")]
+
+
+def test_outbox_gives_up_after_max_runs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        try:
+            await outbox.init_outbox()
+            await outbox.add_to_outbox("run-1")
+            kept = [await outbox.mark_failed("run-1", "HTTP 503") for _ in range(outbox.MAX_OUTBOX_RUNS)]
+            return kept, await outbox.pending_reports()
+        finally:
+            await db.close_connection()
+
+    kept, pending = asyncio.run(scenario())
+    assert kept == [True] * (outbox.MAX_OUTBOX_RUNS - 1) + [False]
+    assert pending == []
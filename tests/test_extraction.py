@@ -0,0 +1,30 @@
+import asyncio
+import json
+
+from core.extraction import extract_company_cards
+
+
+class FakeDriver:
+    def __init__(self, cards):
+        self.raw = json.dumps(cards)
+
+    async def execute_script(self, *args, **kwargs):
+        return self.raw
+
+
+def test_every_text_field_is_normalized():
+    cards = [{
+        'index': 0, 'seq': 1, 'has_hide_button': True,
+        'company_name': "\n      Acme   Labs\n    ",
+        'jobs': [{
+            'index': 0, 'href': "https://example.com/jobs/1-backend",
+            'position': "\n   Senior  Backend\tEngineer ",
+            'remote_policy': "  Remote  ", 'compensation': "",
+        }],
+    }]
+    card, = asyncio.run(extract_company_cards(FakeDriver(cards)))
+    assert card['company_name'] == "Acme Labs"
+    job, = card['jobs']
+    assert job['position'] == "Senior Backend Engineer"
+    assert job['remote_policy'] == "Remote"
+    assert job['compensation'] is None
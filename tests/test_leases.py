@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from services import db
+from services.leases import WorkLeases, init_leases, release_worker
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def run(coro_fn):
+    async def call():
+        try:
+            await init_leases()
+            return await coro_fn()
+        finally:
+            await db.close_connection()
+    return asyncio.run(call())
+
+
+def test_an_item_is_claimed_by_one_worker_only():
+    async def scenario():
+        first, second = WorkLeases("run", "w1"), WorkLeases("run", "w2")
+        claims = [await first.claim("acme"), await second.claim("acme"), await second.claim("globex")]
+        # Another run has its own leases
+        claims.append(await WorkLeases("other-run", "w2").claim("acme"))
+        return claims
+
+    assert run(scenario) == [True, False, True, True]
+
+
+def test_expired_lease_is_taken_over_but_a_completed_item_never_is():
+    async def scenario():
+        first, second = WorkLeases("run", "w1", lease_seconds=-1), WorkLeases("run", "w2")
+        await first.claim("acme")
+        await first.claim("globex")
+        await first.complete("globex")
+        return await second.claim("acme"), await second.claim("globex")
+
+    assert run(scenario) == (True, False)
+
+
+def test_released_worker_gives_back_its_unfinished_items():
+    async def scenario():
+        crashed, survivor = WorkLeases("run", "w1"), WorkLeases("run", "w2")
+        for item in ("acme", "globex", "initech"):
+            await crashed.claim(item)
+        await crashed.complete("initech")
+        released = await release_worker("run", "w1")
+        return released, [await survivor.claim(item) for item in ("acme", "globex", "initech")]
+
+    assert run(scenario) == (2, [True, True, False])
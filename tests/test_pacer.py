@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from utils import pacer as pacer_module
+from utils.pacer import Pacer, RATE_LIMITS, STEPS_TO_CEILING, BURST
+
+
+def test_healthy_actions_climb_to_the_ceiling():
+    pacer = Pacer()
+    floor, start, ceiling = RATE_LIMITS['click']
+    pacer.healthy('click')
+    assert pacer.buckets['click'].rate == pytest.approx(start + (ceiling - floor) / STEPS_TO_CEILING)
+    for _ in range(STEPS_TO_CEILING):
+        pacer.healthy('click')
+    assert pacer.buckets['click'].rate == ceiling
+
+
+def test_back_off_halves_once_per_window_and_keeps_the_floor():
+    pacer = Pacer()
+    floor, start, _ = RATE_LIMITS['navigation']
+    pacer.back_off("http_429", 'navigation')
+    pacer.back_off("http_429", 'navigation')
+    assert pacer.buckets['navigation'].rate == start * pacer_module.DECREASE
+    assert pacer.signals["http_429"] == 2
+    # Other kinds are untouched
+    assert pacer.buckets['click'].rate == RATE_LIMITS['click'][1]
+
+    bucket = pacer.buckets['navigation']
+    for _ in range(10):
+        bucket.last_decrease = float("-inf")
+        pacer.back_off("slow_response", 'navigation')
+    assert bucket.rate == floor
+
+
+def test_acquire_allows_a_burst_then_waits(monkeypatch):
+    pacer = Pacer()
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        bucket.updated -= seconds
+
+    bucket = pacer.buckets['click']
+    monkeypatch.setattr(pacer_module.asyncio, "sleep", fake_sleep)
+
+    async def take(count):
+        for _ in range(count):
+            await pacer.acquire('click')
+
+    asyncio.run(take(BURST))
+    assert slept == []
+    asyncio.run(take(1))
+    assert len(slept) == 1 and slept[0] == pytest.approx(1 / bucket.rate, rel=0.1)
+
+
+def test_state_round_trip(tmp_path):
+    path = str(tmp_path / "pacer-state.json")
+    pacer = Pacer()
+    pacer.buckets['click'].rate = 7.5
+    # Out of range rates are clamped when loaded
+    pacer.buckets['scroll'].rate = 1000
+    pacer.save(path)
+
+    restored = Pacer()
+    restored.load(path)
+    assert restored.buckets['click'].rate == 7.5
+    assert restored.buckets['scroll'].rate == RATE_LIMITS['scroll'][2]
+    assert [p.name for p in tmp_path.iterdir()] == ["pacer-state.json"]
+
+
+def test_only_the_site_can_throttle(monkeypatch):
+    monkeypatch.setattr(pacer_module, "SITE_HOST", "wellfound.com")
+    pacer = Pacer()
+
+    def response(request_id, url, status):
+        pacer._response({'requestId': request_id, 'response': {'url': url, 'status': status}})
+
+    response("1", "https://cdn.example.net/logo.png", 503)
+    response("2", "https://www.google-analytics.com/collect", 429)
+    response("3", "https://notwellfound.com/jobs", 429)
+    assert not pacer.signals and pacer._paused_until == 0.0
+
+    response("4", "https://wellfound.com/graphql", 429)
+    assert pacer.signals["http_429"] == 1 and pacer._paused_until > 0
+    response("5", "https://api.wellfound.com/jobs", 503)
+    assert pacer.signals["http_503"] == 1
+
+
+def test_starting_rates_keep_the_old_cadence():
+    # The fixed sleeps were 2s after a page load and 1s after a click
+    assert RATE_LIMITS['navigation'][1] <= 0.5
+    assert RATE_LIMITS['click'][1] <= 1.0
+    for floor, start, ceiling in RATE_LIMITS.values():
+        assert floor < start < ceiling
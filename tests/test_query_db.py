@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from services import db, seen_jobs
+from scripts.query_db import Filters, list_jobs, aggregate
+
+
+def job(i: int) -> dict:
+    return {
+        'company_name': f"Company {i % 3}",
+        'position': f"Engineer {i}",
+        'notes': None if i % 2 else "Found bad skill php. Skipping.",
+        'time': f"{1 + i % 28:02d}-03-26:10:00:00",
+        'run_id': "run-a" if i < 10 else "run-b",
+    }
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen_jobs.clear()
+
+    async def fill():
+        await db.initialize_database_connection()
+        for i in range(25):
+            await db.store_single_job(job(i), 'applied' if i % 2 else 'rejected')
+        await db.flush_writes()
+
+    asyncio.run(fill())
+    yield
+    asyncio.run(db.close_connection())
+    seen_jobs.clear()
+
+
+def run(coro):
+    async def call():
+        try:
+            return await coro
+        finally:
+            await db.close_connection()
+    return asyncio.run(call())
+
+
+def test_keyset_pages_cover_every_job_once(database):
+    ids, after = [], None
+    while True:
+        columns, rows, after = run(list_jobs(Filters(), after, limit=10))
+        ids += [row[columns.index('id')] for row in rows]
+        if after is None:
+            break
+    assert ids == sorted(range(1, 26), reverse=True)
+
+
+def test_last_full_page_points_past_the_end(database):
+    _, rows, after = run(list_jobs(Filters(), None, limit=25))
+    assert len(rows) == 25 and after == 1
+    _, rows, after = run(list_jobs(Filters(), after, limit=25))
+    assert rows == [] and after is None
+
+
+def test_filters_apply_to_pages(database):
+    columns, rows, after = run(list_jobs(Filters(status='applied', company="company 1"), None, limit=3))
+    assert after is not None
+    assert all(row[columns.index('status')] == 'applied' and row[columns.index('company_name')] == "Company 1"
+               for row in rows)
+    _, rest, after = run(list_jobs(Filters(status='applied', company="company 1"), after, limit=3))
+    # Odd i with i % 3 == 1: 1, 7, 13, 19
+    assert len(rows) + len(rest) == 4 and after is None
+
+
+def test_aggregates(database):
+    _, rows = run(aggregate('status', Filters()))
+    assert dict(rows) == {'applied': 12, 'rejected': 13}
+    _, rows = run(aggregate('per-reason', Filters(run_id="run-a")))
+    assert rows == [("Found bad skill php. Skipping.", 5)]
+    _, rows = run(aggregate('per-day', Filters(since="2026-03-01", until="2026-03-03")))
+    assert rows == [("2026-03-01", 0, 1), ("2026-03-02", 1, 0)]
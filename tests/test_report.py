@@ -0,0 +1,103 @@
+import asyncio
+import base64
+import csv
+import gzip
+import io
+import json
+import zipfile
+
+import pytest
+
+from services import db, seen_jobs
+from services.report import REPORT_COLUMNS, export_report, iter_base64, json_with_attachment
+
+
+def job(i: int) -> dict:
+    return {
+        'company_name': f"Company {i % 7}",
+        'position': f"Engineer {i}",
+        'skills': "python, \"sql\"\nand more",
+        # 1200 jobs over March 2026, one run per half
+        'time': f"{1 + i % 28:02d}-03-26:10:00:00",
+        'run_id': "run-a" if i < 600 else "run-b",
+    }
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen_jobs.clear()
+
+    async def fill():
+        await db.initialize_database_connection()
+        for i in range(1200):
+            await db.store_single_job(job(i), 'applied' if i % 3 == 0 else 'rejected')
+        await db.close_connection()
+
+    asyncio.run(fill())
+    yield
+    seen_jobs.clear()
+
+
+def export(**kwargs):
+    async def call():
+        try:
+            return await export_report(**kwargs)
+        finally:
+            await db.close_connection()
+    return asyncio.run(call())
+
+
+def read_rows(path: str, compression) -> list:
+    if compression == "gzip":
+        with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+    if compression == "zip":
+        with zipfile.ZipFile(path) as archive:
+            name, = archive.namelist()
+            assert name == path.rsplit("/", 1)[-1][:-len(".zip")] + ".csv"
+            with archive.open(name) as member:
+                return list(csv.reader(io.TextIOWrapper(member, newline="", encoding="utf-8")))
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+@pytest.mark.parametrize("compression, extension", [("gzip", ".csv.gz"), ("zip", ".zip"), (None, ".csv")])
+def test_export_streams_every_job_in_each_format(compression, extension):
+    report = export(compression=compression)
+    assert report.path.endswith(extension)
+    assert (report.applied, report.rejected, report.rows) == (400, 800, 1200)
+
+    header, *rows = read_rows(report.path, compression)
+    assert header == REPORT_COLUMNS
+    assert len(rows) == 1200
+    assert {row[REPORT_COLUMNS.index('position')] for row in rows} == {f"Engineer {i}" for i in range(1200)}
+    # Quotes and line breaks survive the CSV round trip
+    assert rows[0][REPORT_COLUMNS.index('skills')] == "python, \"sql\"\nand more"
+
+
+def test_export_filters_by_run_and_time_window(tmp_path):
+    report = export(run_id="run-b", since="2026-03-01", until="2026-03-08", path=str(tmp_path / "week.csv.gz"))
+    expected = [i for i in range(600, 1200) if i % 28 < 7]
+    assert report.rows == len(expected)
+    _, *rows = read_rows(report.path, "gzip")
+    assert sorted(row[REPORT_COLUMNS.index('position')] for row in rows) == sorted(f"Engineer {i}" for i in expected)
+
+
+def test_unknown_compression_is_refused():
+    with pytest.raises(ValueError):
+        export(compression="bz2")
+
+
+def test_attachment_is_streamed_into_the_json_body(tmp_path):
+    path = tmp_path / "report.csv.gz"
+    content = bytes(range(256)) * 1000
+    path.write_bytes(content)
+
+    chunks = list(json_with_attachment({'to': ["me@example.com"], 'attachments': [{'filename': path.name}]}, str(path)))
+    assert len(chunks) > 3
+    body = json.loads(b"".join(chunks))
+    assert body['to'] == ["me@example.com"]
+    assert body['attachments'][0]['filename'] == path.name
+    assert base64.b64decode(body['attachments'][0]['content']) == content
+    assert base64.decodebytes(b"".join(iter_base64(str(path), mime=True))) == content
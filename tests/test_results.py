@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from services import db, results as results_module, seen_jobs
+from services.results import ResultSink
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(db, "WRITE_RETRY_DELAY", 0)
+    seen_jobs.clear()
+    yield
+    seen_jobs.clear()
+
+
+def job(i: int, company: str = "Acme") -> dict:
+    return {'company_name': company, 'position': f"Engineer {i}", 'notes': f"note {i}"}
+
+
+def test_jobs_are_counted_streamed_and_tagged_with_the_run(monkeypatch):
+    monkeypatch.setattr(results_module, "store_in_db", True)
+
+    async def scenario():
+        try:
+            await db.initialize_database_connection()
+            sink = ResultSink("run-1", applied=2, recent=3)
+            for i in range(5):
+                assert await sink.record(job(i), 'applied' if i % 2 else 'rejected')
+            return sink, await db.count_run_jobs("run-1")
+        finally:
+            await db.close_connection()
+
+    sink, counts = asyncio.run(scenario())
+    # Counts carry the jobs of a resumed run from before the restart; only new jobs are stored
+    assert (sink.applied, sink.rejected, sink.total) == (4, 3, 7)
+    assert counts == {'applied': 2, 'rejected': 3}
+    assert [summary.position for summary in sink.recent] == ["Engineer 2", "Engineer 3", "Engineer 4"]
+    assert repr(sink.recent[-1]) == "rejected: Engineer 4 at Acme (note 4)"
+    assert sink.summary() == {'run_id': "run-1", 'applied': 4, 'rejected': 3, 'store_failures': 0}
+
+
+def test_rows_dropped_by_the_writer_count_as_store_failures(monkeypatch):
+    monkeypatch.setattr(results_module, "store_in_db", True)
+
+    async def scenario():
+        try:
+            await db.initialize_database_connection()
+            # Drops from before the sink existed are not its run's
+            await db.store_single_job(job(0, company=None), 'applied')
+            await db.flush_writes()
+            sink = ResultSink("run-2")
+            await sink.record(job(1), 'applied')
+            await sink.record(job(2, company=None), 'rejected')
+            await db.flush_writes()
+            return sink
+        finally:
+            await db.close_connection()
+
+    sink = asyncio.run(scenario())
+    assert sink.store_failures == 1
+    assert sink.summary()['store_failures'] == 1
+
+
+def test_nothing_is_stored_when_the_database_is_off(monkeypatch):
+    monkeypatch.setattr(results_module, "store_in_db", False)
+    stored = []
+
+    async def fake_store(job_obj, status):
+        stored.append(job_obj)
+        return True
+
+    monkeypatch.setattr(results_module, "store_single_job", fake_store)
+    sink = ResultSink("run-3")
+    assert asyncio.run(sink.record(job(0), 'applied'))
+    assert stored == [] and sink.applied == 1 and sink.store_failures == 0
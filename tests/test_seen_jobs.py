@@ -0,0 +1,27 @@
+import pytest
+
+from services import seen_jobs
+
+
+@pytest.fixture(autouse=True)
+def empty_index():
+    seen_jobs.clear()
+    yield
+    seen_jobs.clear()
+
+
+def test_key_ignores_case_and_whitespace():
+    assert seen_jobs.job_key("Acme  Labs", " Backend Engineer") == seen_jobs.job_key("acme labs", "backend\nengineer")
+    assert len(seen_jobs.job_key("Acme", "Engineer")) == 12
+
+
+def test_key_keeps_company_and_position_apart():
+    assert seen_jobs.job_key("Acme Backend", "Engineer") != seen_jobs.job_key("Acme", "Backend Engineer")
+
+
+def test_mark_and_load():
+    seen_jobs.mark_seen("Acme", "Engineer")
+    assert seen_jobs.is_seen("ACME", "engineer")
+    assert not seen_jobs.is_seen("Acme", "Designer")
+    # Rows with a missing name are not indexed; duplicates count once
+    assert seen_jobs.load([("Acme", "Engineer"), ("Globex", "Designer"), (None, "Designer"), ("Initech", "")]) == 2
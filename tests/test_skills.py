@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from utils.skills import SkillMatcher
+
+GOOD = ["python", "react native", "go", "ml", "node.js"]
+BAD = ["java", "php", "ruby on rails", "c#"]
+STRICT = ["wordpress", "sap", "cobol"]
+
+VOCABULARY = GOOD + BAD + STRICT + ["mongodb", "django", "golang", "reactjs", "native", "javascript",
+                                    "rails", "html", "sapient", "xml", "ruby", "on", "c++"]
+
+
+def legacy_match(skills_low: str, good: list, bad: list, strict: list):
+    """The original checks of process_jobs, with the skill lists as arguments."""
+    skill_words = skills_low.split()
+
+    def word_matches_skill(word, skill_list):
+        word_lower = word.lower().strip()
+        for skill in skill_list:
+            skill_lower = skill.lower().strip()
+            if word_lower == skill_lower:
+                return skill
+            if ' ' in skill_lower and word_lower in skill_lower:
+                return skill
+            if ' ' not in skill_lower and skill_lower in word_lower and len(skill_lower) >= 3:
+                return skill
+        return None
+
+    def first(skill_list):
+        found = next((skill for skill in skill_list if skill.lower() in skills_low), False)
+        if not found:
+            for word in skill_words:
+                found = word_matches_skill(word, skill_list)
+                if found:
+                    break
+        return found or None
+
+    return first(good), first(bad), first(strict)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("python django", ("python", None, None)),
+    ("react javascript", ("react native", "java", None)),
+    ("mongodb", ("go", None, None)),
+    ("golang wordpress", ("go", None, "wordpress")),
+    ("c++ html", ("ml", None, None)),
+    ("c++ css", (None, None, None)),
+    ("sapient", (None, None, "sap")),
+])
+def test_match(text, expected):
+    assert tuple(SkillMatcher(GOOD, BAD, STRICT).match(text)) == expected
+
+
+def test_matches_original_loops():
+    matcher = SkillMatcher(GOOD, BAD, STRICT)
+    rng = random.Random(7)
+    for _ in range(2000):
+        text = " ".join(rng.sample(VOCABULARY, rng.randint(1, 6))).lower()
+        assert tuple(matcher.match(text)) == legacy_match(text, GOOD, BAD, STRICT), text
+
+
+def test_blank_skills_match_like_the_original_loops():
+    good, bad, strict = ["", "python", "  "], ["java", ""], [" "]
+    matcher = SkillMatcher(good, bad, strict)
+    # The empty skill ends the phrase pass, so python is only found by the word pass
+    assert tuple(matcher.match("python java")) == ("python", "java", " ")
+    assert tuple(matcher.match("django")) == (None, None, None)
+    assert tuple(matcher.match("pythonista")) == ("python", None, None)
+    # Skills after the empty one are not phrases: "react native" is not seen in "reactnative"
+    assert tuple(SkillMatcher(["", "react native"], [], []).match("reactnative")) == (None, None, None)
+    for text in ("python java", "django", "pythonista", "a  b"):
+        assert tuple(matcher.match(text)) == legacy_match(text, good, bad, strict), text
+
+
+def test_blank_and_padded_skills_match_original_loops():
+    rng = random.Random(11)
+    extras = ["", " ", "  ", " python", "go ", " ruby on rails ", "\t"]
+    for _ in range(300):
+        lists = [rng.sample(VOCABULARY + extras, rng.randint(1, 8)) for _ in range(3)]
+        matcher = SkillMatcher(*lists)
+        for _ in range(20):
+            words = rng.sample(VOCABULARY, rng.randint(1, 6))
+            text = rng.choice([" ", "  "]).join(words).lower()
+            assert tuple(matcher.match(text)) == legacy_match(text, *lists), (text, lists)
+
+
+def test_match_is_cached_per_text():
+    matcher = SkillMatcher(GOOD, BAD, STRICT)
+    assert matcher.match("python java") is matcher.match("python java")
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from core.tab_pool import TabPool, TabUnavailable
+
+
+class FakeTab:
+    async def execute_cdp_cmd(self, *args, **kwargs):
+        return {}
+
+    async def add_cdp_listener(self, *args, **kwargs):
+        pass
+
+    async def remove_cdp_listener(self, *args, **kwargs):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self):
+        self.fail_new_tabs = False
+
+    async def new_window(self, *args, **kwargs):
+        if self.fail_new_tabs:
+            raise RuntimeError("browser gone")
+        return FakeTab()
+
+
+def test_failed_tab_is_replaced():
+    async def scenario():
+        driver = FakeDriver()
+        pool = TabPool(driver, 2)
+        await pool.start()
+        with pytest.raises(ValueError):
+            async with pool.tab() as tab:
+                raise ValueError("page broke")
+        assert pool.live == 2
+        async with pool.tab() as first, pool.tab() as second:
+            assert tab not in (first, second)
+
+    asyncio.run(scenario())
+
+
+def test_waiters_are_released_when_the_last_tab_is_lost():
+    async def scenario():
+        driver = FakeDriver()
+        pool = TabPool(driver, 1)
+        await pool.start()
+        driver.fail_new_tabs = True
+
+        async def fail_in_tab():
+            async with pool.tab():
+                await asyncio.sleep(0)
+                raise ValueError("page broke")
+
+        async def borrow():
+            async with pool.tab():
+                pass
+
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(fail_in_tab(), borrow(), borrow(), return_exceptions=True), 1)
+        assert isinstance(outcomes[0], ValueError)
+        assert all(isinstance(outcome, TabUnavailable) for outcome in outcomes[1:])
+        assert pool.live == 0
+        with pytest.raises(TabUnavailable):
+            async with pool.tab():
+                pass
+
+    asyncio.run(scenario())
+
+
+def test_waiting_for_a_free_tab_times_out():
+    async def scenario():
+        pool = TabPool(FakeDriver(), 1)
+        await pool.start()
+        async with pool.tab():
+            with pytest.raises(TabUnavailable):
+                async with pool.tab(timeout=0.01):
+                    pass
+        # The tab went back to the pool once released
+        async with pool.tab(timeout=0.01):
+            pass
+
+    asyncio.run(scenario())
@@ -1,14 +1,140 @@
+import asyncio
+from typing import Dict, Optional
 from selenium_driverless import webdriver
-from selenium_driverless.types.by import By
+from utils.pacer import pacer
+from config.settings import pacer_cooldown, captcha_wait
 
-async def detect_captcha(driver: webdriver.Chrome):
-    """Detect CAPTCHA on the page."""
-    try:
-        captcha_element = await driver.find_element(By.XPATH, '//iframe[contains(@src, "https://geo.captcha-delivery.com/captcha")]', timeout=5)
-        if captcha_element: return True
-        else: return False
-        # print("CAPTCHA detected, waiting for user to solve it...")
+# Hosts (or URL fragments) of the CAPTCHA challenges sites put in front of clients they distrust
+CAPTCHA_URL_FRAGMENTS = ("captcha-delivery.com/captcha", "google.com/recaptcha", "hcaptcha.com/captcha")
 
-        # await wait_for_disappearance(driver, captcha_element, timeout=5)
-    except: return False
+# Sources of every iframe on the page, for frames whose URL the frame events do not carry
+_IFRAME_SOURCES_SCRIPT = "return Array.from(document.querySelectorAll('iframe'), frame => frame.src);"
 
+def is_captcha_url(url: str) -> bool:
+    """True if a frame or document URL is a CAPTCHA challenge."""
+    return any(fragment in url for fragment in CAPTCHA_URL_FRAGMENTS)
+
+class CaptchaWatch:
+    """
+    Live CAPTCHA flag of the main tab, kept up to date by CDP frame and network events.
+    Reading `active` costs nothing, so it can be checked before every action; `detected`
+    and `cleared` are events to await instead of polling the page.
+    """
+
+    # Key for a challenge found by reading iframe sources rather than by a frame event
+    _DOM = "dom"
+
+    def __init__(self):
+        # frame id -> URL of the CAPTCHA frames currently on the page
+        self.frames: Dict[str, str] = {}
+        self.detected = asyncio.Event()
+        self.cleared = asyncio.Event()
+        self.cleared.set()
+        self.detections = 0
+        self._driver: Optional[webdriver.Chrome] = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.frames)
+
+    def _flag(self, frame_id: str, url: str):
+        if frame_id in self.frames:
+            return
+        first = not self.frames
+        self.frames[frame_id] = url
+        if first:
+            self.detections += 1
+            self.cleared.clear()
+            self.detected.set()
+            pacer.back_off("captcha", cooldown=pacer_cooldown)
+
+    def _unflag(self, frame_id: Optional[str] = None):
+        if frame_id is None:
+            self.frames.clear()
+        else:
+            self.frames.pop(frame_id, None)
+        if not self.frames:
+            self.detected.clear()
+            self.cleared.set()
+
+    def _frame_navigated(self, event: dict):
+        frame = event['frame']
+        if not frame.get('parentId'):
+            # A new top-level document starts without the old page's frames
+            self._unflag()
+            if is_captcha_url(frame.get('url', '')):
+                self._flag(frame['id'], frame['url'])
+        elif is_captcha_url(frame.get('url', '')):
+            self._flag(frame['id'], frame['url'])
+        elif frame.get('url', '').startswith('http'):
+            # Error pages (chrome-error://) of a challenge that failed to load do not count as solving it
+            self._unflag(frame['id'])
+
+    def _frame_requested(self, event: dict):
+        if is_captcha_url(event.get('url', '')):
+            self._flag(event['frameId'], event['url'])
+
+    def _frame_detached(self, event: dict):
+        if event['frameId'] in self.frames:
+            self._unflag(event['frameId'])
+
+    async def _frame_attached(self, event: dict):
+        # Cross-origin frames navigate in their own process and report no URL here, so read the iframe sources once
+        await self.check()
+
+    def _request(self, event: dict):
+        if event.get('type') == 'Document' and is_captcha_url(event['request']['url']):
+            self._flag(event.get('frameId') or event['requestId'], event['request']['url'])
+
+    async def check(self) -> bool:
+        """Read the iframe sources of the page once (a single script call) and update the flag."""
+        try:
+            sources = await self._driver.execute_script(_IFRAME_SOURCES_SCRIPT, timeout=5) or []
+        except Exception:
+            return self.active
+        url = next((source for source in sources if is_captcha_url(source or "")), None)
+        if url:
+            self._flag(self._DOM, url)
+        elif self._DOM in self.frames:
+            self._unflag(self._DOM)
+        return self.active
+
+    async def install(self, driver: webdriver.Chrome):
+        """Subscribe to the tab's frame and network events, then check the page as it is now."""
+        if self._driver is driver:
+            return
+        self._driver = driver
+        await driver.execute_cdp_cmd("Network.enable", {})
+        await driver.add_cdp_listener("Page.frameAttached", self._frame_attached)
+        await driver.add_cdp_listener("Page.frameNavigated", self._frame_navigated)
+        await driver.add_cdp_listener("Page.frameRequestedNavigation", self._frame_requested)
+        await driver.add_cdp_listener("Page.frameDetached", self._frame_detached)
+        await driver.add_cdp_listener("Network.requestWillBeSent", self._request)
+        await self.check()
+
+    async def wait_cleared(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for the challenge to go away (e.g. solved by hand). True if it did."""
+        try:
+            await asyncio.wait_for(self.cleared.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+captcha_watch = CaptchaWatch()
+
+async def captcha_cleared(timeout: float = captcha_wait) -> bool:
+    """True right away without a CAPTCHA; otherwise wait up to timeout seconds for it to be solved in the browser."""
+    if not captcha_watch.active:
+        return True
+    print(f"CAPTCHA detected, waiting up to {timeout:.0f}s for it to be solved in the browser...")
+    if await captcha_watch.wait_cleared(timeout):
+        print("CAPTCHA gone, continuing")
+        return True
+    print("CAPTCHA not solved, stopping")
+    return False
+
+async def detect_captcha(driver: webdriver.Chrome) -> bool:
+    """Detect CAPTCHA on the page. Answered from the frame events, without waiting on the page."""
+    await captcha_watch.install(driver)
+    return captcha_watch.active
@@ -0,0 +1,96 @@
+import re
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Iterable, Tuple
+
+# Default number of analyzed texts kept; reposted descriptions are common
+CACHE_SIZE = 4096
+
+_NO_EXPERIENCE = (0, 100, "No experience required", False)
+
+_NO_EXP = r'no\s+experience|no\s+exp|experience\s+not\s+required|entry\s+level|fresh\s+graduate|fresher'
+_NO_EXP_PATTERN = re.compile(_NO_EXP)
+
+# Finds the first "no experience" phrase or "<n> year(s)" mention. Neither alternative can overlap the other,
+# so after a years match only the rest of the text needs checking for a "no experience" phrase.
+_SCAN_PATTERN = re.compile(rf'(?P<no_exp>{_NO_EXP})|(?P<years>\d+)\s*(?:year|years|yr|yrs)')
+
+# Fallback for "(3) years", "3+ years", "3 - 5yrs" and bare "years", used only when the scan found nothing.
+# (A "3-5 years" range always contains a "<n> years" match, so it is reported as a minimum like before.)
+_COMPLEX_PATTERN = re.compile(
+    r'(?:\(\s*(\d+)\s*\)|(\d+))?\s*[-to]*\s*(\d+)?\+?\s*(?:year|years|yr|yrs)(?:\s+of\s+exp)?', re.IGNORECASE
+)
+
+
+class DescriptionAnalysis(NamedTuple):
+    """Everything the job filters need from one text."""
+    # (lower_limit, upper_limit, exp_text, is_minimum) as returned by extract_experience, or None
+    experience: Optional[tuple]
+    # Bad words (as written in config) contained in the text, in config order
+    bad_words: Tuple[str, ...]
+    no_experience: bool
+
+
+def _experience(text_lower: str) -> Tuple[Optional[tuple], bool]:
+    match = _SCAN_PATTERN.search(text_lower)
+    if match:
+        if match.group('no_exp') or _NO_EXP_PATTERN.search(text_lower, match.end()):
+            return _NO_EXPERIENCE, True
+        # "X years" is a minimum requirement; upper_limit -1 marks "minimum only"
+        years = int(match.group('years'))
+        return (years, -1, f"{years}+ years", True), False
+
+    if 'y' not in text_lower:
+        return None, False
+    complex_match = _COMPLEX_PATTERN.search(text_lower)
+    if not complex_match:
+        return None, False
+    lower_limit = int(complex_match.group(1) or complex_match.group(2) or 0)
+    if complex_match.group(3):
+        upper_limit = int(complex_match.group(3))
+        return (lower_limit, upper_limit, f"{lower_limit}-{upper_limit} years", False), False
+    return (lower_limit, -1, f"{lower_limit}+ years", True), False
+
+
+class DescriptionAnalyzer:
+    """
+    Extracts the experience requirement, bad-word hits and no-experience markers of a text in one pass.
+    Results are kept in an LRU keyed by a hash of the text.
+    """
+
+    def __init__(self, bad_words: Iterable[str] = (), cache_size: int = CACHE_SIZE):
+        self.bad_words = list(bad_words)
+        self.cache_size = cache_size
+        self._bad_lower = [(word, word.lower()) for word in self.bad_words]
+        self._cache: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, text: str) -> DescriptionAnalysis:
+        if not text:
+            return DescriptionAnalysis(None, tuple(word for word, low in self._bad_lower if not low), False)
+
+        # str hashes are computed once per object; the text itself is not kept
+        key = (hash(text), len(text))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        text_lower = text.lower()
+        experience, no_experience = _experience(text_lower)
+        hits = tuple(word for word, low in self._bad_lower if low in text_lower)
+
+        result = DescriptionAnalysis(experience, hits, no_experience)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def experience(self, text: str) -> Optional[tuple]:
+        return self.analyze(text).experience
+
+
+# Shared analyzer for experience lookups that do not need bad words
+experience_analyzer = DescriptionAnalyzer()
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from selenium_driverless import webdriver
+from utils.timing import timings
+from config.settings import base_url, pacer_slow_response, pacer_cooldown
+
+# Actions per second for each kind of action: (floor, starting rate, ceiling).
+# The starting rates are the cadence of the fixed sleeps the pacer replaced (about 2s after a page load,
+# 1s after a click, 2-3s after a scroll); healthy actions raise them from there
+RATE_LIMITS: Dict[str, Tuple[float, float, float]] = {
+    'navigation': (0.1, 0.5, 4.0),
+    'click': (0.25, 1.0, 15.0),
+    'scroll': (0.2, 0.5, 30.0),
+}
+
+# Healthy actions needed to climb from the floor to the ceiling (additive increase)
+STEPS_TO_CEILING = 60
+
+# Rate kept after a back-off (multiplicative decrease)
+DECREASE = 0.5
+
+# Further bad signals within this many seconds count as the same episode and do not cut the rate again
+DECREASE_WINDOW = 5.0
+
+# Actions that may run back to back before the rate applies
+BURST = 2
+
+# Actions taking longer than this many seconds are treated like a slow response
+SLOW_ACTION = {'navigation': 15.0, 'click': 5.0, 'scroll': 3.0}
+
+# Status codes a site sends when it wants clients to slow down
+THROTTLE_STATUSES = (429, 503)
+
+# Only the automated site (or its subdomains) can ask us to slow down; a throttled CDN or tracker cannot
+SITE_HOST = urlparse(base_url).hostname or ""
+
+
+def is_site_url(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return host == SITE_HOST or host.endswith("." + SITE_HOST)
+
+
+class _Bucket:
+    __slots__ = ("floor", "rate", "ceiling", "tokens", "updated", "last_decrease")
+
+    def __init__(self, floor: float, rate: float, ceiling: float):
+        self.floor, self.rate, self.ceiling = floor, rate, ceiling
+        self.tokens = float(BURST)
+        self.updated = time.monotonic()
+        self.last_decrease = float("-inf")
+
+    def refill(self, now: float):
+        self.tokens = min(BURST, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class Pacer:
+    """
+    Token bucket per kind of browser action, with rates adjusted by AIMD: every healthy action
+    adds a small step, and a CAPTCHA, a throttling status or a slow response halves the rates.
+    """
+
+    def __init__(self):
+        self.buckets = {kind: _Bucket(*limits) for kind, limits in RATE_LIMITS.items()}
+        self.signals: Counter = Counter()
+        self.actions: Counter = Counter()
+        self.waited = 0.0
+        self._paused_until = 0.0
+        self._requests: Dict[str, float] = {}
+        self._installed = set()
+
+    async def acquire(self, kind: str):
+        """Wait for a token of the given kind (and for any cool-down to end)."""
+        bucket = self.buckets[kind]
+        start = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            bucket.refill(now)
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                break
+            await asyncio.sleep((1 - bucket.tokens) / bucket.rate)
+        waited = time.monotonic() - start
+        if waited:
+            self.waited += waited
+            timings.add_sleep(waited)
+
+    @asynccontextmanager
+    async def action(self, kind: str):
+        """
+        Pace one action, then judge it by how long it took.
+
+            async with pacer.action("click"):
+                await button.click()
+        """
+        await self.acquire(kind)
+        self.actions[kind] += 1
+        start = time.monotonic()
+        yield
+        if time.monotonic() - start > SLOW_ACTION[kind]:
+            self.back_off("slow_action", kind)
+        else:
+            self.healthy(kind)
+
+    def healthy(self, kind: str):
+        bucket = self.buckets[kind]
+        bucket.rate = min(bucket.ceiling, bucket.rate + (bucket.ceiling - bucket.floor) / STEPS_TO_CEILING)
+
+    def back_off(self, reason: str, kind: Optional[str] = None, cooldown: float = 0.0):
+        """Halve the rate of one kind (or of all kinds) and optionally hold every action for cooldown seconds."""
+        self.signals[reason] += 1
+        now = time.monotonic()
+        for bucket in [self.buckets[kind]] if kind else self.buckets.values():
+            if now - bucket.last_decrease < DECREASE_WINDOW:
+                continue
+            bucket.rate = max(bucket.floor, bucket.rate * DECREASE)
+            bucket.tokens = min(bucket.tokens, 0.0)
+            bucket.last_decrease = now
+        if cooldown:
+            self._paused_until = max(self._paused_until, now + cooldown)
+            print(f"Pacer: {reason}, holding actions for {cooldown:.0f}s")
+
+    def _request(self, event: dict):
+        if event.get('type') in ('Document', 'XHR', 'Fetch'):
+            self._requests[event['requestId']] = event.get('timestamp', 0.0)
+
+    def _response(self, event: dict):
+        started = self._requests.pop(event['requestId'], None)
+        response = event['response']
+        # CAPTCHA frames are reported by utils.captcha.captcha_watch
+        if response.get('status') in THROTTLE_STATUSES and is_site_url(response.get('url', "")):
+            self.back_off(f"http_{response['status']}", cooldown=pacer_cooldown)
+        elif started is not None and event.get('timestamp', started) - started > pacer_slow_response:
+            self.back_off("slow_response")
+
+    def _failed(self, event: dict):
+        self._requests.pop(event['requestId'], None)
+
+    async def install(self, driver: webdriver.Chrome):
+        """Watch a tab's responses for throttling statuses and slow responses."""
+        if id(driver) in self._installed:
+            return
+        self._installed.add(id(driver))
+        await driver.execute_cdp_cmd("Network.enable", {})
+        await driver.add_cdp_listener("Network.requestWillBeSent", self._request)
+        await driver.add_cdp_listener("Network.responseReceived", self._response)
+        await driver.add_cdp_listener("Network.loadingFailed", self._failed)
+
+    def forget(self, driver: webdriver.Chrome):
+        """Drop a closed tab, so a new tab reusing its id gets its own listeners."""
+        self._installed.discard(id(driver))
+
+    def load(self, path: Optional[str]):
+        """Start from the rates learned by earlier runs."""
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                rates = json.load(f).get('rates', {})
+        except (OSError, ValueError) as e:
+            print(f"Unable to read pacer state: {e}")
+            return
+        for kind, rate in rates.items():
+            bucket = self.buckets.get(kind)
+            if bucket is not None and isinstance(rate, (int, float)):
+                bucket.rate = min(bucket.ceiling, max(bucket.floor, float(rate)))
+
+    def save(self, path: Optional[str]):
+        if not path:
+            return
+        state = {
+            'rates': {kind: bucket.rate for kind, bucket in self.buckets.items()},
+            'updated': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        try:
+            # supervisor workers save the same file at the same time, so each writes its own temporary file
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=1)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Unable to write pacer state: {e}")
+
+    def summary(self) -> dict:
+        return {
+            'rates': {kind: round(bucket.rate, 3) for kind, bucket in self.buckets.items()},
+            'actions': dict(self.actions),
+            'signals': dict(self.signals),
+            'waited': self.waited,
+        }
+
+    def report(self):
+        """Print the rates reached, the actions paced and the back-off signals seen."""
+        if not self.actions:
+            return
+        rates = ", ".join(f"{kind} {bucket.rate:.2f}/s" for kind, bucket in self.buckets.items())
+        signals = ", ".join(f"{reason} {count}" for reason, count in self.signals.most_common()) or "none"
+        print(f"Pacer: {sum(self.actions.values())} actions, {self.waited:.1f}s held back; rates {rates}; "
+              f"back-off signals: {signals}")
+
+
+pacer = Pacer()
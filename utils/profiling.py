@@ -0,0 +1,174 @@
+import asyncio
+import cProfile
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Optional
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default sampling period in seconds
+SAMPLE_INTERVAL = 0.005
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_PROJECT_ROOT):
+        return os.path.relpath(filename, _PROJECT_ROOT)
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+def _label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    # ';' separates frames in the collapsed format
+    return f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _is_project(code) -> bool:
+    return code.co_filename.startswith(_PROJECT_ROOT) and "site-packages" not in code.co_filename
+
+
+def _thread_stack(frame) -> list:
+    """Frames of a thread from the outermost coroutine (or the thread root) to the innermost frame."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    # Drop the event loop machinery above the task's root coroutine
+    for index, candidate in enumerate(frames):
+        if candidate.f_code.co_flags & inspect.CO_COROUTINE:
+            frames = frames[index:]
+            break
+    return [_label(f.f_code) for f in frames]
+
+
+def _await_chain(coro) -> tuple:
+    """Logical stack of a suspended task, following cr_await from the task's coroutine to what it waits on."""
+    labels = []
+    project = False
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            if not (hasattr(coro, "cr_await") or hasattr(coro, "gi_yieldfrom")):
+                labels.append(f"<{type(coro).__name__}>")
+            break
+        labels.append(_label(frame.f_code))
+        project = project or _is_project(frame.f_code)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    # Driver-internal background tasks (websocket readers etc.) are always waiting and would drown the rest
+    return tuple(labels) if project else ()
+
+
+def _is_idle(frame) -> bool:
+    """True when the event loop thread is blocked in the selector, i.e. waiting on the browser or other I/O."""
+    return frame is not None and frame.f_code.co_filename.endswith("selectors.py")
+
+
+class AsyncSampler:
+    """
+    Samples the event loop thread from a background thread.
+    CPU samples record the running Python stack; idle samples (loop blocked in select) record
+    the logical await stack of every task that is waiting, so browser round-trips show up under
+    the coroutine that awaited them.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.cpu_samples = 0
+        self.idle_samples = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop, thread_id: int):
+        self._loop, self._thread_id = loop, thread_id
+        self._thread = threading.Thread(target=self._run, name="async-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except RuntimeError:
+                # The task set changed while it was being read; skip this sample
+                pass
+
+    def _sample(self):
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return
+        if _is_idle(frame):
+            self.idle_samples += 1
+            for task in list(asyncio.all_tasks(self._loop)):
+                chain = _await_chain(task.get_coro())
+                if chain:
+                    self.stacks[("await",) + chain] += 1
+        else:
+            self.cpu_samples += 1
+            self.stacks[("cpu",) + tuple(_thread_stack(frame))] += 1
+
+    def write_collapsed(self, path: str):
+        """Write stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+
+
+def run_profiled(main: Callable[[], Awaitable], directory: str):
+    """
+    Run main() in a new event loop under cProfile and the async sampler.
+    Writes profile.pstats, profile.collapsed and summary.json to directory/<timestamp>/.
+    """
+    out_dir = os.path.join(directory, time.strftime("%Y%m%d_%H%M%S"))
+    os.makedirs(out_dir, exist_ok=True)
+    sampler = AsyncSampler()
+    profiler = cProfile.Profile()
+
+    async def profiled():
+        sampler.start(asyncio.get_running_loop(), threading.get_ident())
+        try:
+            await main()
+        finally:
+            sampler.stop()
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    profiler.enable()
+    try:
+        asyncio.run(profiled())
+    finally:
+        profiler.disable()
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        profiler.dump_stats(os.path.join(out_dir, "profile.pstats"))
+        sampler.write_collapsed(os.path.join(out_dir, "profile.collapsed"))
+        samples = sampler.cpu_samples + sampler.idle_samples
+        summary = {
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'samples': samples,
+            'cpu_samples': sampler.cpu_samples,
+            'await_samples': sampler.idle_samples,
+            'await_share': sampler.idle_samples / samples if samples else 0.0,
+        }
+        with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=1)
+
+        print("Profile:")
+        print(f"  Wall {wall:.1f}s, Python CPU {cpu:.1f}s "
+              f"({summary['await_share']:.0%} of samples spent awaiting the browser or other I/O)")
+        print(f"  Written to {out_dir} (profile.pstats, profile.collapsed, summary.json)")
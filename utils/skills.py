@@ -0,0 +1,191 @@
+from collections import deque
+from typing import NamedTuple, Optional, Iterable, Dict, List, Tuple
+
+# Index used for "no match" when taking the minimum list position
+_NO_MATCH = 1 << 30
+
+# Cap for the per-word and per-text memo tables
+_CACHE_LIMIT = 10000
+
+
+class SkillMatch(NamedTuple):
+    """First matching skill (as written in config) for each skill list, or None."""
+    good: Optional[str]
+    bad: Optional[str]
+    strict: Optional[str]
+
+
+class _Automaton:
+    """Minimal Aho-Corasick automaton returning every pattern contained in a text."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] = self._out[state] + (pattern,)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set:
+        """Return the set of patterns occurring anywhere in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+def _merge(table: Dict[str, List[int]], key: str, list_id: int, index: int):
+    """Keep the lowest list position seen for key in the given list."""
+    positions = table.setdefault(key, [_NO_MATCH, _NO_MATCH, _NO_MATCH])
+    if index < positions[list_id]:
+        positions[list_id] = index
+
+
+class SkillMatcher:
+    """
+    Matches a job's skills text against the good, bad and strict bad skill lists in one scan.
+
+    Semantics mirror the original per-list checks in process_jobs: a phrase pass
+    (first skill in list order contained in the text) and, only if that finds nothing,
+    a per-word pass where a word matches a skill when it is equal to it, is part of a
+    multi-word skill, or contains a single-word skill of at least 3 characters.
+    An empty skill is contained in every text, so as in the original checks it stops the
+    phrase pass at its position with a falsy match and lets the word pass run, where it never matches.
+    """
+
+    def __init__(self, good_skills: list, bad_skills: list, strict_bad_skills: list):
+        self._lists = tuple(list(skills) for skills in (good_skills, bad_skills, strict_bad_skills))
+        # Position of the first empty skill in each list, where every phrase pass ends
+        self._empty = [skills.index('') if '' in skills else _NO_MATCH for skills in self._lists]
+
+        phrases: Dict[str, List[int]] = {}
+        exact: Dict[str, List[int]] = {}
+        partial: Dict[str, List[int]] = {}
+        contained: Dict[str, List[int]] = {}
+
+        for list_id, skills in enumerate(self._lists):
+            for index, skill in enumerate(skills):
+                # Phrase pass compares the lowercased skill as-is
+                if skill:
+                    _merge(phrases, skill.lower(), list_id, index)
+
+                # Word pass compares the lowercased, stripped skill; a blank one never equals or fits a word
+                skill_lower = skill.lower().strip()
+                if not skill_lower:
+                    continue
+                _merge(exact, skill_lower, list_id, index)
+                if ' ' in skill_lower:
+                    # Any substring of a multi-word skill matches a word equal to it
+                    for start in range(len(skill_lower)):
+                        for end in range(start + 1, len(skill_lower) + 1):
+                            _merge(partial, skill_lower[start:end], list_id, index)
+                elif len(skill_lower) >= 3:
+                    _merge(contained, skill_lower, list_id, index)
+
+        self._phrases = phrases
+        self._phrase_automaton = _Automaton(phrases)
+        self._exact = exact
+        self._partial = partial
+        self._contained = contained
+        self._word_automaton = _Automaton(contained)
+
+        self._word_cache: Dict[str, Tuple[int, int, int]] = {}
+        self._text_cache: Dict[str, SkillMatch] = {}
+
+    def _skill(self, list_id: int, index: int) -> Optional[str]:
+        return None if index == _NO_MATCH else self._lists[list_id][index]
+
+    def _phrase_hits(self, text: str) -> List[int]:
+        best = list(self._empty)
+        for pattern in self._phrase_automaton.find(text):
+            positions = self._phrases[pattern]
+            for list_id in range(3):
+                if positions[list_id] < best[list_id]:
+                    best[list_id] = positions[list_id]
+        # Stopping at an empty skill counts as no phrase match
+        return [_NO_MATCH if index == self._empty[list_id] else index for list_id, index in enumerate(best)]
+
+    def _word_hits(self, word: str) -> Tuple[int, int, int]:
+        cached = self._word_cache.get(word)
+        if cached is not None:
+            return cached
+
+        candidates = []
+        if word in self._exact:
+            candidates.append(self._exact[word])
+        if word in self._partial:
+            candidates.append(self._partial[word])
+        for pattern in self._word_automaton.find(word):
+            candidates.append(self._contained[pattern])
+
+        hits = tuple(min((c[list_id] for c in candidates), default=_NO_MATCH) for list_id in range(3))
+
+        if len(self._word_cache) >= _CACHE_LIMIT:
+            self._word_cache.clear()
+        self._word_cache[word] = hits
+        return hits
+
+    def match(self, skills_text: str) -> SkillMatch:
+        """
+        Find the first good, bad and strict bad skill in the given skills text.
+
+        Args:
+            skills_text: Space separated skills as shown on the job listing
+
+        Returns:
+            SkillMatch: The matched skill for each list, None where nothing matched
+        """
+        skills_low = skills_text.lower()
+        cached = self._text_cache.get(skills_low)
+        if cached is not None:
+            return cached
+
+        best = self._phrase_hits(skills_low)
+
+        # Word pass only runs for lists whose phrase pass found nothing
+        pending = [list_id for list_id in range(3) if best[list_id] == _NO_MATCH]
+        if pending:
+            for word in skills_low.split():
+                hits = self._word_hits(word.strip())
+                for list_id in list(pending):
+                    if hits[list_id] != _NO_MATCH:
+                        best[list_id] = hits[list_id]
+                        pending.remove(list_id)
+                if not pending:
+                    break
+
+        result = SkillMatch(*(self._skill(list_id, best[list_id]) for list_id in range(3)))
+
+        if len(self._text_cache) >= _CACHE_LIMIT:
+            self._text_cache.clear()
+        self._text_cache[skills_low] = result
+        return result
@@ -0,0 +1,172 @@
+import contextvars
+import functools
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+# Names of the spans currently open in this task (tasks inherit their parent's spans)
+_active: contextvars.ContextVar = contextvars.ContextVar("active_spans", default=())
+
+
+class _SpanData:
+    __slots__ = ("durations", "sleep", "errors")
+
+    def __init__(self):
+        self.durations: List[float] = []
+        self.sleep = 0.0
+        self.errors = 0
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * fraction // 1))
+    return ordered[int(rank) - 1]
+
+
+class Timings:
+    """Duration of every span, plus the time spent in waits while each span was open."""
+
+    def __init__(self):
+        self.spans: Dict[str, _SpanData] = {}
+
+    def record(self, name: str, duration: float, failed: bool = False):
+        data = self.spans.get(name)
+        if data is None:
+            data = self.spans[name] = _SpanData()
+        data.durations.append(duration)
+        data.errors += int(failed)
+
+    def add_sleep(self, seconds: float):
+        """Attribute waiting time to every span open in the current task.
+        Waits of concurrent tasks add up, so a parent span can report more waiting than its own duration."""
+        for name in set(_active.get()):
+            data = self.spans.get(name)
+            if data is None:
+                data = self.spans[name] = _SpanData()
+            data.sleep += seconds
+
+    def summary(self) -> Dict[str, dict]:
+        result = {}
+        for name, data in self.spans.items():
+            ordered = sorted(data.durations)
+            result[name] = {
+                'count': len(ordered),
+                'total': sum(ordered),
+                'p50': _percentile(ordered, 0.50),
+                'p95': _percentile(ordered, 0.95),
+                'max': ordered[-1] if ordered else 0.0,
+                'sleep': data.sleep,
+                'errors': data.errors,
+            }
+        return result
+
+    def report(self):
+        """Print the per-span table, slowest total first."""
+        summary = self.summary()
+        if not summary:
+            return
+        print("Timings (count, p50 / p95 / max, total, of which waiting):")
+        for name, s in sorted(summary.items(), key=lambda item: -item[1]['total']):
+            print(f"  {name}: {s['count']}x, {s['p50']:.3f}s / {s['p95']:.3f}s / {s['max']:.3f}s, "
+                  f"{s['total']:.1f}s total, {s['sleep']:.1f}s waiting")
+
+    def write_json(self, path: str, extra: Optional[dict] = None):
+        _write_atomic(path, json.dumps({**(extra or {}), 'spans': self.summary()}, indent=1))
+
+    def write_prometheus(self, path: str, prefix: str = "wellfound"):
+        """Write the summary in the node_exporter textfile collector format."""
+        lines = [
+            f"# HELP {prefix}_span_seconds Duration of instrumented stages.",
+            f"# TYPE {prefix}_span_seconds summary",
+        ]
+        summary = self.summary()
+        for name, s in sorted(summary.items()):
+            label = f'span="{_escape_label(name)}"'
+            lines.append(f'{prefix}_span_seconds{{{label},quantile="0.5"}} {s["p50"]:.6f}')
+            lines.append(f'{prefix}_span_seconds{{{label},quantile="0.95"}} {s["p95"]:.6f}')
+            lines.append(f'{prefix}_span_seconds_sum{{{label}}} {s["total"]:.6f}')
+            lines.append(f'{prefix}_span_seconds_count{{{label}}} {s["count"]}')
+        for metric, key, kind, help_text in (
+            ("span_max_seconds", "max", "gauge", "Slowest occurrence of each stage."),
+            ("span_sleep_seconds", "sleep", "gauge", "Time spent waiting on the page inside each stage."),
+            ("span_errors", "errors", "gauge", "Stage occurrences that raised."),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for name, s in sorted(summary.items()):
+                lines.append(f'{prefix}_{metric}{{span="{_escape_label(name)}"}} {s[key]}')
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(path: str, content: str):
+    """Write through a temporary file so collectors never read a half-written file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+timings = Timings()
+
+
+def write_run_metrics(directory: str, extra: Optional[dict] = None):
+    """Write this run's spans as metrics/run_<timestamp>.json and the Prometheus textfile metrics/wellfound.prom."""
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    try:
+        timings.write_json(os.path.join(directory, f"run_{stamp}.json"), extra)
+        timings.write_prometheus(os.path.join(directory, "wellfound.prom"))
+    except OSError as e:
+        print(f"Unable to write run metrics: {e}")
+
+
+class span:
+    """
+    Time a block as a named stage. Works with both `async with` and `with`.
+
+        async with span("find_element.description"):
+            ...
+    """
+
+    __slots__ = ("name", "_start", "_token")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._token = _active.set(_active.get() + (self.name,))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        timings.record(self.name, time.perf_counter() - self._start, exc_type is not None)
+        _active.reset(self._token)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def timed(name: str = None):
+    """Decorator recording every call of an async function as a span (named after the function by default)."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(label):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,228 @@
+import asyncio
+import time
+from typing import Optional, Union, Dict
+from selenium_driverless import webdriver
+from selenium_driverless.types.webelement import WebElement
+from utils.timing import timings
+
+# Resolves with the first visible node matching an XPath, or null at the deadline
+_VISIBLE_SCRIPT = """
+const [xpath, timeoutMs, root] = arguments;
+const find = () => {
+    const el = document.evaluate(xpath, root || document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length) ? el : null;
+};
+return await new Promise(resolve => {
+    const found = find();
+    if (found) return resolve(found);
+    const observer = new MutationObserver(() => { const el = find(); if (el) done(el); });
+    const timer = setTimeout(() => done(null), timeoutMs);
+    function done(value) { observer.disconnect(); clearTimeout(timer); resolve(value); }
+    observer.observe(document, {childList: true, subtree: true, attributes: true});
+});
+"""
+
+# Resolves true once the element (or the XPath's first match) is detached or hidden, false at the deadline
+_GONE_SCRIPT = """
+const [target, xpath, timeoutMs] = arguments;
+const gone = () => {
+    const el = xpath
+        ? document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : target;
+    return !el || !el.isConnected || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+};
+return await new Promise(resolve => {
+    if (gone()) return resolve(true);
+    const observer = new MutationObserver(() => { if (gone()) done(true); });
+    const timer = setTimeout(() => done(false), timeoutMs);
+    function done(value) { observer.disconnect(); clearTimeout(timer); resolve(value); }
+    observer.observe(document, {childList: true, subtree: true, attributes: true});
+});
+"""
+
+# Resolves true after quietMs without DOM mutations under root, false at the deadline
+_STABLE_SCRIPT = """
+const [quietMs, timeoutMs, root] = arguments;
+return await new Promise(resolve => {
+    let quiet = setTimeout(() => done(true), quietMs);
+    const observer = new MutationObserver(() => {
+        clearTimeout(quiet);
+        quiet = setTimeout(() => done(true), quietMs);
+    });
+    const timer = setTimeout(() => done(false), timeoutMs);
+    function done(value) { observer.disconnect(); clearTimeout(quiet); clearTimeout(timer); resolve(value); }
+    observer.observe(root || document, {childList: true, subtree: true, attributes: true, characterData: true});
+});
+"""
+
+# Extra time given to the CDP call on top of the in-page deadline
+_SCRIPT_GRACE = 2
+
+
+class WaitStats:
+    """Time actually spent in each wait versus the fixed sleep it replaced."""
+
+    def __init__(self):
+        self.entries: Dict[str, list] = {}
+
+    def record(self, name: str, waited: float, budget: float, timed_out: bool):
+        # [calls, seconds waited, seconds of fixed sleep replaced, timeouts]
+        entry = self.entries.setdefault(name, [0, 0.0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += waited
+        entry[2] += budget
+        entry[3] += int(timed_out)
+
+    @property
+    def total_waited(self) -> float:
+        return sum(entry[1] for entry in self.entries.values())
+
+    @property
+    def total_budget(self) -> float:
+        return sum(entry[2] for entry in self.entries.values())
+
+    def report(self):
+        """Print waited vs. replaced-sleep time per wait."""
+        if not self.entries:
+            return
+        print("Waits (actual / fixed sleep it replaced):")
+        for name, (calls, waited, budget, timeouts) in sorted(self.entries.items(), key=lambda item: -item[1][1]):
+            print(f"  {name}: {calls} calls, {waited:.1f}s / {budget:.1f}s, {timeouts} timed out")
+        print(f"  Total: {self.total_waited:.1f}s waited instead of {self.total_budget:.1f}s of fixed sleeps")
+
+
+wait_stats = WaitStats()
+
+
+async def _timed(name: str, budget: Optional[float], timeout: float, wait):
+    """Run a wait coroutine, record its duration and whether it hit the deadline."""
+    start = time.perf_counter()
+    result = None
+    try:
+        result = await wait
+        return result
+    finally:
+        waited = time.perf_counter() - start
+        wait_stats.record(name, waited, timeout if budget is None else budget, not result)
+        timings.add_sleep(waited)
+
+
+async def wait_until_visible(driver: webdriver.Chrome, xpath: str, timeout: float = 10, root: WebElement = None,
+                             name: str = "visible", budget: float = None) -> Optional[WebElement]:
+    """
+    Wait until an element matching xpath is present and visible.
+
+    Args:
+        xpath: XPath of the element, evaluated against root or the document
+        timeout: Hard deadline in seconds
+        root: Optional element to evaluate the XPath from
+        name: Label for wait_stats
+        budget: Fixed sleep this wait replaces, for wait_stats (defaults to timeout)
+
+    Returns:
+        The element, or None if it did not become visible before the deadline
+    """
+    script = driver.eval_async(_VISIBLE_SCRIPT, xpath, int(timeout * 1000), root, timeout=timeout + _SCRIPT_GRACE)
+    try:
+        return await _timed(name, budget, timeout, script)
+    except Exception:
+        return None
+
+
+async def wait_until_gone(driver: webdriver.Chrome, target: Union[WebElement, str], timeout: float = 10,
+                          name: str = "gone", budget: float = None) -> bool:
+    """
+    Wait until an element (or the first match of an XPath) is removed or hidden.
+
+    Returns:
+        True if it disappeared, False at the deadline
+    """
+    element, xpath = (None, target) if isinstance(target, str) else (target, None)
+    script = driver.eval_async(_GONE_SCRIPT, element, xpath, int(timeout * 1000), timeout=timeout + _SCRIPT_GRACE)
+    try:
+        return bool(await _timed(name, budget, timeout, script))
+    except Exception:
+        # A stale element reference means it is no longer in the page
+        return True
+
+
+async def wait_for_dom_stable(driver: webdriver.Chrome, quiet: float = 0.2, timeout: float = 5, root: WebElement = None,
+                              name: str = "dom_stable", budget: float = None) -> bool:
+    """
+    Wait until the DOM (or root's subtree) has gone quiet seconds without mutations.
+
+    Returns:
+        True if the DOM settled, False at the deadline
+    """
+    script = driver.eval_async(_STABLE_SCRIPT, int(quiet * 1000), int(timeout * 1000), root, timeout=timeout + _SCRIPT_GRACE)
+    try:
+        return bool(await _timed(name, budget, timeout, script))
+    except Exception:
+        return False
+
+
+class _NetworkTracker:
+    """Tracks in-flight requests of a driver from CDP Network events."""
+
+    # Requests open longer than this (beacons, long polling) do not block idleness
+    STALE_AFTER = 5.0
+
+    def __init__(self):
+        self.inflight: Dict[str, float] = {}
+        self.last_activity = time.monotonic()
+
+    def _started(self, event: dict):
+        self.inflight[event['requestId']] = time.monotonic()
+        self.last_activity = time.monotonic()
+
+    def _ended(self, event: dict):
+        self.inflight.pop(event['requestId'], None)
+        self.last_activity = time.monotonic()
+
+    async def install(self, driver: webdriver.Chrome):
+        await driver.execute_cdp_cmd("Network.enable", {})
+        await driver.add_cdp_listener("Network.requestWillBeSent", self._started)
+        await driver.add_cdp_listener("Network.loadingFinished", self._ended)
+        await driver.add_cdp_listener("Network.loadingFailed", self._ended)
+
+    def pending(self) -> int:
+        now = time.monotonic()
+        return sum(1 for started in self.inflight.values() if now - started < self.STALE_AFTER)
+
+
+_trackers: Dict[int, _NetworkTracker] = {}
+
+
+async def _tracker_for(driver: webdriver.Chrome) -> _NetworkTracker:
+    tracker = _trackers.get(id(driver))
+    if tracker is None:
+        tracker = _NetworkTracker()
+        await tracker.install(driver)
+        _trackers[id(driver)] = tracker
+    return tracker
+
+
+async def wait_for_network_idle(driver: webdriver.Chrome, idle: float = 0.5, timeout: float = 10,
+                                name: str = "network_idle", budget: float = None) -> bool:
+    """
+    Wait until no request has been in flight for idle seconds.
+    Polls the CDP-fed tracker with a short, growing interval up to the hard deadline.
+
+    Returns:
+        True if the network went idle, False at the deadline
+    """
+    async def poll() -> bool:
+        try:
+            tracker = await _tracker_for(driver)
+        except Exception:
+            return False
+        deadline = time.monotonic() + timeout
+        interval = 0.02
+        while time.monotonic() < deadline:
+            if tracker.pending() == 0 and time.monotonic() - tracker.last_activity >= idle:
+                return True
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 0.2)
+        return False
+
+    return await _timed(name, budget, timeout, poll())